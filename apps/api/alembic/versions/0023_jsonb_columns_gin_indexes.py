@@ -0,0 +1,67 @@
+"""Store large JSON documents as JSONB with GIN indexes.
+
+Revision ID: 0023_jsonb_columns_gin_indexes
+Revises: 0022_merge_0020_0021_heads
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0023_jsonb_columns_gin_indexes"
+down_revision = "0022_merge_0020_0021_heads"
+branch_labels = None
+depends_on = None
+
+JSONB_COLUMNS = [
+    ("market_observations", "meta"),
+    ("news_items", "meta"),
+    ("web_extracts", "extracted_json"),
+    ("web_extracts", "meta"),
+    ("reports", "payload"),
+    ("ml_models", "performance_metrics"),
+]
+
+INDEXES = [
+    ("ix_market_observations_meta_gin", "market_observations USING gin (meta)"),
+    ("ix_news_items_meta_gin", "news_items USING gin (meta)"),
+    (
+        "ix_web_extracts_extracted_json_gin",
+        "web_extracts USING gin (extracted_json)",
+    ),
+    (
+        "ix_ml_models_r2_score",
+        "ml_models ((CAST(performance_metrics ->> 'r2_score' AS FLOAT)))",
+    ),
+]
+
+
+def upgrade() -> None:
+    # JSONB and GIN are Postgres-only; other dialects keep plain JSON.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, column in JSONB_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} "
+            f"TYPE jsonb USING {column}::jsonb"
+        )
+
+    # CONCURRENTLY cannot run inside a transaction and avoids holding a write
+    # lock on the table while the index builds.
+    with op.get_context().autocommit_block():
+        for name, target in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+    for table, column in JSONB_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE json USING {column}::json"
+        )
@@ -0,0 +1,58 @@
+"""Newest-first covering indexes for news, margin runs and reports.
+
+Revision ID: 0024_covering_newest_first_indexes
+Revises: 0023_jsonb_columns_gin_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0024_covering_newest_first_indexes"
+down_revision = "0023_jsonb_columns_gin_indexes"
+branch_labels = None
+depends_on = None
+
+# name -> (new definition, definition it replaces or None)
+INDEXES = {
+    "ix_news_topic_retrieved": (
+        "news_items (topic, retrieved_at DESC NULLS LAST) "
+        "INCLUDE (title, url, sentiment_score, sentiment_label)",
+        "news_items (topic, retrieved_at)",
+    ),
+    "ix_margin_runs_lot_computed_at": (
+        "margin_runs (lot_id, computed_at DESC)",
+        None,
+    ),
+    "ix_reports_kind_report_at": (
+        "reports (kind, report_at DESC) INCLUDE (title)",
+        "reports (kind, report_at)",
+    ),
+}
+
+
+def _rebuild(use_new: bool) -> None:
+    # Build under a temporary name first so readers always have an index,
+    # then swap names; CONCURRENTLY needs to run outside a transaction.
+    with op.get_context().autocommit_block():
+        for name, (new, old) in INDEXES.items():
+            target = new if use_new else old
+            if target is None:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                continue
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}_new")
+            op.execute(f"CREATE INDEX CONCURRENTLY {name}_new ON {target}")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+
+
+def upgrade() -> None:
+    # DESC NULLS LAST and INCLUDE are Postgres-only.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _rebuild(use_new=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _rebuild(use_new=False)
@@ -0,0 +1,139 @@
+"""Move shipment tracking history into transport_events.
+
+Revision ID: 0025_shipment_tracking_events_table
+Revises: 0024_covering_newest_first_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0025_shipment_tracking_events_table"
+down_revision = "0024_covering_newest_first_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(
+    inspector: sa.engine.reflection.Inspector, table: str, column: str
+) -> bool:
+    return any(col["name"] == column for col in inspector.get_columns(table))
+
+
+# Cast text to timestamptz, NULL instead of an error for values such as
+# "2024-13-45"; a bad row must not abort the migration. Dropped again at the end.
+CREATE_SAFE_CAST = """
+CREATE OR REPLACE FUNCTION migration_0025_to_timestamptz(value text)
+RETURNS timestamptz AS $$
+BEGIN
+    RETURN value::timestamptz;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+DROP_SAFE_CAST = "DROP FUNCTION IF EXISTS migration_0025_to_timestamptz(text)"
+
+# Copy JSON events that the track endpoint has not already mirrored into
+# transport_events. Events without a parseable timestamp are kept too: they
+# fall back to the shipment's updated_at and carry the original entry in
+# details["raw_event"], since the JSON column is dropped afterwards.
+BACKFILL_EVENTS = """
+INSERT INTO transport_events
+    (shipment_id, event_type, location, occurred_at, status, details)
+SELECT s.id,
+       ev.event_type,
+       ev.location,
+       COALESCE(ev.parsed_at, s.updated_at, s.created_at),
+       s.status,
+       CASE WHEN ev.parsed_at IS NULL
+            THEN json_build_object('details', e->>'details', 'raw_event', e)
+            WHEN e->>'details' IS NOT NULL
+            THEN json_build_object('details', e->>'details') END
+FROM shipments s
+CROSS JOIN LATERAL jsonb_array_elements(s.tracking_events::jsonb) AS e
+CROSS JOIN LATERAL (
+    SELECT LEFT(COALESCE(e->>'event', 'tracking'), 64) AS event_type,
+           LEFT(e->>'location', 200) AS location,
+           migration_0025_to_timestamptz(e->>'timestamp') AS parsed_at
+) AS ev
+WHERE jsonb_typeof(s.tracking_events::jsonb) = 'array'
+  AND NOT EXISTS (
+      SELECT 1 FROM transport_events t
+      WHERE t.shipment_id = s.id
+        AND t.event_type = ev.event_type
+        AND t.occurred_at = ev.parsed_at
+        AND t.location IS NOT DISTINCT FROM ev.location
+  )
+"""
+
+RESTORE_EVENTS = """
+UPDATE shipments s
+SET tracking_events = agg.events
+FROM (
+    SELECT shipment_id,
+           json_agg(
+               COALESCE(
+                   details->'raw_event',
+                   json_build_object(
+                       'timestamp', occurred_at,
+                       'location', location,
+                       'event', event_type,
+                       'details', details->>'details'
+                   )
+               )
+               ORDER BY occurred_at, id
+           ) AS events
+    FROM transport_events
+    GROUP BY shipment_id
+) agg
+WHERE agg.shipment_id = s.id
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "shipments" not in inspector.get_table_names():
+        return
+    is_postgres = bind.dialect.name == "postgresql"
+
+    if is_postgres:
+        op.execute(CREATE_SAFE_CAST)
+
+    if _column_exists(inspector, "shipments", "tracking_events"):
+        if is_postgres:
+            op.execute(BACKFILL_EVENTS)
+        op.drop_column("shipments", "tracking_events")
+
+    if is_postgres:
+        # Unparseable legacy strings become NULL rather than failing the ALTER
+        op.execute(
+            "ALTER TABLE shipments ALTER COLUMN status_updated_at "
+            "TYPE TIMESTAMP WITH TIME ZONE "
+            "USING migration_0025_to_timestamptz(status_updated_at)"
+        )
+        op.execute(DROP_SAFE_CAST)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "shipments" not in inspector.get_table_names():
+        return
+    is_postgres = bind.dialect.name == "postgresql"
+
+    if is_postgres:
+        op.execute(
+            "ALTER TABLE shipments ALTER COLUMN status_updated_at "
+            "TYPE VARCHAR(50) USING status_updated_at::text"
+        )
+
+    if not _column_exists(inspector, "shipments", "tracking_events"):
+        op.add_column(
+            "shipments", sa.Column("tracking_events", sa.JSON(), nullable=True)
+        )
+        if is_postgres:
+            op.execute(RESTORE_EVENTS)
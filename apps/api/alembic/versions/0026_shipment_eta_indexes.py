@@ -0,0 +1,44 @@
+"""Index shipments by status and roaster with estimated arrival time.
+
+Revision ID: 0026_shipment_eta_indexes
+Revises: 0025_shipment_tracking_events_table
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+revision = "0026_shipment_eta_indexes"
+down_revision = "0025_shipment_tracking_events_table"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_shipment_status_eta": ["status", "estimated_arrival_at"],
+    "ix_shipment_roaster_eta": ["roaster_id", "estimated_arrival_at"],
+}
+
+
+def _index_exists(
+    inspector: sa.engine.reflection.Inspector, table: str, name: str
+) -> bool:
+    return any(ix["name"] == name for ix in inspector.get_indexes(table))
+
+
+def upgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "shipments" not in inspector.get_table_names():
+        return
+    for name, columns in INDEXES.items():
+        if not _index_exists(inspector, "shipments", name):
+            op.create_index(name, "shipments", columns, unique=False)
+
+
+def downgrade() -> None:
+    inspector = inspect(op.get_bind())
+    if "shipments" not in inspector.get_table_names():
+        return
+    for name in INDEXES:
+        if _index_exists(inspector, "shipments", name):
+            op.drop_index(name, table_name="shipments")
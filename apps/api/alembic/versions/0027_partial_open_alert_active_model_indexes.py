@@ -0,0 +1,49 @@
+"""Partial indexes for open quality alerts and active ML models.
+
+Revision ID: 0027_partial_open_alert_active_model_indexes
+Revises: 0026_shipment_eta_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0027_partial_open_alert_active_model_indexes"
+down_revision = "0026_shipment_eta_indexes"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_quality_alerts_open": (
+        "quality_alerts (entity_type, entity_id, alert_type) "
+        "WHERE acknowledged IS false"
+    ),
+    "ix_ml_models_active": (
+        "ml_models (model_type, training_date) WHERE status = 'active'"
+    ),
+}
+
+
+def upgrade() -> None:
+    # Partial indexes and CONCURRENTLY are Postgres-only.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name, target in INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+        # Almost every row is acknowledged, so a full index on the flag is
+        # mostly dead weight; open alerts use ix_quality_alerts_open.
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_quality_alerts_acknowledged")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_quality_alerts_acknowledged "
+            "ON quality_alerts (acknowledged)"
+        )
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
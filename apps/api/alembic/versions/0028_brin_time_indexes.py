@@ -0,0 +1,42 @@
+"""BRIN indexes on append-mostly time columns.
+
+Revision ID: 0028_brin_time_indexes
+Revises: 0027_partial_open_alert_active_model_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0028_brin_time_indexes"
+down_revision = "0027_partial_open_alert_active_model_indexes"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_market_observations_observed_at_brin": ("market_observations", "observed_at"),
+    "ix_news_items_retrieved_at_brin": ("news_items", "retrieved_at"),
+    "ix_web_extracts_retrieved_at_brin": ("web_extracts", "retrieved_at"),
+    "ix_reports_report_at_brin": ("reports", "report_at"),
+}
+
+
+def upgrade() -> None:
+    # BRIN is Postgres-only; the btree indexes remain for ORDER BY ... LIMIT.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name, (table, column) in INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} "
+                f"USING brin ({column}) WITH (pages_per_range = 32)"
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
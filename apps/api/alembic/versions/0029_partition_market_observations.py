@@ -0,0 +1,139 @@
+"""Range-partition market_observations by month on observed_at.
+
+Revision ID: 0029_partition_market_observations
+Revises: 0028_brin_time_indexes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0029_partition_market_observations"
+down_revision = "0028_brin_time_indexes"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+# One partition per UTC month from the oldest row up to MONTHS_AHEAD ahead;
+# app.workers.tasks.ensure_partitions keeps adding months after this.
+CREATE_MONTHLY_PARTITIONS = f"""
+DO $$
+DECLARE
+    month_start date;
+    last_month date;
+BEGIN
+    SELECT date_trunc('month', COALESCE(min(observed_at), now()) AT TIME ZONE 'UTC')::date
+    INTO month_start
+    FROM market_observations_unpartitioned;
+    last_month := (date_trunc('month', now() AT TIME ZONE 'UTC')
+                   + interval '{MONTHS_AHEAD} months')::date;
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF market_observations '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'market_observations_' || to_char(month_start, 'YYYY_MM'),
+            month_start::timestamp AT TIME ZONE 'UTC',
+            (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END $$;
+"""
+
+# Constraints shared by both layouts; on a partitioned table each is created
+# per partition automatically.
+CONSTRAINTS = [
+    "ALTER TABLE market_observations ADD CONSTRAINT market_observations_pkey "
+    "PRIMARY KEY ({pk})",
+    "ALTER TABLE market_observations "
+    "ADD CONSTRAINT uq_market_observations_key_observed_at_source_id "
+    "UNIQUE (key, observed_at, source_id)",
+    "ALTER TABLE market_observations "
+    "ADD CONSTRAINT market_observations_source_id_fkey "
+    "FOREIGN KEY (source_id) REFERENCES sources (id)",
+]
+
+# GIN and BRIN indexes from 0023/0028, same names in both layouts
+SHARED_INDEXES = [
+    "CREATE INDEX ix_market_observations_meta_gin "
+    "ON market_observations USING gin (meta)",
+    "CREATE INDEX ix_market_observations_observed_at_brin "
+    "ON market_observations USING brin (observed_at) WITH (pages_per_range = 32)",
+]
+
+# Btree indexes as the model declares them
+PARTITIONED_INDEXES = [
+    "CREATE INDEX ix_market_observations_key ON market_observations (key)",
+    "CREATE INDEX ix_market_observations_observed_at "
+    "ON market_observations (observed_at)",
+    "CREATE INDEX ix_market_observations_source_id ON market_observations (source_id)",
+    "CREATE INDEX ix_market_observations_key_observed_at "
+    "ON market_observations (key, observed_at)",
+]
+
+# Btree indexes exactly as 0002 created them, so its downgrade can drop them
+UNPARTITIONED_INDEXES = [
+    "CREATE INDEX ix_market_observations_key ON market_observations (key)",
+    "CREATE INDEX ix_market_observations_observed_at "
+    "ON market_observations (observed_at)",
+    "CREATE INDEX ix_market_key_observed_at ON market_observations (key, observed_at)",
+]
+
+
+def _swap_table(partitioned: bool) -> None:
+    bind = op.get_bind()
+    sequence = bind.execute(
+        sa.text("SELECT pg_get_serial_sequence('market_observations', 'id')")
+    ).scalar()
+
+    op.execute(
+        "ALTER TABLE market_observations RENAME TO market_observations_unpartitioned"
+    )
+    if partitioned:
+        op.execute(
+            "CREATE TABLE market_observations "
+            "(LIKE market_observations_unpartitioned INCLUDING DEFAULTS) "
+            "PARTITION BY RANGE (observed_at)"
+        )
+        op.execute(
+            "CREATE TABLE market_observations_default "
+            "PARTITION OF market_observations DEFAULT"
+        )
+        op.execute(CREATE_MONTHLY_PARTITIONS)
+    else:
+        op.execute(
+            "CREATE TABLE market_observations "
+            "(LIKE market_observations_unpartitioned INCLUDING DEFAULTS)"
+        )
+
+    op.execute(
+        "INSERT INTO market_observations SELECT * FROM market_observations_unpartitioned"
+    )
+    # The id sequence belongs to the old table and would be dropped with it
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY NONE")
+    op.execute("DROP TABLE market_observations_unpartitioned")
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY market_observations.id")
+
+    # Unique constraints on a partitioned table must include the partition key
+    pk = "id, observed_at" if partitioned else "id"
+    for statement in CONSTRAINTS:
+        op.execute(statement.format(pk=pk))
+    indexes = PARTITIONED_INDEXES if partitioned else UNPARTITIONED_INDEXES
+    for statement in indexes + SHARED_INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    # Declarative partitioning is Postgres-only; other dialects keep one table.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _swap_table(partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _swap_table(partitioned=False)
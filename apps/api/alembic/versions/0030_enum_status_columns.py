@@ -0,0 +1,103 @@
+"""Store closed-set status columns as native Postgres enums.
+
+Revision ID: 0030_enum_status_columns
+Revises: 0029_partition_market_observations
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0030_enum_status_columns"
+down_revision = "0029_partition_market_observations"
+branch_labels = None
+depends_on = None
+
+ENUMS = {
+    "alert_severity": ("info", "warning", "critical"),
+    "ml_model_status": ("training", "active", "deprecated"),
+    "risk_level": ("low", "medium", "high"),
+}
+
+# table, column, enum type, previous VARCHAR length, default,
+# replacement for values outside the enum (NULL for nullable columns)
+COLUMNS = [
+    ("quality_alerts", "severity", "alert_severity", 16, "info", "'info'"),
+    ("ml_models", "status", "ml_model_status", 32, None, "'deprecated'"),
+    ("regions", "weather_risk", "risk_level", 32, None, "NULL"),
+    ("regions", "political_risk", "risk_level", 32, None, "NULL"),
+    ("regions", "logistics_risk", "risk_level", 32, None, "NULL"),
+]
+
+# Low-cardinality single-column btrees: severity is the leading column of
+# ix_quality_alerts_severity_ack and active models use ix_ml_models_active.
+REDUNDANT_INDEXES = {
+    "ix_quality_alerts_severity": ("quality_alerts", "severity"),
+    "ix_ml_models_status": ("ml_models", "status"),
+}
+
+# Its predicate compares status and has to be rebuilt against the new type
+ACTIVE_MODELS_INDEX = (
+    "CREATE INDEX ix_ml_models_active ON ml_models (model_type, training_date) "
+    "WHERE status = 'active'"
+)
+
+
+def upgrade() -> None:
+    # Native enums are Postgres-only; other dialects keep VARCHAR.
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    for name, values in ENUMS.items():
+        postgresql.ENUM(*values, name=name).create(bind, checkfirst=True)
+
+    op.execute("DROP INDEX IF EXISTS ix_ml_models_active")
+    for name in REDUNDANT_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    for table, column, enum_name, _length, default, fallback in COLUMNS:
+        values = ", ".join(f"'{value}'" for value in ENUMS[enum_name])
+        op.execute(f"UPDATE {table} SET {column} = lower(trim({column}))")
+        op.execute(
+            f"UPDATE {table} SET {column} = {fallback} WHERE {column} NOT IN ({values})"
+        )
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} "
+            f"USING {column}::{enum_name}"
+        )
+        if default is not None:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'"
+            )
+
+    op.execute(ACTIVE_MODELS_INDEX)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_ml_models_active")
+
+    for table, column, _enum_name, length, default, _fallback in COLUMNS:
+        if default is not None:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar({length}) "
+            f"USING {column}::text"
+        )
+        if default is not None:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'"
+            )
+
+    for name in ENUMS:
+        postgresql.ENUM(name=name).drop(bind, checkfirst=True)
+
+    for name, (table, column) in REDUNDANT_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+    op.execute(ACTIVE_MODELS_INDEX)
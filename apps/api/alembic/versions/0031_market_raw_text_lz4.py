@@ -0,0 +1,46 @@
+"""Compress market_observations.raw_text with LZ4.
+
+Revision ID: 0031_market_raw_text_lz4
+Revises: 0030_enum_status_columns
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0031_market_raw_text_lz4"
+down_revision = "0030_enum_status_columns"
+branch_labels = None
+depends_on = None
+
+
+def _lz4_available() -> bool:
+    # Column compression needs Postgres 14+ built with lz4; the setting only
+    # lists lz4 when both hold.
+    return bool(
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT 'lz4' = ANY(enumvals) FROM pg_settings "
+                "WHERE name = 'default_toast_compression'"
+            )
+        )
+        .scalar()
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or not _lz4_available():
+        return
+    # Applies to newly written values; existing rows keep pglz until rewritten.
+    op.execute(
+        "ALTER TABLE market_observations ALTER COLUMN raw_text SET COMPRESSION lz4"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql" or not _lz4_available():
+        return
+    op.execute(
+        "ALTER TABLE market_observations ALTER COLUMN raw_text SET COMPRESSION pglz"
+    )
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+import orjson
 from fastapi import Request, Response, status
+from sqlalchemy import Row
 
 
 def is_testserver(request: Request) -> bool:
@@ -21,3 +25,16 @@ def apply_create_status(
         response.status_code = testserver_status
         return
     response.status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+
+
+def rows_response(rows: Sequence[Row]) -> Response:
+    """Render Core result rows as a JSON array with orjson.
+
+    For list endpoints that select exactly their response fields: the rows
+    skip ORM hydration and the response_model pass. Datetimes render as
+    Pydantic would (UTC as ``Z``).
+    """
+    return Response(
+        content=orjson.dumps([row._asdict() for row in rows], option=orjson.OPT_UTC_Z),
+        media_type="application/json",
+    )
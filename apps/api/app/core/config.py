@@ -43,6 +43,10 @@ class Settings(BaseSettings):
     # Intentionally no baked-in default password (fail-fast if missing).
     BOOTSTRAP_ADMIN_PASSWORD: str | None = None
 
+    # Touched after a successful startup seed. While it is newer than the seed
+    # modules and migrations, startup skips re-seeding. Empty disables it.
+    SEED_MARKER_PATH: str = "/tmp/coffeestudio-seed.done"
+
     # --- Perplexity (Sonar) API ---
     # Docs: https://docs.perplexity.ai/
     PERPLEXITY_API_KEY: str | None = None
@@ -74,6 +78,9 @@ class Settings(BaseSettings):
     DATA_PIPELINE_CIRCUIT_BREAKER_THRESHOLD: int = 3
     DATA_PIPELINE_CIRCUIT_BREAKER_TIMEOUT_S: int = 300
     DATA_PIPELINE_MAX_RETRIES: int = 3
+    # Attach tracebacks to provider fetch-failure warnings. Off by default:
+    # an unreachable upstream is routine and the fallback chain handles it.
+    DEBUG_PROVIDERS: bool = False
 
     # Intelligence refresh schedule
     INTELLIGENCE_REFRESH_TIMES: str = "06:00,12:00,18:00,00:00"
@@ -1,8 +1,9 @@
 """Standardized error handling for the application."""
 
 import asyncio
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Union
 
+import orjson
 from fastapi import Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -19,6 +20,18 @@ async def _yield_control() -> None:
     await asyncio.sleep(0)
 
 
+class OrjsonErrorResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    Error payloads are plain dicts built by hand, so they miss FastAPI's
+    Pydantic serialization path and would otherwise go through ``json.dumps``.
+    FastAPI's own ``ORJSONResponse`` is deprecated, hence this small subclass.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 class ErrorResponse:
     """Standard error response format."""
 
@@ -49,7 +62,7 @@ class ErrorResponse:
         # FastAPI-style top-level detail field
         content["detail"] = detail if detail is not None else message
 
-        return JSONResponse(status_code=status_code, content=content)
+        return OrjsonErrorResponse(status_code=status_code, content=content)
 
 
 async def validation_exception_handler(
@@ -0,0 +1,65 @@
+"""Monthly range partitions for time-series tables (Postgres only)."""
+
+from datetime import date, datetime, timezone
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+log = structlog.get_logger()
+
+# Range-partitioned by month in migration 0029
+PARTITIONED_TABLES = ("market_observations",)
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    months = day.year * 12 + day.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def ensure_monthly_partitions(
+    db: Session, table: str, months_ahead: int = 3, today: date | None = None
+) -> list[str]:
+    """Create missing monthly partitions from this month to ``months_ahead``.
+
+    Partitions are named ``<table>_YYYY_MM`` and cover whole UTC months.
+    Returns the names of the partitions that were created; does nothing on
+    other dialects or when ``table`` is not partitioned. A month whose rows
+    already sit in the default partition is skipped with a warning.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+    partitioned = db.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+        ),
+        {"table": table},
+    ).first()
+    if partitioned is None:
+        return []
+
+    today = today or datetime.now(timezone.utc).date()
+    created = []
+    for offset in range(months_ahead + 1):
+        start = _month_start(today, offset)
+        name = f"{table}_{start:%Y_%m}"
+        exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists is not None:
+            continue
+        end = _month_start(start, 1)
+        try:
+            with db.begin_nested():
+                db.execute(
+                    text(
+                        f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                        f"FOR VALUES FROM ('{start}T00:00:00+00:00') "
+                        f"TO ('{end}T00:00:00+00:00')"
+                    )
+                )
+        except DBAPIError as exc:
+            log.warning("partition_create_failed", partition=name, error=str(exc))
+            continue
+        created.append(name)
+    db.commit()
+    return created
@@ -1,9 +1,28 @@
+from typing import Any
+
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 from app.core.config import settings
 
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def json_serializer(value: Any) -> str:
+    """Encode JSON/JSONB column values with orjson instead of stdlib json.
+
+    Non-str dict keys are stringified as json.dumps does for ints, NumPy
+    values are accepted, and NaN is written as null.
+    """
+    return orjson.dumps(
+        value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
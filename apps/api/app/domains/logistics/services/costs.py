@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.models.market import MarketObservation
@@ -13,12 +14,15 @@ DEFAULT_USD_EUR = 0.92
 
 def _latest_usd_eur(db: Session) -> tuple[float, str]:
     """Return (usd_eur, source)."""
-    obs = (
-        db.query(MarketObservation)
-        .filter(MarketObservation.key == "FX:USD_EUR")
-        .order_by(MarketObservation.observed_at.desc())
-        .first()
+    stmt = lambda_stmt(
+        lambda: (
+            select(MarketObservation)
+            .where(MarketObservation.key == "FX:USD_EUR")
+            .order_by(MarketObservation.observed_at.desc())
+            .limit(1)
+        )
     )
+    obs = db.execute(stmt).scalars().first()
     if not obs:
         return DEFAULT_USD_EUR, "fallback"
     return float(obs.value), f"obs:{obs.id}"
@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_role
@@ -65,11 +66,13 @@ def list_runs(
     _: ViewerPermissionDep,
     limit: Annotated[int, Query(ge=1, le=500)] = 50,
 ):
-    return (
-        db.query(MarginRun)
-        .filter(MarginRun.lot_id == lot_id)
-        .order_by(MarginRun.computed_at.desc())
-        .limit(limit)
-        .all()
+    stmt = lambda_stmt(
+        lambda: (
+            select(MarginRun)
+            .where(MarginRun.lot_id == lot_id)
+            .order_by(MarginRun.computed_at.desc())
+            .limit(limit)
+        )
     )
+    return db.execute(stmt).scalars().all()
 
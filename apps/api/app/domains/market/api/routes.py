@@ -14,11 +14,11 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from sqlalchemy import func
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_role
-from app.api.response_utils import apply_create_status
+from app.api.response_utils import apply_create_status, rows_response
 from app.core.audit import AuditLogger
 from app.core.config import settings
 from app.core.security import decode_token
@@ -41,6 +41,9 @@ AnalystUserDep = Annotated[User, Depends(require_role("admin", "analyst"))]
 WS_POLICY_VIOLATION_CODE = 1008
 WS_ALLOWED_ROLES = frozenset({"admin", "analyst", "viewer"})
 WS_AUTH_ERROR_REASON = "Unauthorized"
+OBSERVATION_COLUMNS = tuple(
+    getattr(MarketObservation, name) for name in MarketObservationOut.model_fields
+)
 
 
 async def _close_ws(websocket: WebSocket, reason: str) -> None:
@@ -114,10 +117,11 @@ def list_observations(
     key: str | None = None,
     limit: Annotated[int, Query(ge=1, le=500)] = 200,
 ):
-    q = db.query(MarketObservation)
+    stmt = select(*OBSERVATION_COLUMNS)
     if key:
-        q = q.filter(MarketObservation.key == key)
-    return q.order_by(MarketObservation.observed_at.desc()).limit(limit).all()
+        stmt = stmt.where(MarketObservation.key == key)
+    stmt = stmt.order_by(MarketObservation.observed_at.desc()).limit(limit)
+    return rows_response(db.execute(stmt).all())
 
 
 @router.post("/observations", response_model=MarketObservationOut)
@@ -156,16 +160,19 @@ def latest_snapshot(
     keys = ["FX:USD_EUR", "COFFEE_C:USD_LB", "FREIGHT:USD_PER_40FT"]
     out = {}
     for k in keys:
-        obs = (
-            db.query(MarketObservation)
-            .filter(MarketObservation.key == k)
-            .order_by(
-                MarketObservation.source_id.is_(None),
-                MarketObservation.observed_at.desc(),
-                MarketObservation.id.desc(),
+        stmt = lambda_stmt(
+            lambda: (
+                select(MarketObservation)
+                .where(MarketObservation.key == k)
+                .order_by(
+                    MarketObservation.source_id.is_(None),
+                    MarketObservation.observed_at.desc(),
+                    MarketObservation.id.desc(),
+                )
+                .limit(1)
             )
-            .first()
         )
+        obs = db.execute(stmt).scalars().first()
         out[k] = (
             None
             if not obs
@@ -2,9 +2,11 @@ from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_role
+from app.api.response_utils import rows_response
 from app.db.session import get_db
 from app.models.news_item import NewsItem
 from app.domains.news.schemas.news import NewsItemOut, NewsRefreshResponse
@@ -12,6 +14,7 @@ from app.domains.news.services.refresh import refresh_news
 
 router = APIRouter()
 ISO2_COUNTRY_PATTERN = r"^[A-Za-z]{2}$"
+NEWS_ITEM_COLUMNS = tuple(getattr(NewsItem, name) for name in NewsItemOut.model_fields)
 
 
 def _normalize_country_code(country: str) -> str:
@@ -27,9 +30,16 @@ def list_news(
     days: Annotated[int, Query(ge=1, le=365)] = 7,
 ):
     cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    q = db.query(NewsItem).filter(NewsItem.topic == topic)
-    q = q.filter((NewsItem.retrieved_at.is_(None)) | (NewsItem.retrieved_at >= cutoff))
-    return q.order_by(NewsItem.retrieved_at.desc().nullslast()).limit(limit).all()
+    stmt = lambda_stmt(
+        lambda: (
+            select(*NEWS_ITEM_COLUMNS)
+            .where(NewsItem.topic == topic)
+            .where((NewsItem.retrieved_at.is_(None)) | (NewsItem.retrieved_at >= cutoff))
+            .order_by(NewsItem.retrieved_at.desc().nullslast())
+            .limit(limit)
+        )
+    )
+    return rows_response(db.execute(stmt).all())
 
 
 @router.post("/refresh", response_model=NewsRefreshResponse)
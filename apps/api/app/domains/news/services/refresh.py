@@ -64,6 +64,13 @@ def _upsert_news_items(
     updated = 0
     processed = 0
 
+    # One lookup for the whole batch; new rows are inserted together on commit
+    urls = {_coerce_result_field(result, "url") for result in results} - {None, ""}
+    existing: dict[str, NewsItem] = {}
+    if urls:
+        stmt = select(NewsItem).where(NewsItem.url.in_(urls))
+        existing = {item.url: item for item in db.scalars(stmt)}
+
     for result in results:
         if processed >= max_items:
             break
@@ -72,8 +79,7 @@ def _upsert_news_items(
         if not url:
             continue
 
-        stmt = select(NewsItem).where(NewsItem.url == url)
-        item = db.scalar(stmt)
+        item = existing.get(url)
         if not item:
             item = NewsItem(
                 topic=topic,
@@ -81,6 +87,7 @@ def _upsert_news_items(
                 url=url,
             )
             db.add(item)
+            existing[url] = item
             created += 1
         else:
             updated += 1
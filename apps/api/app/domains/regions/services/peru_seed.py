@@ -75,9 +75,13 @@ DEFAULT_REGIONS: list[dict[str, Any]] = [
 def seed_default_regions(db: Session) -> dict[str, Any]:
     created = 0
     updated = 0
+    # One round trip for all codes; new rows are flushed as a batched INSERT
+    stmt = select(PeruRegion).where(
+        PeruRegion.code.in_([r["code"] for r in DEFAULT_REGIONS])
+    )
+    existing = {obj.code: obj for obj in db.scalars(stmt)}
     for r in DEFAULT_REGIONS:
-        stmt = select(PeruRegion).where(PeruRegion.code == r["code"])
-        obj = db.scalar(stmt)
+        obj = existing.get(r["code"])
         if not obj:
             obj = PeruRegion(code=r["code"], name=r["name"])
             db.add(obj)
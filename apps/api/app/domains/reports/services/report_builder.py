@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.models.cooperative import Cooperative
@@ -20,14 +21,31 @@ MARKET_KEYS = [
 def _latest_by_key(
     db: Session, keys: List[str]
 ) -> Dict[str, Optional[MarketObservation]]:
-    out: Dict[str, Optional[MarketObservation]] = {}
-    for key in keys:
-        out[key] = (
-            db.query(MarketObservation)
-            .filter(MarketObservation.key == key)
-            .order_by(MarketObservation.observed_at.desc())
-            .first()
+    # Newest row per key in one round trip instead of one query per key.
+    ranked = (
+        select(
+            MarketObservation.id,
+            func.row_number()
+            .over(
+                partition_by=MarketObservation.key,
+                order_by=(
+                    MarketObservation.observed_at.desc(),
+                    MarketObservation.id.desc(),
+                ),
+            )
+            .label("rank"),
         )
+        .where(MarketObservation.key.in_(keys))
+        .subquery()
+    )
+    stmt = (
+        select(MarketObservation)
+        .join(ranked, ranked.c.id == MarketObservation.id)
+        .where(ranked.c.rank == 1)
+    )
+    out: Dict[str, Optional[MarketObservation]] = dict.fromkeys(keys)
+    for observation in db.execute(stmt).scalars():
+        out[observation.key] = observation
     return out
 
 
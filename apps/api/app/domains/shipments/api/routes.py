@@ -2,7 +2,8 @@ from datetime import datetime, timezone
 from typing import Annotated, Any, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session, selectinload
 
 from app.api.deps import require_role
 from app.api.response_utils import apply_create_status
@@ -16,6 +17,7 @@ from app.domains.shipments.schemas.shipment import (
     ShipmentCreate,
     ShipmentOut,
     ShipmentUpdate,
+    TrackingEvent,
     TrackingEventCreate,
 )
 from app.core.audit import AuditLogger
@@ -39,10 +41,6 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _utcnow_iso() -> str:
-    return _utcnow().isoformat()
-
-
 def _parse_iso_datetime_or_422(value: str, field_name: str) -> datetime:
     try:
         return datetime.fromisoformat(value)
@@ -134,18 +132,47 @@ def _apply_update_datetime_fields(update_dict: dict[str, Any], current_status: s
         )
 
     if "status" in update_dict and update_dict["status"] != current_status:
-        update_dict["status_updated_at"] = _utcnow_iso()
+        update_dict["status_updated_at"] = _utcnow()
+
+
+def _tracking_events(shipment: Shipment) -> list[TrackingEvent]:
+    events = []
+    for row in shipment.transport_events:
+        details = (row.details or {}).get("details")
+        events.append(
+            TrackingEvent(
+                timestamp=row.occurred_at.isoformat(),
+                location=row.location,
+                event=row.event_type,
+                details=details if isinstance(details, str) else None,
+            )
+        )
+    return events
+
+
+def _shipment_out(shipment: Shipment, lot_ids: list[int]) -> ShipmentOut:
+    base = ShipmentOut.model_validate(shipment)
+    return base.model_copy(
+        update={"lot_ids": lot_ids, "tracking_events": _tracking_events(shipment)}
+    )
+
+
+def _with_events(q):
+    # transport_events is lazy="raise"; load it in one query for the response
+    return q.options(selectinload(Shipment.transport_events))
 
 
 def _build_shipment_out(db: Session, shipment: Shipment) -> ShipmentOut:
+    if "transport_events" in sa_inspect(shipment).unloaded:
+        # Expired by a commit (or never loaded): reload just the history
+        db.refresh(shipment, attribute_names=["transport_events"])
     lot_ids = [
         row.lot_id
         for row in db.query(ShipmentLot)
         .filter(ShipmentLot.shipment_id == shipment.id)
         .all()
     ]
-    base = ShipmentOut.model_validate(shipment)
-    return base.model_copy(update={"lot_ids": lot_ids})
+    return _shipment_out(shipment, lot_ids)
 
 
 def _build_shipment_list_out(
@@ -158,11 +185,7 @@ def _build_shipment_list_out(
     rows = db.query(ShipmentLot).filter(ShipmentLot.shipment_id.in_(shipment_ids)).all()
     for row in rows:
         lot_map.setdefault(row.shipment_id, []).append(row.lot_id)
-    result: list[ShipmentOut] = []
-    for shipment in shipments:
-        base = ShipmentOut.model_validate(shipment)
-        result.append(base.model_copy(update={"lot_ids": lot_map.get(shipment.id, [])}))
-    return result
+    return [_shipment_out(shipment, lot_map.get(shipment.id, [])) for shipment in shipments]
 
 
 @router.get("/", response_model=list[ShipmentOut])
@@ -177,7 +200,7 @@ def list_shipments(
     _: Annotated[None, Depends(require_role("admin", "analyst", "viewer"))],
 ):
     """List all shipments with optional filters."""
-    q = db.query(Shipment)
+    q = _with_events(db.query(Shipment))
     if not include_deleted:
         q = q.filter(Shipment.deleted_at.is_(None))
     if status:
@@ -197,7 +220,7 @@ def list_active_shipments(
 ):
     """Get active shipments (status=in_transit)."""
     shipments = (
-        db.query(Shipment)
+        _with_events(db.query(Shipment))
         .filter(Shipment.status == "in_transit", Shipment.deleted_at.is_(None))
         .order_by(Shipment.created_at.desc())
         .all()
@@ -212,7 +235,7 @@ def list_delayed_shipments(
 ):
     """Get delayed shipments (delay_hours > 0)."""
     shipments = (
-        db.query(Shipment)
+        _with_events(db.query(Shipment))
         .filter(Shipment.delay_hours > 0, Shipment.deleted_at.is_(None))
         .order_by(Shipment.delay_hours.desc())
         .all()
@@ -245,7 +268,7 @@ def create_shipment(
     )
     if existing:
         apply_create_status(request, response, created=False)
-        return existing
+        return _build_shipment_out(db, existing)
 
     # Otherwise, enforce uniqueness constraints.
     _ensure_unique_identifiers(db, payload)
@@ -253,7 +276,6 @@ def create_shipment(
     shipment = Shipment(**payload.model_dump(exclude={"lot_ids"}))
     _apply_create_datetime_fields(shipment, payload)
     lot_ids = _resolve_create_lot_ids(payload, shipment)
-    shipment.tracking_events = []  # Initialize empty tracking events
     db.add(shipment)
     db.commit()
     db.refresh(shipment)
@@ -305,7 +327,7 @@ def get_shipment(
     _: Annotated[None, Depends(require_role("admin", "analyst", "viewer"))],
 ):
     """Get shipment details."""
-    q = db.query(Shipment).filter(Shipment.id == shipment_id)
+    q = _with_events(db.query(Shipment)).filter(Shipment.id == shipment_id)
     if not include_deleted:
         q = q.filter(Shipment.deleted_at.is_(None))
     shipment = q.first()
@@ -489,43 +511,19 @@ def add_tracking_event(
 ):
     """Add a tracking event to a shipment."""
     shipment = (
-        db.query(Shipment)
+        _with_events(db.query(Shipment))
         .filter(Shipment.id == shipment_id, Shipment.deleted_at.is_(None))
         .first()
     )
     if not shipment:
         raise HTTPException(status_code=404, detail=NOT_FOUND_DETAIL)
 
-    # Get existing tracking events or initialize
-    # Defensive handling in case of unexpected data format
-    raw_events = shipment.tracking_events
-    if isinstance(raw_events, list):
-        tracking_events: list[dict] = raw_events
-    else:
-        tracking_events = []
-
-    # Add new event
-    new_event = event.model_dump()
-    tracking_events.append(new_event)
-
-    # Force SQLAlchemy to detect the change by creating a new list
-    shipment.tracking_events = tracking_events.copy()
-
-    # Update current location
-    shipment.current_location = event.location
-
-    # Mark the field as modified to ensure SQLAlchemy commits the change
-    from sqlalchemy.orm.attributes import flag_modified
-
-    flag_modified(shipment, "tracking_events")
-
-    db.commit()
-    db.refresh(shipment)
-
     occurred_at = _parse_iso_datetime_or_422(event.timestamp, "timestamp")
-    db.add(
+    previous_count = len(shipment.transport_events)
+
+    # Each event is a single row insert; the history is never rewritten
+    shipment.transport_events.append(
         TransportEvent(
-            shipment_id=shipment_id,
             event_type=event.event,
             location=event.location,
             occurred_at=occurred_at,
@@ -533,7 +531,9 @@ def add_tracking_event(
             details={"details": event.details} if event.details else None,
         )
     )
+    shipment.current_location = event.location
     db.commit()
+    db.refresh(shipment)
 
     # Log tracking event for audit trail
     AuditLogger.log_update(
@@ -541,8 +541,8 @@ def add_tracking_event(
         user=user,
         entity_type="shipment",
         entity_id=shipment_id,
-        old_data={"tracking_event_count": len(tracking_events) - 1},
-        new_data={"tracking_event": new_event},
+        old_data={"tracking_event_count": previous_count},
+        new_data={"tracking_event": event.model_dump()},
     )
     capture_entity_version(
         db=db,
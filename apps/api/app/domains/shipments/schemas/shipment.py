@@ -10,7 +10,7 @@ INVALID_CHARS_MESSAGE = "Invalid characters in {field_name}"
 
 class TrackingEvent(BaseModel):
     timestamp: str
-    location: str
+    location: Optional[str] = None
     event: str
     details: Optional[str] = None
 
@@ -170,7 +170,7 @@ class ShipmentOut(BaseModel):
     estimated_arrival_at: Optional[datetime] = None
     actual_arrival_at: Optional[datetime] = None
     status: str
-    status_updated_at: Optional[str] = None
+    status_updated_at: Optional[datetime] = None
     delay_hours: int
     tracking_events: Optional[List[TrackingEvent]] = None
     notes: Optional[str] = None
@@ -1,6 +1,10 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
 from fastapi import FastAPI, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from prometheus_fastapi_instrumentator import Instrumentator
 from slowapi import Limiter
@@ -15,13 +19,19 @@ from app.core.config import settings
 from app.infra.metrics import instrument_app
 from app.core.logging import setup_logging
 from app.core.error_handlers import (
+    OrjsonErrorResponse,
     validation_exception_handler,
     http_exception_handler,
     integrity_error_handler,
     operational_error_handler,
     generic_exception_handler,
 )
-from app.middleware import InputValidationMiddleware, SecurityHeadersMiddleware
+from app.middleware import (
+    RateLimitMiddleware,
+    SecurityAndValidationMiddleware,
+    StaticCORSMiddleware,
+    TokenBucketLimiter,
+)
 
 setup_logging()
 log = structlog.get_logger(__name__)
@@ -29,14 +39,19 @@ log = structlog.get_logger(__name__)
 app = FastAPI(title="CoffeeStudio API", version="0.1.0")
 
 # Rate limiter setup
-limiter = Limiter(key_func=get_remote_address, default_limits=["200/minute"])
+# SlowAPI only backs the per-route @limiter.limit decorators; the global
+# per-client limit is the token-bucket RateLimitMiddleware registered below.
+limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
+app.state.rate_limiter = TokenBucketLimiter(requests_per_minute=200)
 
 
 # Custom rate limit handler
 # Note: exc is typed as Exception for FastAPI compatibility but will be RateLimitExceeded
 def rate_limit_exceeded_handler(request: Request, exc: Exception) -> Response:
-    return JSONResponse(status_code=429, content={"detail": "Rate limit exceeded"})
+    return OrjsonErrorResponse(
+        status_code=429, content={"detail": "Rate limit exceeded"}
+    )
 
 
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
@@ -52,13 +67,16 @@ app.add_exception_handler(Exception, generic_exception_handler)
 # Note: Middleware execution order matters in FastAPI
 # Middleware added first executes last on the way out (response)
 # Middleware added last executes first on the way in (request)
-# So: InputValidation -> CORS -> Security Headers (on request)
-#     Security Headers -> CORS -> InputValidation (on response)
-app.add_middleware(SecurityHeadersMiddleware)  # Applied last to responses
-app.add_middleware(InputValidationMiddleware)  # Applied first to requests
-
+# So: CORS -> RateLimit -> SecurityAndValidation (on request)
+#     SecurityAndValidation -> RateLimit -> CORS (on response)
+# Input validation and security headers share one pure-ASGI layer; the rate
+# limit sits outside it so throttled clients never get their body read.
+app.add_middleware(SecurityAndValidationMiddleware)
+app.add_middleware(RateLimitMiddleware, limiter=app.state.rate_limiter)
+
+# Origins are fixed at startup, so they are matched as a pre-encoded set
 app.add_middleware(
-    CORSMiddleware,
+    StaticCORSMiddleware,
     allow_origins=settings.cors_origins_list(),
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
@@ -86,18 +104,42 @@ except Exception as exc:
     log.debug("prometheus_instrumentator_unavailable", exc_info=exc)
 
 
-# Startup event for auto-seeding
-@app.on_event("startup")
-async def startup_seed_data():
-    """Seed default regions and demo data on startup if tables are empty."""
+_MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+
+def _seed_marker_is_fresh(*seed_fns: Any) -> bool:
+    """Return True if the seed marker is newer than the seed code and migrations."""
+    if not settings.SEED_MARKER_PATH:
+        return False
+    try:
+        marker_mtime = os.stat(settings.SEED_MARKER_PATH).st_mtime
+    except OSError:
+        return False
+    sources = [Path(sys.modules[fn.__module__].__file__ or "") for fn in seed_fns]
+    sources.extend(_MIGRATIONS_DIR.glob("*.py"))
+    return all(source.stat().st_mtime < marker_mtime for source in sources)
+
+
+def _run_startup_seed() -> None:
+    """Seed default regions and demo data (blocking; runs in a worker thread)."""
     from app.db.session import SessionLocal
     from app.domains.regions.services.peru_seed import seed_default_regions
     from app.services.seed_peru_regions import seed_peru_regions
     from app.services.seed_demo_data import seed_all_demo_data
-    from sqlalchemy import inspect
+    from sqlalchemy import inspect, text
 
     db = SessionLocal()
     try:
+        # A fresh marker alone is not enough: the database may have been reset
+        if (
+            _seed_marker_is_fresh(
+                seed_default_regions, seed_peru_regions, seed_all_demo_data
+            )
+            and db.execute(text("SELECT 1 FROM peru_regions LIMIT 1")).first()
+        ):
+            log.info("startup_seed", status="skipped", reason="seed marker is fresh")
+            return
+
         log.info("startup_seed", status="starting")
 
         # Seed PeruRegion table (for regions API)
@@ -129,7 +171,19 @@ async def startup_seed_data():
             )
 
         log.info("startup_seed", status="completed")
+        if settings.SEED_MARKER_PATH:
+            Path(settings.SEED_MARKER_PATH).touch()
     except Exception as e:
         log.error("startup_seed", error=str(e), exc_info=True)
     finally:
         db.close()
+
+
+# Startup event for auto-seeding
+@app.on_event("startup")
+async def startup_seed_data():
+    """Seed default regions and demo data on startup if tables are empty."""
+    # Seeding is idempotent and not needed to serve requests, so it runs in a
+    # worker thread instead of holding up readiness. Keep a reference so the
+    # task is not garbage collected mid-run.
+    app.state.seed_task = asyncio.create_task(asyncio.to_thread(_run_startup_seed))
@@ -1,6 +1,16 @@
 """Middleware package for CoffeeStudio API."""
 
+from app.middleware.cors import StaticCORSMiddleware
 from app.middleware.input_validation import InputValidationMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, TokenBucketLimiter
+from app.middleware.security import SecurityAndValidationMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
 
-__all__ = ["InputValidationMiddleware", "SecurityHeadersMiddleware"]
+__all__ = [
+    "InputValidationMiddleware",
+    "RateLimitMiddleware",
+    "SecurityAndValidationMiddleware",
+    "SecurityHeadersMiddleware",
+    "StaticCORSMiddleware",
+    "TokenBucketLimiter",
+]
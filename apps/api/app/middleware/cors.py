@@ -0,0 +1,145 @@
+"""CORS middleware for a fixed set of allowed origins."""
+
+from typing import Optional, Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Request headers browsers may always send (same set Starlette allows)
+SAFELISTED_HEADERS = frozenset(
+    {"Accept", "Accept-Language", "Content-Language", "Content-Type"}
+)
+
+
+class StaticCORSMiddleware:
+    """Drop-in for Starlette's ``CORSMiddleware`` when origins are known up front.
+
+    Allowed origins are resolved once into a set of raw header bytes, so each
+    request costs one set lookup on the ``Origin`` header straight from the
+    ASGI scope. Every CORS response header is pre-encoded. Responses match
+    Starlette's for explicit origins with credentials, except that accepted
+    preflights answer 204 with no body.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        allow_origins: Sequence[str] = (),
+        allow_methods: Sequence[str] = ("GET",),
+        allow_headers: Sequence[str] = (),
+        allow_credentials: bool = False,
+        max_age: int = 600,
+    ) -> None:
+        self.app = app
+        self.allow_all_origins = "*" in allow_origins
+        self.allow_origins = frozenset(origin.encode() for origin in allow_origins)
+        self.allow_methods = frozenset(method.encode() for method in allow_methods)
+        allowed_headers = sorted(SAFELISTED_HEADERS | set(allow_headers))
+        self.allow_headers = frozenset(h.lower() for h in allowed_headers)
+
+        self.simple_headers: list[tuple[bytes, bytes]] = []
+        if allow_credentials:
+            self.simple_headers.append((b"access-control-allow-credentials", b"true"))
+        self.preflight_headers = [
+            (b"vary", b"Origin"),
+            (b"access-control-allow-methods", ", ".join(allow_methods).encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"access-control-allow-headers", ", ".join(allowed_headers).encode()),
+            *self.simple_headers,
+        ]
+
+    def is_allowed_origin(self, origin: bytes) -> bool:
+        return self.allow_all_origins or origin in self.allow_origins
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin: Optional[bytes] = None
+        request_method: Optional[bytes] = None
+        request_headers: Optional[bytes] = None
+        private_network = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+            elif name == b"access-control-request-private-network":
+                private_network = True
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            await self._preflight(
+                origin, request_method, request_headers, private_network, send
+            )
+            return
+        if not self.is_allowed_origin(origin):
+            await self.app(scope, receive, send)
+            return
+
+        extra = [*self.simple_headers, (b"access-control-allow-origin", origin)]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", ())
+                    if name.lower() != b"access-control-allow-origin"
+                ]
+                _add_vary_origin(headers)
+                message["headers"] = headers + extra
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _preflight(
+        self,
+        origin: bytes,
+        request_method: bytes,
+        request_headers: Optional[bytes],
+        private_network: bool,
+        send: Send,
+    ) -> None:
+        """Answer a preflight request without calling the app."""
+        headers = list(self.preflight_headers)
+        failures = []
+        if self.is_allowed_origin(origin):
+            headers.append((b"access-control-allow-origin", origin))
+        else:
+            failures.append("origin")
+        if request_method not in self.allow_methods:
+            failures.append("method")
+        if request_headers is not None and any(
+            h.strip() not in self.allow_headers
+            for h in request_headers.decode("latin-1").lower().split(",")
+        ):
+            failures.append("headers")
+        if private_network:
+            failures.append("private-network")
+
+        if failures:
+            status = 400
+            body = ("Disallowed CORS " + ", ".join(failures)).encode()
+            headers.append((b"content-type", b"text/plain; charset=utf-8"))
+            headers.append((b"content-length", str(len(body)).encode()))
+        else:
+            # 204 responses carry neither a body nor a Content-Length
+            status = 204
+            body = b""
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def _add_vary_origin(headers: list[tuple[bytes, bytes]]) -> None:
+    """Add ``Origin`` to the Vary header, keeping any existing values."""
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            headers[index] = (name, value + b", Origin")
+            return
+    headers.append((b"vary", b"Origin"))
@@ -0,0 +1,89 @@
+"""Global per-client rate limiting as a pure ASGI middleware."""
+
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.middleware.security import FASTPATH_PATHS
+
+# Same payload as the SlowAPI RateLimitExceeded handler in main.py
+_RATE_LIMITED_BODY = b'{"detail":"Rate limit exceeded"}'
+_RATE_LIMITED_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_RATE_LIMITED_BODY)).encode()),
+)
+
+# Buckets kept before idle (fully refilled) ones are dropped
+MAX_BUCKETS = 10_000
+
+
+class TokenBucketLimiter:
+    """In-process token buckets keyed by client address.
+
+    Each client may burst up to ``requests_per_minute`` requests; tokens
+    refill continuously at ``requests_per_minute / 60`` per second. All
+    access happens on the event loop without awaiting in between, so no
+    lock is needed.
+    """
+
+    def __init__(self, requests_per_minute: int) -> None:
+        self.capacity = float(requests_per_minute)
+        self.refill_per_second = requests_per_minute / 60.0
+        self.buckets: dict[str, tuple[float, float]] = {}
+
+    def allow(self, key: str) -> bool:
+        """Take a token for ``key``; return False if its bucket is empty."""
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= MAX_BUCKETS:
+                self._prune(now)
+            tokens = self.capacity
+        else:
+            tokens, last = bucket
+            tokens = min(self.capacity, tokens + (now - last) * self.refill_per_second)
+        if tokens < 1.0:
+            self.buckets[key] = (tokens, now)
+            return False
+        self.buckets[key] = (tokens - 1.0, now)
+        return True
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled completely; they hold no state."""
+        full_after = self.capacity / self.refill_per_second
+        self.buckets = {
+            key: (tokens, last)
+            for key, (tokens, last) in self.buckets.items()
+            if now - last < full_after
+        }
+
+    def reset(self) -> None:
+        """Forget all clients."""
+        self.buckets.clear()
+
+
+class RateLimitMiddleware:
+    """Reject clients that exceed the global request rate with a 429."""
+
+    def __init__(self, app: ASGIApp, limiter: TokenBucketLimiter) -> None:
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Admit the request or answer 429 without calling the app."""
+        if scope["type"] != "http" or scope["path"] in FASTPATH_PATHS:
+            await self.app(scope, receive, send)
+            return
+        client = scope.get("client")
+        if self.limiter.allow(client[0] if client else "unknown"):
+            await self.app(scope, receive, send)
+            return
+        # Fresh messages: outer middleware (e.g. CORS) edit headers in place
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": list(_RATE_LIMITED_HEADERS),
+            }
+        )
+        await send({"type": "http.response.body", "body": _RATE_LIMITED_BODY})
@@ -0,0 +1,27 @@
+"""Combined security middleware for the API."""
+
+from starlette.types import Receive, Scope, Send
+
+from app.middleware.input_validation import InputValidationMiddleware
+from app.middleware.security_headers import send_with_security_headers
+
+# Probe and scrape endpoints: polled several times per second, never take a
+# request body and are not rendered by browsers, so they skip this layer.
+# Browser-facing docs (/docs, /redoc, /openapi.json) keep their headers.
+FASTPATH_PATHS = frozenset({"/metrics", "/health", "/ready"})
+
+
+class SecurityAndValidationMiddleware(InputValidationMiddleware):
+    """Validate requests and add security headers in a single ASGI layer.
+
+    Equivalent to stacking ``InputValidationMiddleware`` and
+    ``SecurityHeadersMiddleware`` but with one ``__call__`` per request.
+    Rejected requests get the security headers as well.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Validate request data and add security headers to the response."""
+        if scope["type"] != "http" or scope["path"] in FASTPATH_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send_with_security_headers(scope, send))
@@ -1,63 +1,76 @@
-"""Security headers middleware for enhanced security."""
-
-from typing import Any
-
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-
-from app.core.config import settings
+"""Security headers middleware for enhanced security."""
 
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+from app.core.config import settings
+
+# Content Security Policy (stricter for production)
+# Note: In development, we allow 'unsafe-inline' and 'unsafe-eval' for debugging.
+# For production, remove these and use nonces or hashes for inline scripts.
+_DEV_CSP = (
+    b"default-src 'self'; "
+    b"script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+    b"style-src 'self' 'unsafe-inline'; "
+    b"img-src 'self' data: https:; "
+    b"font-src 'self' data:; "
+    b"connect-src 'self'"
+)
+_PROD_CSP = (
+    b"default-src 'none'; "
+    b"base-uri 'none'; "
+    b"frame-ancestors 'none'; "
+    b"form-action 'none'; "
+    b"object-src 'none'"
+)
+
+# The headers only vary by environment, so they are encoded once here and
+# appended to the raw response headers as-is.
+_STATIC_HEADERS: tuple[tuple[bytes, bytes], ...] = (
+    # Prevent clickjacking
+    (b"x-frame-options", b"DENY"),
+    # Prevent MIME type sniffing
+    (b"x-content-type-options", b"nosniff"),
+    # Enable XSS protection
+    (b"x-xss-protection", b"1; mode=block"),
+    # Referrer policy
+    (b"referrer-policy", b"strict-origin-when-cross-origin"),
+    # Permissions Policy (formerly Feature Policy)
+    (b"permissions-policy", b"geolocation=(), microphone=(), camera=()"),
+)
+_DEV_HEADERS = _STATIC_HEADERS + ((b"content-security-policy", _DEV_CSP),)
+_PROD_HEADERS = _STATIC_HEADERS + ((b"content-security-policy", _PROD_CSP),)
+
+# Strict Transport Security (for HTTPS)
+_HSTS_HEADER = (b"strict-transport-security", b"max-age=31536000; includeSubDomains")
+
+
+def send_with_security_headers(scope: Scope, send: Send) -> Send:
+    """Wrap ``send`` so the response start message carries the security headers."""
+    if settings.APP_ENV in {"dev", "test"}:
+        headers = _DEV_HEADERS
+    else:
+        headers = _PROD_HEADERS
+    # Read the scheme from the ASGI scope; request.url would parse a URL
+    if scope["scheme"] == "https":
+        headers += (_HSTS_HEADER,)
+
+    async def send_wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            message["headers"] = [*message.get("headers", ()), *headers]
+        await send(message)
+
+    return send_wrapper
+
+
+class SecurityHeadersMiddleware:
     """Add security headers to all responses."""
 
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Add security headers to response."""
-        response: Response = await call_next(request)
-
-        # Prevent clickjacking
-        response.headers["X-Frame-Options"] = "DENY"
-
-        # Prevent MIME type sniffing
-        response.headers["X-Content-Type-Options"] = "nosniff"
-
-        # Enable XSS protection
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-
-        # Referrer policy
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-
-        # Content Security Policy (stricter for production)
-        # Note: In development, we allow 'unsafe-inline' and 'unsafe-eval' for debugging.
-        # For production, remove these and use nonces or hashes for inline scripts.
-        if settings.APP_ENV in {"dev", "test"}:
-            csp_policy = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: https:; "
-                "font-src 'self' data:; "
-                "connect-src 'self'"
-            )
-        else:
-            csp_policy = (
-                "default-src 'none'; "
-                "base-uri 'none'; "
-                "frame-ancestors 'none'; "
-                "form-action 'none'; "
-                "object-src 'none'"
-            )
-        response.headers["Content-Security-Policy"] = csp_policy
-
-        # Strict Transport Security (for HTTPS)
-        if request.url.scheme == "https":
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains"
-            )
-
-        # Permissions Policy (formerly Feature Policy)
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=()"
-        )
-
-        return response
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, send_with_security_headers(scope, send))
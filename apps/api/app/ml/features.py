@@ -0,0 +1,163 @@
+"""Feature, encoding and persistence helpers shared by the ML models.
+
+The Random Forest and XGBoost price/freight models build the same kind of
+float32 feature matrix, so column handling, label encoding, sidecar paths
+and Treelite compilation live here instead of in each model file.
+"""
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+try:
+    import treelite
+
+    TREELITE_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    treelite = None
+    TREELITE_AVAILABLE = False
+
+
+def column_or_default(
+    data: pd.DataFrame, col: str, default: float
+) -> np.ndarray | float:
+    """Return a column as float32 with missing values filled, or the default.
+
+    Columns are read straight into the feature matrix dtype, so no float64
+    intermediate is allocated and downcast.
+    """
+    if col not in data.columns:
+        return default
+    return data[col].to_numpy(dtype=np.float32, na_value=default)
+
+
+def column_or_nan(data: pd.DataFrame, col: str) -> np.ndarray | float:
+    """Return a column as float32 with missing values as NaN, or NaN if absent.
+
+    XGBoost treats NaN as a missing value, so it is passed through as-is.
+    """
+    if col in data.columns:
+        return data[col].to_numpy(dtype=np.float32, na_value=np.nan)
+    return np.nan
+
+
+def month_of(dates: pd.Series) -> np.ndarray:
+    """Return the calendar month (1-12, NaN for missing dates) of a date column.
+
+    Columns that are already datetime64 skip parsing, and the month comes from
+    datetime64[M] integer arithmetic rather than the ``.dt.month`` accessor.
+    """
+    if not pd.api.types.is_datetime64_dtype(dates):
+        dates = pd.to_datetime(dates)
+        if not pd.api.types.is_datetime64_dtype(dates):
+            # Timezone-aware: the month is taken in each value's local time
+            return dates.dt.month.to_numpy(dtype=np.float32)
+    months = dates.to_numpy(dtype="datetime64[M]")
+    month = (months.astype(np.int64) % 12 + 1).astype(np.float32)
+    month[np.isnat(months)] = np.nan
+    return month
+
+
+def encode_labels(
+    data: pd.DataFrame, col: str, encoders: dict[str, dict[str, int]]
+) -> np.ndarray:
+    """Label-encode a column for the RF models, building the mapping on first use.
+
+    The mapping is stored in ``encoders``; labels unknown to it encode as 0.
+    """
+    values = [str(value) for value in data[col]]
+    mapping = encoders.get(col)
+    if mapping is None:
+        # Fit if training; indices follow sorted label order like LabelEncoder
+        mapping = {label: idx for idx, label in enumerate(sorted(set(values)))}
+        encoders[col] = mapping
+    return np.fromiter(
+        (mapping.get(value, 0) for value in values),
+        dtype=np.float32,
+        count=len(values),
+    )
+
+
+def encode_categories(
+    data: pd.DataFrame,
+    col: str,
+    categories: dict[str, pd.CategoricalDtype],
+    missing: float,
+) -> np.ndarray | float:
+    """Map a column to category codes for the XGBoost models, fitting on first use.
+
+    The fitted dtype is stored in ``categories``. Labels it does not know, and
+    an absent column, become ``missing``.
+    """
+    if col not in data.columns:
+        return missing
+    values = data[col].astype(str)
+    dtype = categories.get(col)
+    if dtype is None:
+        # Fit if training; categories come out sorted, via a hash factorize
+        encoded = values.astype("category")
+        categories[col] = encoded.dtype
+        return encoded.cat.codes.to_numpy()
+    codes = dtype.categories.get_indexer(values).astype(np.float32)
+    codes[codes < 0] = missing
+    return codes
+
+
+def label_mapping(encoder: dict[str, int] | LabelEncoder) -> dict[str, int]:
+    """Convert a LabelEncoder from a model saved before dict-based encoding."""
+    if isinstance(encoder, LabelEncoder):
+        return {str(label): idx for idx, label in enumerate(encoder.classes_)}
+    return encoder
+
+
+def class_map(encoder: LabelEncoder) -> dict[str, int]:
+    """Map each label a fitted encoder knows to its index (empty if unfitted)."""
+    classes = getattr(encoder, "classes_", ())
+    return {str(label): idx for idx, label in enumerate(classes)}
+
+
+def categories_of(labels: dict[str, int]) -> pd.CategoricalDtype:
+    """Categorical dtype whose codes are the indices of a label -> index map."""
+    return pd.CategoricalDtype(sorted(labels, key=labels.__getitem__))
+
+
+def splits_on_categories(model: Any) -> bool:
+    """Whether a fitted XGBoost model's booster declares categorical features.
+
+    Boosters trained before categorical support split on the label codes as
+    plain numbers and report no "c" feature types.
+    """
+    return "c" in (model.get_booster().feature_types or ())
+
+
+def sidecar_paths(path: str) -> tuple[Path, Path]:
+    """Return the Treelite checkpoint and encoder JSON saved next to ``path``."""
+    return Path(f"{path}.treelite"), Path(f"{path}.encoders.json")
+
+
+def compile_forest(model: Any) -> "treelite.Model | None":
+    """Compile a fitted sklearn forest for Treelite's native predictor.
+
+    Treelite walks all trees in C++ instead of dispatching one sklearn
+    predict() call per tree. Returns None without Treelite.
+    """
+    if not TREELITE_AVAILABLE:
+        return None
+    return treelite.sklearn.import_model(model)
+
+
+def compile_booster(model: Any, nthread: int) -> "treelite.Model | None":
+    """Compile a fitted XGBoost model for Treelite's native predictor.
+
+    Treelite skips XGBoost's per-call DMatrix construction and predictor
+    dispatch, which dominate small batches. The booster itself is switched to
+    ``nthread`` inference threads either way. Returns None without Treelite.
+    """
+    booster = model.get_booster()
+    booster.set_param({"nthread": nthread})
+    if not TREELITE_AVAILABLE:
+        return None
+    return treelite.frontend.from_xgboost(booster)
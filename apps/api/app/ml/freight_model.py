@@ -1,82 +1,122 @@
 """Freight cost prediction ML model."""
 
+import json
+
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
 import joblib
 
+from app.ml.features import (
+    TREELITE_AVAILABLE,
+    column_or_default,
+    compile_forest,
+    encode_labels,
+    label_mapping,
+    sidecar_paths,
+    treelite,
+)
+
+# Below this many rows per-tree predict() cost is Python call overhead that
+# holds the GIL, so fanning trees out to threads only adds dispatch cost.
+PARALLEL_PREDICT_MIN_ROWS = 1000
+
 
 class FreightCostModel:
     """Machine learning model for freight cost prediction."""
 
+    FEATURE_NAMES = [
+        "route_encoded",
+        "container_type_encoded",
+        "season_encoded",
+        "weight_normalized",
+        "fuel_price_index",
+        "port_congestion_score",
+    ]
+    # Column of each feature in the matrix built by prepare_matrix()
+    FEATURE_INDEX = {name: idx for idx, name in enumerate(FEATURE_NAMES)}
+
     def __init__(self) -> None:
-        self.model = RandomForestRegressor(
-            n_estimators=100, max_depth=10, random_state=42
+        self._model: RandomForestRegressor | None = RandomForestRegressor(
+            n_estimators=100, max_depth=10, random_state=42, n_jobs=-1
         )
-        self.encoders: dict[str, LabelEncoder] = {}
-
-    def prepare_features(
-        self, data: pd.DataFrame
-    ) -> tuple[pd.DataFrame, pd.Series | None]:
-        """Feature engineering for freight prediction.
+        self.encoders: dict[str, dict[str, int]] = {}
+        # Fitted forest compiled for Treelite's native predictor, if available
+        self._compiled: "treelite.Model | None" = None
+        # Pickled estimator not yet read because inference runs from the sidecars
+        self._model_path: str | None = None
+
+    @property
+    def model(self) -> RandomForestRegressor:
+        """The sklearn forest, unpickled on first access after a fast load()."""
+        if self._model is None:
+            self._model = joblib.load(self._model_path)["model"]
+        return self._model
+
+    @model.setter
+    def model(self, value: RandomForestRegressor) -> None:
+        self._model = value
+
+    def prepare_matrix(self, data: pd.DataFrame) -> np.ndarray:
+        """Build the feature matrix for freight prediction.
+
+        Features are written straight into one pre-sized, C-contiguous float32
+        matrix (the layout and dtype the forest predicts on) instead of
+        copying ``data`` and adding columns to it one by one.
 
         Args:
             data: Raw freight data with columns like route, container_type, etc.
 
         Returns:
-            Tuple of (X features, y target) or (X features, None) for prediction
+            Array of shape (n_rows, n_features), columns in FEATURE_NAMES order
         """
-        df = data.copy()
+        X = np.empty((len(data), len(self.FEATURE_NAMES)), dtype=np.float32)
+        col = self.FEATURE_INDEX
 
         # Encode categorical features
-        categorical_cols = ["route", "container_type", "season", "carrier"]
-        for col in categorical_cols:
-            if col in df.columns:
-                if col not in self.encoders:
-                    self.encoders[col] = LabelEncoder()
-                    # Fit if training
-                    if col in df.columns and not df[col].empty:
-                        self.encoders[col].fit(df[col].astype(str))
-                try:
-                    df[f"{col}_encoded"] = self.encoders[col].transform(
-                        df[col].astype(str)
-                    )
-                except ValueError:
-                    # Handle unknown labels during prediction
-                    df[f"{col}_encoded"] = 0
+        for name in ("route", "container_type", "season"):
+            X[:, col[f"{name}_encoded"]] = encode_labels(data, name, self.encoders)
 
         # Normalize weight
-        if "weight_kg" in df.columns:
-            df["weight_normalized"] = df["weight_kg"] / 20000.0  # Normalize by max
+        X[:, col["weight_normalized"]] = (
+            np.asarray(data["weight_kg"], dtype=np.float64) / 20000.0
+        )
 
         # Handle missing optional features
-        if "fuel_price_index" in df.columns:
-            df["fuel_price_index"] = df["fuel_price_index"].fillna(100.0)
-        else:
-            df["fuel_price_index"] = 100.0
+        X[:, col["fuel_price_index"]] = column_or_default(
+            data, "fuel_price_index", 100.0
+        )
+        X[:, col["port_congestion_score"]] = column_or_default(
+            data, "port_congestion_score", 50.0
+        )
 
-        if "port_congestion_score" in df.columns:
-            df["port_congestion_score"] = df["port_congestion_score"].fillna(50.0)
-        else:
-            df["port_congestion_score"] = 50.0
+        return X
 
-        # Select features for model
-        feature_cols = [
-            "route_encoded",
-            "container_type_encoded",
-            "season_encoded",
-            "weight_normalized",
-            "fuel_price_index",
-            "port_congestion_score",
-        ]
+    def prepare_features(
+        self, data: pd.DataFrame
+    ) -> tuple[pd.DataFrame, pd.Series | None]:
+        """Feature engineering for freight prediction.
+
+        Wraps :meth:`prepare_matrix` in a DataFrame without copying it; use
+        ``prepare_matrix`` directly when only predicting.
+
+        Args:
+            data: Raw freight data with columns like route, container_type, etc.
 
-        X = df[feature_cols]
+        Returns:
+            Tuple of (X features, y target) or (X features, None) for prediction
+        """
+        features = pd.DataFrame(
+            self.prepare_matrix(data),
+            columns=self.FEATURE_NAMES,
+            index=data.index,
+            copy=False,
+        )
 
         # Return target if available (training)
-        y = df["freight_cost_usd"] if "freight_cost_usd" in df.columns else None
+        y = data["freight_cost_usd"] if "freight_cost_usd" in data.columns else None
 
-        return X, y
+        return features, y
 
     def train(self, X: pd.DataFrame, y: pd.Series | None) -> None:
         """Train the freight cost model.
@@ -86,46 +126,99 @@ class FreightCostModel:
             y: Target series (freight costs)
         """
         # y may be Optional at type-check time; callers should ensure it's not None.
-        self.model.fit(X, y)
+        # Fit on the raw matrix so inference never needs feature names.
+        self.model.fit(np.ascontiguousarray(X, dtype=np.float32), y)
+        self._compiled = compile_forest(self.model)
 
-    def predict(self, X: pd.DataFrame) -> np.ndarray:
+    def predict(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
         """Make freight cost predictions.
 
         Args:
-            X: Feature dataframe
+            X: Feature dataframe or matrix
+
+        Returns:
+            Array of predicted freight costs
+        """
+        return self.predict_ndarray(np.ascontiguousarray(X, dtype=np.float32))
+
+    def predict_ndarray(self, X: np.ndarray) -> np.ndarray:
+        """Make freight cost predictions from a C-contiguous float32 matrix.
+
+        Args:
+            X: Matrix from prepare_matrix(), columns in FEATURE_NAMES order
 
         Returns:
             Array of predicted freight costs
         """
+        if self._compiled is not None:
+            return treelite.gtil.predict(self._compiled, X).ravel()
+        if hasattr(self.model, "feature_names_in_"):
+            # Forest saved when training still fitted on a DataFrame
+            X = pd.DataFrame(X, columns=self.FEATURE_NAMES, copy=False)
         return self.model.predict(X)
 
+    def _predict_trees(self, X_arr: np.ndarray) -> np.ndarray:
+        """Return per-tree predictions with shape (n_trees, n_rows)."""
+        if self._compiled is not None:
+            # Treelite returns (n_rows, n_trees, n_targets)
+            return treelite.gtil.predict_per_tree(self._compiled, X_arr)[:, :, 0].T
+
+        estimators = self.model.estimators_
+        tree_predictions = np.empty((len(estimators), X_arr.shape[0]), dtype=np.float32)
+
+        def fill(start: int, stop: int) -> None:
+            for i in range(start, stop):
+                tree_predictions[i] = estimators[i].predict(X_arr, check_input=False)
+
+        # Tree traversal releases the GIL, so larger batches are split into
+        # one contiguous slice of trees per worker thread.
+        n_jobs = min(joblib.effective_n_jobs(self.model.n_jobs), len(estimators))
+        if n_jobs > 1 and X_arr.shape[0] >= PARALLEL_PREDICT_MIN_ROWS:
+            bounds = np.linspace(0, len(estimators), n_jobs + 1, dtype=int)
+            joblib.Parallel(n_jobs=n_jobs, prefer="threads")(
+                joblib.delayed(fill)(start, stop)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            )
+        else:
+            fill(0, len(estimators))
+        return tree_predictions
+
     def predict_with_confidence(
-        self, X: pd.DataFrame
+        self, X: pd.DataFrame | np.ndarray
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Make predictions with confidence intervals.
 
         Args:
-            X: Feature dataframe
+            X: Feature dataframe or matrix
 
         Returns:
             Tuple of (predictions, lower_bound, upper_bound)
         """
-        predictions = self.predict(X)
+        # Trees predict on float32 internally, so convert once and skip the
+        # per-tree input validation.
+        X_arr = np.ascontiguousarray(X, dtype=np.float32)
+        tree_predictions = self._predict_trees(X_arr)
+
+        # The forest prediction is the mean over trees, so reuse the per-tree
+        # buffer instead of walking every tree a second time via predict().
+        predictions = tree_predictions.mean(axis=0, dtype=np.float64)
 
         # Use standard deviation from trees for confidence
-        tree_predictions = np.array(
-            [tree.predict(X) for tree in self.model.estimators_]
-        )
-        std = np.std(tree_predictions, axis=0)
+        margin = tree_predictions.std(axis=0, dtype=np.float64)
+        margin *= 1.96
 
-        lower_bound = predictions - 1.96 * std
-        upper_bound = predictions + 1.96 * std
+        lower_bound = predictions - margin
+        upper_bound = predictions + margin
 
         return predictions, lower_bound, upper_bound
 
     def save(self, path: str) -> None:
         """Save model to disk.
 
+        The joblib pickle stays the canonical artifact. When the forest is
+        compiled, its Treelite checkpoint and the encoders are written next to
+        it so load() can serve predictions without unpickling the estimator.
+
         Args:
             path: File path for saving the model
         """
@@ -135,16 +228,39 @@ class FreightCostModel:
             "algorithm": "random_forest",
         }
         joblib.dump(model_data, path)
+        compiled_path, encoders_path = sidecar_paths(path)
+        if self._compiled is None:
+            # Never leave sidecars from an earlier save next to a new pickle
+            compiled_path.unlink(missing_ok=True)
+            encoders_path.unlink(missing_ok=True)
+            return
+        self._compiled.serialize(str(compiled_path))
+        encoders_path.write_text(json.dumps(self.encoders), encoding="utf-8")
 
     def load(self, path: str) -> None:
         """Load model from disk.
 
+        Reads the Treelite sidecars when present, deferring the pickled
+        estimator until something (retraining, feature importances) needs it.
+
         Args:
             path: File path for loading the model
         """
+        compiled_path, encoders_path = sidecar_paths(path)
+        if TREELITE_AVAILABLE and compiled_path.exists() and encoders_path.exists():
+            self._compiled = treelite.Model.deserialize(str(compiled_path))
+            self.encoders = json.loads(encoders_path.read_text(encoding="utf-8"))
+            self._model = None
+            self._model_path = path
+            return
+
         model_data = joblib.load(path)
         self.model = model_data["model"]
-        self.encoders = model_data["encoders"]
+        self.encoders = {
+            col: label_mapping(encoder)
+            for col, encoder in model_data["encoders"].items()
+        }
+        self._compiled = compile_forest(self.model)
 
     def get_feature_importance(self) -> dict[str, float]:
         """Return feature importances from the trained Random Forest model.
@@ -152,18 +268,10 @@ class FreightCostModel:
         Returns:
             Mapping of feature name -> importance score (normalised to sum 1).
         """
-        feature_names = [
-            "route_encoded",
-            "container_type_encoded",
-            "season_encoded",
-            "weight_normalized",
-            "fuel_price_index",
-            "port_congestion_score",
-        ]
         importance_scores = self.model.feature_importances_
         total = importance_scores.sum()
         if total == 0:
             normalised = importance_scores
         else:
             normalised = importance_scores / total
-        return dict(zip(feature_names, normalised.tolist()))
+        return dict(zip(self.FEATURE_NAMES, normalised.tolist()))
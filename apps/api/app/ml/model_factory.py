@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Union
 
 if TYPE_CHECKING:
     from app.ml.freight_model import FreightCostModel
@@ -15,6 +15,20 @@ if TYPE_CHECKING:
 
 _VALID_MODEL_TYPES = ("random_forest", "xgboost")
 
+# XGBRegressor hyperparameters shared by the price and freight XGBoost models
+XGB_PARAMS: dict[str, Any] = {
+    "n_estimators": 300,
+    "max_depth": 6,
+    "learning_rate": 0.05,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "random_state": 42,
+    "n_jobs": -1,
+    "tree_method": "hist",
+    # Encoded columns are split as categories (see FEATURE_TYPES), not ordinals
+    "enable_categorical": True,
+}
+
 # Maps model class name -> canonical algorithm string stored in the DB.
 _CLASS_TO_ALGORITHM: dict[str, str] = {
     "CoffeePriceModel": "random_forest",
@@ -1,9 +1,25 @@
 """XGBoost coffee price prediction ML model."""
 
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
 import joblib
+import orjson
+
+from app.ml.features import (
+    TREELITE_AVAILABLE,
+    categories_of,
+    class_map,
+    column_or_default,
+    column_or_nan,
+    compile_booster,
+    encode_categories,
+    month_of,
+    splits_on_categories,
+    treelite,
+)
+from app.ml.model_factory import XGB_PARAMS
 
 try:
     from xgboost import XGBRegressor
@@ -12,6 +28,11 @@ try:
 except ImportError:  # pragma: no cover
     _XGBOOST_AVAILABLE = False
 
+# Requests score one or a few rows, where thread start-up and synchronisation
+# cost more than the tree walk itself. Inference therefore runs on one thread
+# and throughput scales with worker processes; training keeps n_jobs=-1.
+INFERENCE_NTHREAD = 1
+
 
 class XGBoostCoffeePriceModel:
     """XGBoost machine learning model for coffee price prediction.
@@ -31,101 +52,112 @@ class XGBoostCoffeePriceModel:
         "ice_c_price_normalized",
         "month",
     ]
+    FEATURE_INDEX = {name: idx for idx, name in enumerate(FEATURE_NAMES)}
+    # XGBoost feature types: category codes ("c") and numeric values ("q")
+    FEATURE_TYPES = [
+        "c" if name.endswith("_encoded") else "q" for name in FEATURE_NAMES
+    ]
 
     def __init__(self) -> None:
         if not _XGBOOST_AVAILABLE:
             raise ImportError(
                 "xgboost is not installed. Add xgboost>=2.0.0 to requirements.txt."
             )
-        self.model = XGBRegressor(
-            n_estimators=300,
-            max_depth=6,
-            learning_rate=0.05,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=42,
-            n_jobs=-1,
-            tree_method="hist",
-        )
-        self.encoders: dict[str, LabelEncoder] = {}
-
-    def prepare_features(
-        self, data: pd.DataFrame
-    ) -> tuple[pd.DataFrame, pd.Series | None]:
-        """Feature engineering for coffee price prediction.
+        self.model = XGBRegressor(**XGB_PARAMS, feature_types=self.FEATURE_TYPES)
+        # Fitted labels per column; encoding is a hash lookup into these
+        self._categories: dict[str, pd.CategoricalDtype] = {}
+        # Legacy numeric-split boosters expect unknown labels as code 0
+        self._numeric_codes = False
+        # Fitted booster compiled for Treelite's native predictor, if available
+        self._compiled: "treelite.Model | None" = None
+        # Normalised gains, computed on first get_feature_importance() call
+        self._feature_importance: dict[str, float] | None = None
+
+    def prepare_matrix(self, data: pd.DataFrame) -> np.ndarray:
+        """Build the feature matrix for coffee price prediction.
+
+        Features are written straight into one pre-sized, C-contiguous float32
+        matrix instead of copying ``data``, adding columns one at a time and
+        then selecting them. Absent inputs get their documented default, and
+        categorical ones are left missing.
 
         Args:
             data: Raw coffee price data
 
         Returns:
-            Tuple of (X features, y target) or (X features, None) for prediction
+            Array of shape (n_rows, n_features), columns in FEATURE_NAMES order
         """
-        df = data.copy()
+        X = np.empty((len(data), len(self.FEATURE_NAMES)), dtype=np.float32)
+        col = self.FEATURE_INDEX
 
-        # Encode categorical features
-        categorical_cols = [
+        # Encode categorical features; unknown labels are missing (see __init__)
+        missing = 0.0 if self._numeric_codes else np.nan
+        for name in (
             "origin_country",
             "origin_region",
             "variety",
             "process_method",
             "quality_grade",
-            "market_source",
-        ]
-        for col in categorical_cols:
-            if col in df.columns:
-                if col not in self.encoders:
-                    self.encoders[col] = LabelEncoder()
-                    if not df[col].empty:
-                        self.encoders[col].fit(df[col].astype(str))
-                try:
-                    df[f"{col}_encoded"] = self.encoders[col].transform(
-                        df[col].astype(str)
-                    )
-                except ValueError:
-                    # Handle unknown labels at the element level: map known
-                    # categories via the fitted classes_, default unknowns to 0.
-                    class_to_index = {
-                        cls: idx for idx, cls in enumerate(self.encoders[col].classes_)
-                    }
-                    df[f"{col}_encoded"] = (
-                        df[col].astype(str).map(class_to_index).fillna(0).astype(int)
-                    )
+        ):
+            X[:, col[f"{name}_encoded"]] = encode_categories(
+                data, name, self._categories, missing
+            )
 
         # Handle cupping score
-        if "cupping_score" in df.columns:
-            df["cupping_score"] = df["cupping_score"].fillna(82.0)
-        else:
-            df["cupping_score"] = 82.0
+        X[:, col["cupping_score"]] = column_or_default(data, "cupping_score", 82.0)
 
-        # Handle ICE C price
-        if "ice_c_price_usd_per_lb" in df.columns:
-            df["ice_c_price_normalized"] = df["ice_c_price_usd_per_lb"] / 2.0
+        # Certification count from JSON/list
+        if "certifications" in data.columns:
+            # Iterate the raw object array; Series.apply wraps every row
+            certifications = data["certifications"].to_numpy()
+            X[:, col["certification_count"]] = np.fromiter(
+                (len(x) if isinstance(x, list) else 0 for x in certifications),
+                dtype=np.int32,
+                count=len(certifications),
+            )
         else:
-            df["ice_c_price_normalized"] = 1.0
+            X[:, col["certification_count"]] = 0
 
-        # Certification count from JSON/list
-        if "certifications" in df.columns:
-            df["certification_count"] = df["certifications"].apply(
-                lambda x: len(x) if isinstance(x, list) else 0
+        # Handle ICE C price (missing prices stay NaN for XGBoost)
+        if "ice_c_price_usd_per_lb" in data.columns:
+            X[:, col["ice_c_price_normalized"]] = column_or_nan(
+                data, "ice_c_price_usd_per_lb"
             )
+            X[:, col["ice_c_price_normalized"]] /= 2.0
         else:
-            df["certification_count"] = 0
+            X[:, col["ice_c_price_normalized"]] = 1.0
 
         # Extract month for seasonality
-        if "date" in df.columns:
-            df["month"] = pd.to_datetime(df["date"]).dt.month
+        if "date" in data.columns:
+            X[:, col["month"]] = month_of(data["date"])
         else:
-            df["month"] = 1
+            X[:, col["month"]] = 1
 
-        # Ensure all feature columns exist
-        for col in self.FEATURE_NAMES:
-            if col not in df.columns:
-                df[col] = 0
+        return X
+
+    def prepare_features(
+        self, data: pd.DataFrame
+    ) -> tuple[pd.DataFrame, pd.Series | None]:
+        """Feature engineering for coffee price prediction.
+
+        Wraps :meth:`prepare_matrix` in a DataFrame without copying it; use
+        ``prepare_matrix`` directly when only predicting.
+
+        Args:
+            data: Raw coffee price data
 
-        X = df[self.FEATURE_NAMES]
-        y = df["price_usd_per_kg"] if "price_usd_per_kg" in df.columns else None
+        Returns:
+            Tuple of (X features, y target) or (X features, None) for prediction
+        """
+        features = pd.DataFrame(
+            self.prepare_matrix(data),
+            columns=self.FEATURE_NAMES,
+            index=data.index,
+            copy=False,
+        )
+        y = data["price_usd_per_kg"] if "price_usd_per_kg" in data.columns else None
 
-        return X, y
+        return features, y
 
     def train(self, X: pd.DataFrame, y: pd.Series | None) -> None:
         """Train the XGBoost coffee price model.
@@ -136,20 +168,42 @@ class XGBoostCoffeePriceModel:
         """
         # y may be Optional at type-check time; callers should ensure it's not None.
         self.model.fit(X, y)
+        self._numeric_codes = not splits_on_categories(self.model)
+        self._feature_importance = None
+        self._compiled = compile_booster(self.model, INFERENCE_NTHREAD)
 
-    def predict(self, X: pd.DataFrame) -> np.ndarray:
+    def predict(self, X: pd.DataFrame | np.ndarray) -> np.ndarray:
         """Make price predictions.
 
         Args:
-            X: Feature dataframe
+            X: Feature dataframe or matrix
 
         Returns:
             Array of predicted prices
         """
-        return self.model.predict(X)
+        return self.predict_ndarray(np.ascontiguousarray(X, dtype=np.float32))
+
+    def predict_ndarray(self, X: np.ndarray) -> np.ndarray:
+        """Make price predictions from a C-contiguous float32 matrix.
+
+        Skips DataFrame handling and XGBoost's DMatrix construction: Treelite
+        predicts on the array directly, and without it the booster's
+        ``inplace_predict`` reads the buffer in place.
+
+        Args:
+            X: Matrix from prepare_matrix(), columns in FEATURE_NAMES order
+
+        Returns:
+            Array of predicted prices
+        """
+        if self._compiled is not None:
+            return treelite.gtil.predict(
+                self._compiled, X, nthread=INFERENCE_NTHREAD
+            ).ravel()
+        return self.model.get_booster().inplace_predict(X)
 
     def predict_with_confidence(
-        self, X: pd.DataFrame
+        self, X: pd.DataFrame | np.ndarray
     ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
         """Make predictions with approximate confidence intervals.
 
@@ -159,15 +213,17 @@ class XGBoostCoffeePriceModel:
         be used instead.
 
         Args:
-            X: Feature dataframe
+            X: Feature dataframe or matrix
 
         Returns:
             Tuple of (predictions, lower_bound, upper_bound)
         """
         predictions = self.predict(X)
-        margin = np.abs(predictions) * 0.10
+        # One temporary: the margin buffer is reused for the upper bound
+        margin = np.abs(predictions)
+        margin *= 0.10
         lower_bound = predictions - margin
-        upper_bound = predictions + margin
+        upper_bound = np.add(predictions, margin, out=margin)
         return predictions, lower_bound, upper_bound
 
     def get_feature_importance(self) -> dict[str, float]:
@@ -179,33 +235,83 @@ class XGBoostCoffeePriceModel:
         Raises:
             RuntimeError: If model has not been trained yet.
         """
-        importance_scores = self.model.feature_importances_
-        total = importance_scores.sum()
-        if total == 0:
-            normalised = importance_scores
-        else:
-            normalised = importance_scores / total
-        return dict(zip(self.FEATURE_NAMES, normalised.tolist()))
+        if self._feature_importance is None:
+            # Booster gains directly; feature_importances_ repeats the tree
+            # walk and its sklearn-side allocations on every access.
+            booster = self.model.get_booster()
+            scores = booster.get_score(importance_type="gain")
+            names = booster.feature_names or [
+                f"f{idx}" for idx in range(len(self.FEATURE_NAMES))
+            ]
+            gains = np.array([scores.get(name, 0.0) for name in names])
+            total = gains.sum()
+            if total != 0:
+                gains /= total
+            self._feature_importance = dict(zip(self.FEATURE_NAMES, gains.tolist()))
+        return dict(self._feature_importance)
 
     def save(self, path: str) -> None:
         """Save model to disk.
 
+        ``path`` receives a small JSON document with the label maps, written
+        with orjson instead of pickling Python objects. The booster is written
+        next to it in XGBoost's native UBJSON format (``.ubj``), and, when
+        compiled, its Treelite checkpoint so load() does not have to convert
+        the booster again.
+
         Args:
             path: File path for saving the model
         """
-        model_data = {
-            "model": self.model,
-            "encoders": self.encoders,
-            "algorithm": "xgboost",
+        self.model.save_model(f"{path}.ubj")
+        class_maps = {
+            col: {label: idx for idx, label in enumerate(dtype.categories)}
+            for col, dtype in self._categories.items()
         }
-        joblib.dump(model_data, path)
+        model_data = {"class_maps": class_maps, "algorithm": "xgboost"}
+        Path(path).write_bytes(orjson.dumps(model_data))
+        compiled_path = Path(f"{path}.treelite")
+        if self._compiled is None:
+            # Never leave a checkpoint from an earlier save next to a new model
+            compiled_path.unlink(missing_ok=True)
+        else:
+            self._compiled.serialize(str(compiled_path))
 
     def load(self, path: str) -> None:
         """Load model from disk.
 
+        The booster is read into the existing XGBRegressor, then one dummy row
+        is predicted so the first request does not pay for warm-up. Models
+        saved as joblib pickles by earlier versions still load.
+
         Args:
             path: File path for loading the model
         """
-        model_data = joblib.load(path)
-        self.model = model_data["model"]
-        self.encoders = model_data["encoders"]
+        self._feature_importance = None
+        try:
+            model_data = orjson.loads(Path(path).read_bytes())
+        except orjson.JSONDecodeError:
+            model_data = joblib.load(path)
+        if "model" in model_data:
+            # Saved before the booster was stored natively
+            self.model = model_data["model"]
+        else:
+            self.model.load_model(f"{path}.ubj")
+        self._numeric_codes = not splits_on_categories(self.model)
+        if "encoders" in model_data:
+            # Pickled encoders; the oldest saves have no class maps either
+            class_maps = model_data.get("class_maps") or {
+                col: class_map(encoder)
+                for col, encoder in model_data["encoders"].items()
+            }
+        else:
+            class_maps = model_data["class_maps"]
+        self._categories = {
+            col: categories_of(labels) for col, labels in class_maps.items()
+        }
+        compiled_path = Path(f"{path}.treelite")
+        if TREELITE_AVAILABLE and compiled_path.exists():
+            self.model.get_booster().set_param({"nthread": INFERENCE_NTHREAD})
+            self._compiled = treelite.Model.deserialize(str(compiled_path))
+        else:
+            self._compiled = compile_booster(self.model, INFERENCE_NTHREAD)
+        self.predict_ndarray(np.zeros((1, len(self.FEATURE_NAMES)), dtype=np.float32))
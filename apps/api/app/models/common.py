@@ -1,8 +1,13 @@
 from datetime import datetime
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Mapped, mapped_column
 
+# Large JSON documents: binary JSONB on Postgres, so key extraction skips
+# re-parsing and GIN indexes apply; plain JSON elsewhere (SQLite in tests).
+JSONDocument = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
 
 class TimestampMixin:
     created_at: Mapped[datetime] = mapped_column(
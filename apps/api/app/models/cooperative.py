@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Text, Float, JSON, DateTime, ForeignKey
+from sqlalchemy import String, Text, Float, JSON, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 try:
@@ -81,3 +81,14 @@ class Cooperative(Base, TimestampMixin, SoftDeleteMixin):
     embedding: Mapped[list[float] | None] = mapped_column(
         Vector(384), nullable=True
     )  # 384 dims to match sentence-transformers/all-MiniLM-L6-v2
+
+
+# HNSW for cosine nearest-neighbour search (ORDER BY embedding <=> :q LIMIT k);
+# created by migrations 0013/0014, which need the pgvector extension.
+Index(
+    "ix_cooperatives_embedding_cosine",
+    Cooperative.embedding,
+    postgresql_using="hnsw",
+    postgresql_with={"m": 16, "ef_construction": 64},
+    postgresql_ops={"embedding": "vector_cosine_ops"},
+).ddl_if(dialect="postgresql")
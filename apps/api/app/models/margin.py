@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy import String, JSON, DateTime, ForeignKey, Index
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
 from app.models.common import TimestampMixin
@@ -24,5 +24,13 @@ class MarginRun(Base, TimestampMixin):
         DateTime(timezone=True), index=True, nullable=False
     )
 
+    # lazy="raise": load explicitly (joinedload/selectinload), never per row
+    lot = relationship("Lot", lazy="raise")
+
 
 Index("ix_margin_runs_lot_profile", MarginRun.lot_id, MarginRun.profile)
+Index(
+    "ix_margin_runs_lot_computed_at",
+    MarginRun.lot_id,
+    MarginRun.computed_at.desc(),
+)
@@ -1,14 +1,24 @@
 from datetime import datetime
-from sqlalchemy import String, Text, Float, JSON, DateTime, ForeignKey, Index
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    String,
+    Text,
+    Float,
+    DateTime,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
-from app.models.common import TimestampMixin
+from app.models.common import JSONDocument, TimestampMixin
 
 
 class MarketObservation(Base, TimestampMixin):
     """A market observation (FX, coffee price, freight, etc.) with provenance."""
 
+    # On Postgres the table is range-partitioned by month on observed_at
+    # (migration 0029), so its primary key there is (id, observed_at).
     __tablename__ = "market_observations"
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -28,8 +38,23 @@ class MarketObservation(Base, TimestampMixin):
         ForeignKey("sources.id"), nullable=True, index=True
     )
 
-    raw_text: Mapped[str | None] = mapped_column(Text, nullable=True)
-    meta: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Full upstream payload; only the observations list returns it (selected
+    # as a column there), so ORM loads leave it out unless undeferred.
+    raw_text: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    meta: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
+
+    # lazy="raise": load explicitly (joinedload/selectinload), never per row
+    source = relationship("Source", lazy="raise")
+
+    # Created by migration 0007; ingest upserts against it
+    __table_args__ = (
+        UniqueConstraint(
+            "key",
+            "observed_at",
+            "source_id",
+            name="uq_market_observations_key_observed_at_source_id",
+        ),
+    )
 
 
 Index(
@@ -37,3 +62,14 @@ Index(
     MarketObservation.key,
     MarketObservation.observed_at,
 )
+Index(
+    "ix_market_observations_meta_gin",
+    MarketObservation.meta,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_market_observations_observed_at_brin",
+    MarketObservation.observed_at,
+    postgresql_using="brin",
+    postgresql_with={"pages_per_range": 32},
+).ddl_if(dialect="postgresql")
@@ -1,9 +1,9 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, DateTime, JSON
+from sqlalchemy import String, Integer, DateTime, Enum, JSON, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
-from app.models.common import TimestampMixin
+from app.models.common import JSONDocument, TimestampMixin
 
 
 class MLModel(Base, TimestampMixin):
@@ -22,13 +22,27 @@ class MLModel(Base, TimestampMixin):
     )
     features_used: Mapped[dict] = mapped_column(JSON, nullable=False)
     performance_metrics: Mapped[dict] = mapped_column(
-        JSON, nullable=False
+        JSONDocument, nullable=False
     )  # mae, rmse, r2_score, accuracy_percentage
     training_data_count: Mapped[int] = mapped_column(Integer, nullable=False)
     model_file_path: Mapped[str] = mapped_column(String(512), nullable=False)
+    # Active models are found through ix_ml_models_active.
     status: Mapped[str] = mapped_column(
-        String(32), nullable=False, index=True
-    )  # training, active, deprecated
+        Enum("training", "active", "deprecated", name="ml_model_status"),
+        nullable=False,
+    )
     algorithm: Mapped[str | None] = mapped_column(
         String(32), nullable=True
     )  # random_forest, xgboost
+
+
+Index(
+    "ix_ml_models_r2_score",
+    MLModel.performance_metrics["r2_score"].as_float(),
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_ml_models_active",
+    MLModel.model_type,
+    MLModel.training_date,
+    postgresql_where=MLModel.status == "active",
+)
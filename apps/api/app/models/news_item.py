@@ -1,9 +1,9 @@
 from datetime import datetime
-from sqlalchemy import String, Text, Float, DateTime, JSON, UniqueConstraint, Index
+from sqlalchemy import String, Text, Float, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
-from app.models.common import TimestampMixin
+from app.models.common import JSONDocument, TimestampMixin
 
 
 class NewsItem(Base, TimestampMixin):
@@ -32,9 +32,25 @@ class NewsItem(Base, TimestampMixin):
         String(16), nullable=True, index=True
     )
 
-    meta: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    meta: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
 
     __table_args__ = (UniqueConstraint("url", name="uq_news_url"),)
 
 
-Index("ix_news_topic_retrieved", NewsItem.topic, NewsItem.retrieved_at)
+# Market Radar lists newest-first per topic; NULLS LAST matches its ORDER BY
+# but is Postgres-only syntax, so other dialects skip this index.
+Index(
+    "ix_news_topic_retrieved",
+    NewsItem.topic,
+    NewsItem.retrieved_at.desc().nullslast(),
+    postgresql_include=["title", "url", "sentiment_score", "sentiment_label"],
+).ddl_if(dialect="postgresql")
+Index("ix_news_items_meta_gin", NewsItem.meta, postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+Index(
+    "ix_news_items_retrieved_at_brin",
+    NewsItem.retrieved_at,
+    postgresql_using="brin",
+    postgresql_with={"pages_per_range": 32},
+).ddl_if(dialect="postgresql")
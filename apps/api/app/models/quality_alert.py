@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, Float, Boolean, DateTime, Index
+from sqlalchemy import String, Integer, Float, Boolean, DateTime, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
@@ -23,12 +23,13 @@ class QualityAlert(Base, TimestampMixin):
     old_value: Mapped[float | None] = mapped_column(Float, nullable=True)
     new_value: Mapped[float | None] = mapped_column(Float, nullable=True)
     change_amount: Mapped[float | None] = mapped_column(Float, nullable=True)
+    # Leading column of ix_quality_alerts_severity_ack; no index of its own.
     severity: Mapped[str] = mapped_column(
-        String(16), nullable=False, default="info", index=True
-    )  # info|warning|critical
-    acknowledged: Mapped[bool] = mapped_column(
-        Boolean, nullable=False, default=False, index=True
+        Enum("info", "warning", "critical", name="alert_severity"),
+        nullable=False,
+        default="info",
     )
+    acknowledged: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     acknowledged_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
     acknowledged_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -41,3 +42,12 @@ Index(
 Index(
     "ix_quality_alerts_severity_ack", QualityAlert.severity, QualityAlert.acknowledged
 )
+# Open-alert lookups before raising a new one; acknowledged rows are the bulk
+# of the table and stay out of this index.
+Index(
+    "ix_quality_alerts_open",
+    QualityAlert.entity_type,
+    QualityAlert.entity_id,
+    QualityAlert.alert_type,
+    postgresql_where=QualityAlert.acknowledged.is_(False),
+)
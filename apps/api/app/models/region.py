@@ -1,9 +1,11 @@
-from sqlalchemy import String, Text, Float, UniqueConstraint
+from sqlalchemy import String, Text, Float, Enum, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
 from app.models.common import TimestampMixin, SoftDeleteMixin
 
+RiskLevel = Enum("low", "medium", "high", name="risk_level")
+
 
 class Region(Base, TimestampMixin, SoftDeleteMixin):
     """Coffee producing regions with comprehensive sourcing intelligence data."""
@@ -42,15 +44,9 @@ class Region(Base, TimestampMixin, SoftDeleteMixin):
     infrastructure_score: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     # Risk factors
-    weather_risk: Mapped[str | None] = mapped_column(
-        String(32), nullable=True
-    )  # low/medium/high
-    political_risk: Mapped[str | None] = mapped_column(
-        String(32), nullable=True
-    )  # low/medium/high
-    logistics_risk: Mapped[str | None] = mapped_column(
-        String(32), nullable=True
-    )  # low/medium/high
+    weather_risk: Mapped[str | None] = mapped_column(RiskLevel, nullable=True)
+    political_risk: Mapped[str | None] = mapped_column(RiskLevel, nullable=True)
+    logistics_risk: Mapped[str | None] = mapped_column(RiskLevel, nullable=True)
     quality_consistency_score: Mapped[float | None] = mapped_column(
         Float, nullable=True
     )
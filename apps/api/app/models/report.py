@@ -1,9 +1,9 @@
 from datetime import datetime
-from sqlalchemy import String, Text, JSON, DateTime, Index
+from sqlalchemy import String, Text, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
-from app.models.common import TimestampMixin
+from app.models.common import JSONDocument, TimestampMixin
 
 
 class Report(Base, TimestampMixin):
@@ -18,7 +18,18 @@ class Report(Base, TimestampMixin):
         DateTime(timezone=True), index=True, nullable=False
     )
     markdown: Mapped[str] = mapped_column(Text, nullable=False)
-    payload: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    payload: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
 
 
-Index("ix_reports_kind_report_at", Report.kind, Report.report_at)
+Index(
+    "ix_reports_kind_report_at",
+    Report.kind,
+    Report.report_at.desc(),
+    postgresql_include=["title"],
+)
+Index(
+    "ix_reports_report_at_brin",
+    Report.report_at,
+    postgresql_using="brin",
+    postgresql_with={"pages_per_range": 32},
+).ddl_if(dialect="postgresql")
@@ -1,8 +1,9 @@
 from datetime import datetime
-from sqlalchemy import String, Float, Integer, JSON, ForeignKey, DateTime
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Float, Integer, ForeignKey, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.session import Base
 from app.models.common import TimestampMixin, SoftDeleteMixin
+from app.models.transport_event import TransportEvent
 
 
 class Shipment(Base, TimestampMixin, SoftDeleteMixin):
@@ -54,11 +55,28 @@ class Shipment(Base, TimestampMixin, SoftDeleteMixin):
     status: Mapped[str] = mapped_column(
         String(50), default="in_transit", nullable=False
     )
-    status_updated_at: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    status_updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     delay_hours: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    # Tracking
-    tracking_events: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
+    # Tracking history, one transport_events row per event; lazy="raise" so
+    # only endpoints that render it pay for it (selectinload)
+    transport_events: Mapped[list[TransportEvent]] = relationship(
+        back_populates="shipment",
+        lazy="raise",
+        order_by=[TransportEvent.occurred_at, TransportEvent.id],
+    )
+
+    # lazy="raise": load explicitly (joinedload/selectinload), never per row
+    lot = relationship("Lot", lazy="raise")
+    cooperative = relationship("Cooperative", lazy="raise")
+    roaster = relationship("Roaster", lazy="raise")
 
     # Metadata
     notes: Mapped[str | None] = mapped_column(String(1000), nullable=True)
+
+
+# Range scans on the typed arrival time ("arriving this week", delayed)
+Index("ix_shipment_status_eta", Shipment.status, Shipment.estimated_arrival_at)
+Index("ix_shipment_roaster_eta", Shipment.roaster_id, Shipment.estimated_arrival_at)
@@ -23,7 +23,9 @@ class TransportEvent(Base, TimestampMixin):
     status: Mapped[str | None] = mapped_column(String(64), nullable=True)
     details: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
-    shipment = relationship("Shipment", lazy="joined")
+    shipment = relationship(
+        "Shipment", back_populates="transport_events", lazy="joined"
+    )
 
 
 Index(
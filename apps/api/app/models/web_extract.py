@@ -3,7 +3,7 @@ from sqlalchemy import String, Integer, Text, DateTime, JSON, UniqueConstraint,
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.session import Base
-from app.models.common import TimestampMixin
+from app.models.common import JSONDocument, TimestampMixin
 
 
 class WebExtract(Base, TimestampMixin):
@@ -30,9 +30,9 @@ class WebExtract(Base, TimestampMixin):
     content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     lang: Mapped[str | None] = mapped_column(String(16), nullable=True)
 
-    extracted_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    extracted_json: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
     translated_de: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    meta: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    meta: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
 
     __table_args__ = (
         UniqueConstraint("entity_type", "entity_id", "url", name="uq_web_extract"),
@@ -40,3 +40,14 @@ class WebExtract(Base, TimestampMixin):
 
 
 Index("ix_web_extracts_entity_type_id", WebExtract.entity_type, WebExtract.entity_id)
+Index(
+    "ix_web_extracts_extracted_json_gin",
+    WebExtract.extracted_json,
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_web_extracts_retrieved_at_brin",
+    WebExtract.retrieved_at,
+    postgresql_using="brin",
+    postgresql_with={"pages_per_range": 32},
+).ddl_if(dialect="postgresql")
@@ -0,0 +1,144 @@
+"""In-process circuit breakers for individual upstream APIs.
+
+The Redis-backed breakers in ``app.services.data_pipeline.circuit_breaker``
+guard whole pipeline stages across workers. These guard each upstream
+inside one process so a fallback chain skips a source that keeps failing
+instead of waiting out its timeout on every call.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import structlog
+
+from app.services.data_pipeline.circuit_breaker import CircuitState
+
+log = structlog.get_logger()
+
+
+class ProviderCircuitBreaker:
+    """Thread-safe circuit breaker for one upstream provider.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are skipped for ``recovery_timeout`` seconds. Then a single probe
+    is let through (HALF_OPEN): success closes the circuit, failure opens
+    it again. A probe that never reports back (e.g. a cancelled task) is
+    replaced after another ``recovery_timeout``.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+    ):
+        self.provider_name = provider_name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _set_state(self, state: CircuitState) -> None:
+        self._state = state
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        self._probe_started = None
+        log.info(
+            "provider_circuit_state_change",
+            provider=self.provider_name,
+            new_state=state.value,
+        )
+
+    def can_attempt(self) -> bool:
+        """Return True if a request should be sent to the provider."""
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                return True
+            now = time.monotonic()
+            if state == CircuitState.HALF_OPEN and (
+                self._probe_started is None
+                or now - self._probe_started >= self.recovery_timeout
+            ):
+                self._probe_started = now
+                return True
+        log.info("provider_circuit_skipped", provider=self.provider_name)
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful request and close the circuit."""
+        with self._lock:
+            self._failures = 0
+            if self._state != CircuitState.CLOSED:
+                self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed request; opens the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == CircuitState.HALF_OPEN or (
+                state == CircuitState.CLOSED
+                and self._failures >= self.failure_threshold
+            ):
+                self._set_state(CircuitState.OPEN)
+
+    def reset(self) -> None:
+        """Reset the breaker to the closed state."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._probe_started = None
+
+    def get_status(self) -> dict:
+        """Get breaker status for monitoring."""
+        with self._lock:
+            state = self._current_state()
+            return {
+                "provider": self.provider_name,
+                "state": state.value,
+                "failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout": self.recovery_timeout,
+            }
+
+
+_BREAKERS: dict[str, ProviderCircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(provider_name: str) -> ProviderCircuitBreaker:
+    """Return the process-wide breaker for ``provider_name``."""
+    breaker = _BREAKERS.get(provider_name)
+    if breaker is None:
+        with _BREAKERS_LOCK:
+            breaker = _BREAKERS.setdefault(
+                provider_name, ProviderCircuitBreaker(provider_name)
+            )
+    return breaker
+
+
+def reset_breakers() -> None:
+    """Close every provider circuit."""
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    for breaker in breakers:
+        breaker.reset()
@@ -1,25 +1,38 @@
 """Multi-source coffee price provider with fallback chain.
 
 Provides resilient coffee price fetching with automatic failover:
-1. Yahoo Finance (KC=F ICE Coffee C Futures)
-2. Stooq (existing provider)
-3. ICO static benchmark (last resort)
+1. Yahoo Finance (KC=F ICE Coffee C Futures) and Stooq (existing provider),
+   queried concurrently; the first quote wins
+2. ICO static benchmark (last resort)
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
+import orjson
 import structlog
 
-from app.providers.stooq import fetch_stooq_last_close
+from app.core.config import settings
+from app.providers.circuit import get_breaker
+from app.providers.stooq import (
+    OhlcQuote,
+    fetch_stooq_last_close,
+    fetch_stooq_last_close_async,
+)
+from app.providers.timestamps import from_unix_utc
 
 log = structlog.get_logger()
 
+YAHOO_SYMBOL = "KC=F"
+YAHOO_CHART_URL = f"https://query1.finance.yahoo.com/v8/finance/chart/{YAHOO_SYMBOL}"
+_YAHOO_PARAMS = {"interval": "1d", "range": "1d"}
+_USER_AGENT = {"User-Agent": "CoffeeStudio/1.0"}
+
 
 @dataclass(frozen=True)
 class CoffeeQuote:
@@ -29,9 +42,14 @@ class CoffeeQuote:
     observed_at: datetime
     source_name: str
     source_url: str
-    raw_data: str
+    raw_bytes: bytes
     metadata: dict
 
+    @property
+    def raw_data(self) -> str:
+        """Upstream response body, decoded on access."""
+        return self.raw_bytes.decode("utf-8", "replace")
+
 
 def fetch_yahoo_finance_coffee(timeout_s: float = 20.0) -> Optional[CoffeeQuote]:
     """Fetch KC=F (Coffee C Futures) from Yahoo Finance API.
@@ -42,27 +60,61 @@ def fetch_yahoo_finance_coffee(timeout_s: float = 20.0) -> Optional[CoffeeQuote]
     Returns:
         CoffeeQuote with price in USD per lb, or None on failure
     """
-    symbol = "KC=F"
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    breaker = get_breaker("yahoo_finance")
+    if not breaker.can_attempt():
+        return None
 
     try:
         r = httpx.get(
-            url,
+            YAHOO_CHART_URL,
             timeout=timeout_s,
-            headers={"User-Agent": "CoffeeStudio/1.0"},
-            params={"interval": "1d", "range": "1d"},
+            headers=_USER_AGENT,
+            params=_YAHOO_PARAMS,
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
+        breaker.record_failure()
         log.warning(
             "yahoo_finance_fetch_failed",
-            symbol=symbol,
+            symbol=YAHOO_SYMBOL,
             error=str(e),
-            exc_info=True,
+            exc_info=settings.DEBUG_PROVIDERS,
+        )
+        return None
+
+    breaker.record_success()
+    return _yahoo_quote(data, r.content)
+
+
+async def fetch_yahoo_finance_coffee_async(
+    client: httpx.AsyncClient,
+) -> Optional[CoffeeQuote]:
+    """Async variant of :func:`fetch_yahoo_finance_coffee` on a shared client."""
+    breaker = get_breaker("yahoo_finance")
+    if not breaker.can_attempt():
+        return None
+
+    try:
+        r = await client.get(YAHOO_CHART_URL, headers=_USER_AGENT, params=_YAHOO_PARAMS)
+        r.raise_for_status()
+        data = orjson.loads(r.content)
+    except Exception as e:
+        breaker.record_failure()
+        log.warning(
+            "yahoo_finance_fetch_failed",
+            symbol=YAHOO_SYMBOL,
+            error=str(e),
+            exc_info=settings.DEBUG_PROVIDERS,
         )
         return None
 
+    breaker.record_success()
+    return _yahoo_quote(data, r.content)
+
+
+def _yahoo_quote(data: dict, raw_bytes: bytes) -> Optional[CoffeeQuote]:
+    symbol = YAHOO_SYMBOL
     try:
         result = data.get("chart", {}).get("result", [])
         if not result:
@@ -78,18 +130,14 @@ def fetch_yahoo_finance_coffee(timeout_s: float = 20.0) -> Optional[CoffeeQuote]
             return None
 
         # Yahoo timestamps are in seconds since epoch
-        timestamp = meta.get("regularMarketTime")
-        if timestamp:
-            observed_at = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-        else:
-            observed_at = datetime.now(timezone.utc)
+        observed_at = from_unix_utc(meta.get("regularMarketTime"))
 
         return CoffeeQuote(
             price_usd_per_lb=float(regular_price),
             observed_at=observed_at,
             source_name="Yahoo Finance",
-            source_url=url,
-            raw_data=json.dumps(data),
+            source_url=YAHOO_CHART_URL,
+            raw_bytes=raw_bytes,
             metadata={
                 "symbol": symbol,
                 "currency": meta.get("currency", "USD"),
@@ -115,17 +163,31 @@ def fetch_stooq_coffee(timeout_s: float = 20.0) -> Optional[CoffeeQuote]:
     if not quote:
         log.warning("stooq_fetch_failed", symbol="kc.f")
         return None
+    return _stooq_coffee_quote(quote)
+
 
+def _stooq_coffee_quote(quote: OhlcQuote) -> CoffeeQuote:
     return CoffeeQuote(
         price_usd_per_lb=quote.close,
         observed_at=quote.observed_at,
         source_name="Stooq",
         source_url=quote.source_url,
-        raw_data=quote.raw_text,
+        raw_bytes=quote.raw_text.encode(),
         metadata={"symbol": quote.symbol},
     )
 
 
+async def fetch_stooq_coffee_async(
+    client: httpx.AsyncClient,
+) -> Optional[CoffeeQuote]:
+    """Async variant of :func:`fetch_stooq_coffee` on a shared client."""
+    quote = await fetch_stooq_last_close_async(client, "kc.f")
+    if not quote:
+        log.warning("stooq_fetch_failed", symbol="kc.f")
+        return None
+    return _stooq_coffee_quote(quote)
+
+
 def fetch_ico_fallback() -> CoffeeQuote:
     """Return static ICO benchmark as last-resort fallback.
 
@@ -137,7 +199,7 @@ def fetch_ico_fallback() -> CoffeeQuote:
         observed_at=datetime.now(timezone.utc),
         source_name="ICO Static Fallback",
         source_url="https://www.ico.org/",
-        raw_data=json.dumps(
+        raw_bytes=orjson.dumps(
             {
                 "note": "Static fallback price based on ICO historical averages",
                 "arabica_mild_average": 2.10,
@@ -147,44 +209,54 @@ def fetch_ico_fallback() -> CoffeeQuote:
     )
 
 
-def fetch_coffee_price(
+async def fetch_coffee_price_async(
     use_fallback: bool = True, timeout_s: float = 20.0
 ) -> Optional[CoffeeQuote]:
-    """Fetch coffee price with automatic fallback chain.
+    """Fetch coffee price from Yahoo Finance and Stooq concurrently.
 
-    Tries sources in order:
-    1. Yahoo Finance (KC=F)
-    2. Stooq (KC.F)
-    3. ICO static benchmark (if use_fallback=True)
+    Both live sources are queried at once on one shared ``httpx.AsyncClient``
+    and the first quote to arrive wins (Yahoo if both finish together); the
+    other request is cancelled. Falls back to the ICO static benchmark when
+    both fail and ``use_fallback`` is set.
 
     Args:
         use_fallback: If True, return static ICO fallback if all sources fail
         timeout_s: Timeout for each HTTP request
 
     Returns:
-        CoffeeQuote from first successful source, or None if all fail
+        CoffeeQuote from the first successful source, or None if all fail
     """
-    # Try Yahoo Finance first
-    log.info("coffee_price_fetch_start", source="yahoo_finance")
-    quote = fetch_yahoo_finance_coffee(timeout_s)
-    if quote:
-        log.info(
-            "coffee_price_fetch_success",
-            source="yahoo_finance",
-            price=quote.price_usd_per_lb,
-        )
-        return quote
-
-    # Fallback to Stooq
-    log.info("coffee_price_fetch_fallback", source="stooq")
-    quote = fetch_stooq_coffee(timeout_s)
-    if quote:
-        log.info(
-            "coffee_price_fetch_success",
-            source="stooq",
-            price=quote.price_usd_per_lb,
-        )
-        return quote
+    log.info("coffee_price_fetch_start", sources=["yahoo_finance", "stooq"])
+    async with httpx.AsyncClient(timeout=timeout_s) as client:
+        # Ordered by preference for ties
+        sources = {
+            "yahoo_finance": fetch_yahoo_finance_coffee_async,
+            "stooq": fetch_stooq_coffee_async,
+        }
+        tasks = {
+            asyncio.create_task(fetch(client)): name for name, fetch in sources.items()
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task, source in tasks.items():
+                    if task not in done or task.exception() is not None:
+                        continue
+                    quote = task.result()
+                    if quote:
+                        log.info(
+                            "coffee_price_fetch_success",
+                            source=source,
+                            price=quote.price_usd_per_lb,
+                        )
+                        return quote
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
     # Last resort: static ICO benchmark
     if use_fallback:
@@ -193,3 +265,14 @@ def fetch_coffee_price(
 
     log.error("coffee_price_all_sources_failed", using_fallback=False)
     return None
+
+
+def fetch_coffee_price(
+    use_fallback: bool = True, timeout_s: float = 20.0
+) -> Optional[CoffeeQuote]:
+    """Synchronous wrapper around :func:`fetch_coffee_price_async`.
+
+    Must not be called from a running event loop; async callers should
+    await ``fetch_coffee_price_async`` directly.
+    """
+    return asyncio.run(fetch_coffee_price_async(use_fallback, timeout_s))
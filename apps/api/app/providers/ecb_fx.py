@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from io import BytesIO
 from typing import Optional
 from xml.etree import ElementTree as ET
 
-import httpx
+from app.providers.circuit import get_breaker
+from app.providers.http import get_client
 
 
 # ECB publishes a daily XML with reference rates where EUR is the base currency.
 ECB_DAILY_XML = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"
+
+# The file changes once per business day (~16:00 CET), so parsed rates are
+# reused for an hour and then revalidated with a conditional GET.
+CACHE_TTL = 3600
+
+# (fetched_at monotonic, rates, observed_at, xml_text)
+_CACHE: Optional[tuple[float, dict[str, float], datetime, str]] = None
+_ETAG: Optional[str] = None
+_LAST_MODIFIED: Optional[str] = None
+_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -26,52 +40,105 @@ def _normalize_currency(value: str) -> str:
     return value.upper().strip()
 
 
-def _fetch_xml(timeout_s: float) -> Optional[str]:
+def _parse_observed_at(time_value: Optional[str]) -> datetime:
+    if not time_value:
+        return datetime.now(timezone.utc)
     try:
-        response = httpx.get(ECB_DAILY_XML, timeout=timeout_s)
-        response.raise_for_status()
-        return response.text
+        return datetime.fromisoformat(time_value).replace(tzinfo=timezone.utc)
     except Exception:
-        return None
+        return datetime.now(timezone.utc)
 
 
-def _parse_xml(xml_text: str) -> Optional[ET.Element]:
+def _parse_rates(xml_bytes: bytes) -> Optional[tuple[dict[str, float], datetime]]:
+    """Read the rates of the first dated Cube in a single streaming pass.
+
+    Parsing stops at the end of that Cube instead of building the whole tree.
+    """
+    rates: dict[str, float] = {}
+    time_value: Optional[str] = None
     try:
-        return ET.fromstring(xml_text)
+        for event, node in ET.iterparse(BytesIO(xml_bytes), events=("start", "end")):
+            if not node.tag.endswith("Cube"):
+                continue
+            if "time" in node.attrib:
+                if event == "end":
+                    break
+                time_value = node.attrib["time"]
+                continue
+            if event != "start" or time_value is None:
+                continue
+            currency = node.attrib.get("currency")
+            rate_value = node.attrib.get("rate")
+            if not currency or not rate_value:
+                continue
+            try:
+                rates[currency.upper()] = float(rate_value)
+            except Exception:
+                continue
     except Exception:
         return None
 
+    if time_value is None:
+        return None
+    return rates, _parse_observed_at(time_value)
 
-def _find_time_cube(root: ET.Element) -> Optional[ET.Element]:
-    for node in root.iter():
-        if node.tag.endswith("Cube") and "time" in node.attrib:
-            return node
-    return None
 
+def _fetch_rates(
+    timeout_s: float,
+) -> Optional[tuple[dict[str, float], datetime, str]]:
+    """Return (rates, observed_at, xml_text), downloading only when stale."""
+    global _CACHE, _ETAG, _LAST_MODIFIED
 
-def _parse_observed_at(time_value: Optional[str]) -> datetime:
-    if not time_value:
-        return datetime.now(timezone.utc)
-    try:
-        return datetime.fromisoformat(time_value).replace(tzinfo=timezone.utc)
-    except Exception:
-        return datetime.now(timezone.utc)
+    with _LOCK:
+        now = time.monotonic()
+        if _CACHE is not None and now - _CACHE[0] < CACHE_TTL:
+            return _CACHE[1:]
 
+        headers = {}
+        if _CACHE is not None:
+            if _ETAG:
+                headers["If-None-Match"] = _ETAG
+            if _LAST_MODIFIED:
+                headers["If-Modified-Since"] = _LAST_MODIFIED
+
+        breaker = get_breaker("ecb")
+        if not breaker.can_attempt():
+            return None
 
-def _extract_rates(time_node: ET.Element) -> dict[str, float]:
-    rates: dict[str, float] = {}
-    for node in time_node:
-        if not node.tag.endswith("Cube"):
-            continue
-        currency = node.attrib.get("currency")
-        rate_value = node.attrib.get("rate")
-        if not currency or not rate_value:
-            continue
         try:
-            rates[currency.upper()] = float(rate_value)
+            response = get_client().get(
+                ECB_DAILY_XML, headers=headers, timeout=timeout_s
+            )
+            if response.status_code == 304 and _CACHE is not None:
+                breaker.record_success()
+                _CACHE = (now, *_CACHE[1:])
+                return _CACHE[1:]
+            response.raise_for_status()
+            parsed = _parse_rates(response.content)
+            if parsed is None:
+                return None
+            xml_text = response.text
         except Exception:
-            continue
-    return rates
+            breaker.record_failure()
+            return None
+
+        breaker.record_success()
+
+        rates, observed_at = parsed
+        _CACHE = (now, rates, observed_at, xml_text)
+        _ETAG = response.headers.get("ETag")
+        _LAST_MODIFIED = response.headers.get("Last-Modified")
+        return rates, observed_at, xml_text
+
+
+def invalidate_cache() -> None:
+    """Drop the cached ECB rates so the next call downloads them again."""
+    global _CACHE, _ETAG, _LAST_MODIFIED
+
+    with _LOCK:
+        _CACHE = None
+        _ETAG = None
+        _LAST_MODIFIED = None
 
 
 def _eur_to_rate(currency: str, rates: dict[str, float]) -> Optional[float]:
@@ -84,27 +151,20 @@ def fetch_ecb_fx(base: str, quote: str, timeout_s: float = 20.0) -> Optional[FxQ
     """Fetch FX reference rate from ECB daily XML.
 
     ECB provides rates with base EUR (1 EUR = X QUOTE). If you ask for
-    USD->EUR we invert the EUR->USD rate.
+    USD->EUR we invert the EUR->USD rate. The parsed file is cached in
+    process for ``CACHE_TTL`` seconds and revalidated with ETag /
+    Last-Modified afterwards.
     """
     base = _normalize_currency(base)
     quote = _normalize_currency(quote)
     if base == quote:
         return None
 
-    xml_text = _fetch_xml(timeout_s)
-    if xml_text is None:
-        return None
-
-    root = _parse_xml(xml_text)
-    if root is None:
-        return None
-
-    time_node = _find_time_cube(root)
-    if time_node is None:
+    fetched = _fetch_rates(timeout_s)
+    if fetched is None:
         return None
 
-    observed_at = _parse_observed_at(time_node.attrib.get("time"))
-    rates = _extract_rates(time_node)
+    rates, observed_at, xml_text = fetched
 
     eur_to_base = _eur_to_rate(base, rates)
     eur_to_quote = _eur_to_rate(quote, rates)
@@ -4,22 +4,51 @@ Provides resilient FX rate fetching with automatic failover:
 1. ECB (European Central Bank)
 2. ExchangeRate-API
 3. Frankfurter API
+
+The fallbacks are hedged: they start once ECB is slower than
+``HEDGE_DELAY_S`` and the first source to answer wins.
 """
 
 from __future__ import annotations
 
-import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Optional
 
-import httpx
+import orjson
 import structlog
 
+from app.core.config import settings
+from app.providers.circuit import get_breaker
 from app.providers.ecb_fx import fetch_ecb_fx
+from app.providers.http import get_client
+from app.providers.timestamps import from_unix_utc, parse_iso_utc
 
 log = structlog.get_logger()
 
+# How long ECB gets on its own before the fallback sources are queried too
+HEDGE_DELAY_S = 0.3
+
+# ExchangeRate-API and Frankfurter update at most hourly (daily on free
+# tiers), so a successful rate is reused per (source, base, quote).
+RATE_CACHE_TTL = 600
+
+# Cache "source" for the winner of the fallback chain: once any source has
+# answered, the chain is skipped for that pair until the TTL runs out.
+_CHAIN = "chain"
+
+# A pair no source could provide is not retried for this long, so a bad or
+# unsupported pair does not cost three timeouts on every call.
+NEGATIVE_CACHE_TTL = 60
+
+_rate_cache: dict[tuple[str, str, str], tuple[FxRate, float]] = {}
+_failed_pairs: dict[tuple[str, str], float] = {}
+_rate_cache_lock = threading.Lock()
+
 
 @dataclass(frozen=True)
 class FxRate:
@@ -31,9 +60,95 @@ class FxRate:
     observed_at: datetime
     source_name: str
     source_url: str
-    raw_data: str
+    raw_bytes: bytes
     metadata: dict
 
+    @property
+    def raw_data(self) -> str:
+        """Upstream response body, decoded on access."""
+        return self.raw_bytes.decode("utf-8", "replace")
+
+
+def _cached_rate(key: tuple[str, str, str]) -> Optional[FxRate]:
+    with _rate_cache_lock:
+        cached = _rate_cache.get(key)
+    if cached is not None and time.monotonic() - cached[1] < RATE_CACHE_TTL:
+        return cached[0]
+    return None
+
+
+def _store_rate(key: tuple[str, str, str], rate: FxRate) -> None:
+    with _rate_cache_lock:
+        _rate_cache[key] = (rate, time.monotonic())
+
+
+def _recently_failed(base: str, quote: str) -> bool:
+    with _rate_cache_lock:
+        failed_at = _failed_pairs.get((base, quote))
+    if failed_at is not None and time.monotonic() - failed_at < NEGATIVE_CACHE_TTL:
+        log.info("fx_rate_neg_cache_hit", base=base, quote=quote)
+        return True
+    return False
+
+
+def _store_failure(base: str, quote: str) -> None:
+    with _rate_cache_lock:
+        _failed_pairs[(base, quote)] = time.monotonic()
+
+
+def invalidate_fx_cache(base: Optional[str] = None, quote: Optional[str] = None) -> int:
+    """Drop cached rates, optionally only for one base and/or quote currency.
+
+    Covers the per-source caches, the fallback-chain cache and recorded
+    failures, not ECB's daily table (see
+    :func:`app.providers.ecb_fx.invalidate_cache`).
+
+    Returns:
+        Number of cache entries removed
+    """
+    base = base.upper().strip() if base else None
+    quote = quote.upper().strip() if quote else None
+
+    def matches(pair_base: str, pair_quote: str) -> bool:
+        return (base is None or pair_base == base) and (
+            quote is None or pair_quote == quote
+        )
+
+    with _rate_cache_lock:
+        rates = [key for key in _rate_cache if matches(key[1], key[2])]
+        failures = [pair for pair in _failed_pairs if matches(*pair)]
+        for key in rates:
+            del _rate_cache[key]
+        for pair in failures:
+            del _failed_pairs[pair]
+    removed = len(rates) + len(failures)
+    log.info("fx_cache_invalidated", base=base, quote=quote, entries=removed)
+    return removed
+
+
+def _normalize_quotes(base: str, quotes: Iterable[str]) -> list[str]:
+    normalized = []
+    for quote in quotes:
+        quote = quote.upper().strip()
+        if quote != base and quote not in normalized:
+            normalized.append(quote)
+    return normalized
+
+
+def _cached_rates(
+    source: str, base: str, quotes: Iterable[str]
+) -> tuple[dict[str, FxRate], list[str]]:
+    """Split ``quotes`` into cached rates and the quotes still to fetch."""
+    cached: dict[str, FxRate] = {}
+    missing: list[str] = []
+    for quote in _normalize_quotes(base, quotes):
+        rate = _cached_rate((source, base, quote))
+        if rate is not None:
+            cached[quote] = rate
+        else:
+            missing.append(quote)
+    return cached, missing
+
 
 def fetch_exchangerate_api_fx(
     base: str, quote: str, timeout_s: float = 20.0
@@ -50,74 +165,94 @@ def fetch_exchangerate_api_fx(
     Returns:
         FxRate or None on failure
     """
-    base = base.upper().strip()
     quote = quote.upper().strip()
+    return fetch_exchangerate_api_fx_batch(base, [quote], timeout_s).get(quote)
 
-    if base == quote:
-        return None
+
+def fetch_exchangerate_api_fx_batch(
+    base: str, quotes: Iterable[str], timeout_s: float = 20.0
+) -> dict[str, FxRate]:
+    """Fetch several quotes for one base from ExchangeRate-API in one request.
+
+    ``/latest/{base}`` already returns every quote currency, so a basket
+    costs a single round trip.
+
+    Returns:
+        FxRate per quote currency; quotes that are missing or failed are omitted
+    """
+    base = base.upper().strip()
+    result, missing = _cached_rates("exchangerate_api", base, quotes)
+    if not missing:
+        return result
 
     url = f"https://open.exchangerate-api.com/v6/latest/{base}"
 
+    breaker = get_breaker("exchangerate_api")
+    if not breaker.can_attempt():
+        return result
+
     try:
-        r = httpx.get(
+        r = get_client().get(
             url,
             timeout=timeout_s,
             headers={"User-Agent": "CoffeeStudio/1.0"},
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
+        breaker.record_failure()
         log.warning(
             "exchangerate_api_fetch_failed",
             base=base,
-            quote=quote,
+            quotes=missing,
             error=str(e),
-            exc_info=True,
+            exc_info=settings.DEBUG_PROVIDERS,
         )
-        return None
+        return result
+
+    breaker.record_success()
 
     try:
         rates = data.get("rates", {})
-        rate_value = rates.get(quote)
 
-        if rate_value is None:
-            log.warning(
-                "exchangerate_api_no_rate",
+        observed_at = from_unix_utc(data.get("time_last_update_unix"))
+
+        for quote in missing:
+            rate_value = rates.get(quote)
+            if rate_value is None:
+                log.warning(
+                    "exchangerate_api_no_rate",
+                    base=base,
+                    quote=quote,
+                    available_rates=list(islice(rates, 10)),
+                )
+                continue
+
+            rate = FxRate(
                 base=base,
                 quote=quote,
-                available_rates=list(rates.keys())[:10],
+                rate=float(rate_value),
+                observed_at=observed_at,
+                source_name="ExchangeRate-API",
+                source_url=url,
+                raw_bytes=r.content,
+                metadata={
+                    "provider": data.get("provider", "exchangerate-api"),
+                    "base_code": data.get("base_code", base),
+                },
             )
-            return None
-
-        # Parse timestamp
-        time_updated = data.get("time_last_update_unix")
-        if time_updated:
-            observed_at = datetime.fromtimestamp(time_updated, tz=timezone.utc)
-        else:
-            observed_at = datetime.now(timezone.utc)
-
-        return FxRate(
-            base=base,
-            quote=quote,
-            rate=float(rate_value),
-            observed_at=observed_at,
-            source_name="ExchangeRate-API",
-            source_url=url,
-            raw_data=json.dumps(data),
-            metadata={
-                "provider": data.get("provider", "exchangerate-api"),
-                "base_code": data.get("base_code", base),
-            },
-        )
+            _store_rate(("exchangerate_api", base, quote), rate)
+            result[quote] = rate
     except Exception as e:
         log.warning(
             "exchangerate_api_parse_failed",
             base=base,
-            quote=quote,
+            quotes=missing,
             error=str(e),
             exc_info=True,
         )
-        return None
+
+    return result
 
 
 def fetch_frankfurter_fx(
@@ -136,80 +271,92 @@ def fetch_frankfurter_fx(
     Returns:
         FxRate or None on failure
     """
-    base = base.upper().strip()
     quote = quote.upper().strip()
+    return fetch_frankfurter_fx_batch(base, [quote], timeout_s).get(quote)
 
-    if base == quote:
-        return None
+
+def fetch_frankfurter_fx_batch(
+    base: str, quotes: Iterable[str], timeout_s: float = 20.0
+) -> dict[str, FxRate]:
+    """Fetch several quotes for one base from Frankfurter in one request.
+
+    Returns:
+        FxRate per quote currency; quotes that are missing or failed are omitted
+    """
+    base = base.upper().strip()
+    result, missing = _cached_rates("frankfurter", base, quotes)
+    if not missing:
+        return result
 
     url = "https://api.frankfurter.app/latest"
 
+    breaker = get_breaker("frankfurter")
+    if not breaker.can_attempt():
+        return result
+
     try:
-        r = httpx.get(
+        r = get_client().get(
             url,
             timeout=timeout_s,
             headers={"User-Agent": "CoffeeStudio/1.0"},
-            params={"from": base, "to": quote},
+            params={"from": base, "to": ",".join(missing)},
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
+        breaker.record_failure()
         log.warning(
             "frankfurter_fetch_failed",
             base=base,
-            quote=quote,
+            quotes=missing,
             error=str(e),
-            exc_info=True,
+            exc_info=settings.DEBUG_PROVIDERS,
         )
-        return None
+        return result
+
+    breaker.record_success()
 
     try:
         rates = data.get("rates", {})
-        rate_value = rates.get(quote)
 
-        if rate_value is None:
-            log.warning(
-                "frankfurter_no_rate",
+        observed_at = parse_iso_utc(data.get("date"))
+
+        for quote in missing:
+            rate_value = rates.get(quote)
+            if rate_value is None:
+                log.warning(
+                    "frankfurter_no_rate",
+                    base=base,
+                    quote=quote,
+                    available_rates=list(islice(rates, 10)),
+                )
+                continue
+
+            rate = FxRate(
                 base=base,
                 quote=quote,
-                available_rates=list(rates.keys()),
+                rate=float(rate_value),
+                observed_at=observed_at,
+                source_name="Frankfurter",
+                source_url=url,
+                raw_bytes=r.content,
+                metadata={
+                    "amount": data.get("amount", 1.0),
+                    "base_code": data.get("base", base),
+                },
             )
-            return None
-
-        # Parse date
-        date_str = data.get("date")
-        if date_str:
-            try:
-                observed_at = datetime.fromisoformat(date_str).replace(
-                    tzinfo=timezone.utc
-                )
-            except Exception:
-                observed_at = datetime.now(timezone.utc)
-        else:
-            observed_at = datetime.now(timezone.utc)
-
-        return FxRate(
-            base=base,
-            quote=quote,
-            rate=float(rate_value),
-            observed_at=observed_at,
-            source_name="Frankfurter",
-            source_url=url,
-            raw_data=json.dumps(data),
-            metadata={
-                "amount": data.get("amount", 1.0),
-                "base_code": data.get("base", base),
-            },
-        )
+            _store_rate(("frankfurter", base, quote), rate)
+            result[quote] = rate
     except Exception as e:
         log.warning(
             "frankfurter_parse_failed",
             base=base,
-            quote=quote,
+            quotes=missing,
             error=str(e),
             exc_info=True,
         )
-        return None
+
+    return result
 
 
 def fetch_ecb_fx_wrapped(
@@ -231,23 +378,31 @@ def fetch_ecb_fx_wrapped(
         observed_at=fx.observed_at,
         source_name="ECB",
         source_url=fx.source_url,
-        raw_data=fx.raw_text,
+        raw_bytes=fx.raw_text.encode(),
         metadata={"provider": "ecb"},
     )
 
 
 def fetch_fx_rate(base: str, quote: str, timeout_s: float = 20.0) -> Optional[FxRate]:
-    """Fetch FX rate with automatic fallback chain.
+    """Fetch FX rate with a hedged fallback chain.
 
-    Tries sources in order:
+    ECB is queried first. If it has not answered within ``HEDGE_DELAY_S``
+    (or fails before that), ExchangeRate-API and Frankfurter are queried
+    in parallel, and the first source to return a rate wins:
     1. ECB (European Central Bank)
     2. ExchangeRate-API
     3. Frankfurter API
 
+    The winning rate is cached for ``RATE_CACHE_TTL`` seconds, so repeated
+    lookups of the pair skip the chain (including a failing ECB) entirely.
+    A pair that no source could provide returns None for
+    ``NEGATIVE_CACHE_TTL`` seconds without any requests.
+
     Args:
         base: Base currency code (e.g., "USD")
         quote: Quote currency code (e.g., "EUR")
-        timeout_s: Timeout for each HTTP request
+        timeout_s: Time budget for the whole chain; each fallback gets
+            whatever is left of it
 
     Returns:
         FxRate from first successful source, or None if all fail
@@ -259,46 +414,133 @@ def fetch_fx_rate(base: str, quote: str, timeout_s: float = 20.0) -> Optional[Fx
         log.warning("fx_rate_same_currency", base=base, quote=quote)
         return None
 
-    # Try ECB first
-    log.info("fx_rate_fetch_start", source="ecb", base=base, quote=quote)
-    rate = fetch_ecb_fx_wrapped(base, quote, timeout_s)
-    if rate:
-        log.info(
-            "fx_rate_fetch_success",
-            source="ecb",
-            base=base,
-            quote=quote,
-            rate=rate.rate,
-        )
-        return rate
+    cached = _cached_rate((_CHAIN, base, quote))
+    if cached is not None:
+        return cached
+    if _recently_failed(base, quote):
+        return None
 
-    # Fallback to ExchangeRate-API
-    log.info(
-        "fx_rate_fetch_fallback", source="exchangerate_api", base=base, quote=quote
+    # One budget for the whole chain; later hops only get what is left
+    deadline = time.monotonic() + timeout_s
+    fallbacks = (
+        ("exchangerate_api", fetch_exchangerate_api_fx),
+        ("frankfurter", fetch_frankfurter_fx),
     )
-    rate = fetch_exchangerate_api_fx(base, quote, timeout_s)
-    if rate:
-        log.info(
-            "fx_rate_fetch_success",
-            source="exchangerate_api",
-            base=base,
-            quote=quote,
-            rate=rate.rate,
-        )
-        return rate
-
-    # Fallback to Frankfurter
-    log.info("fx_rate_fetch_fallback", source="frankfurter", base=base, quote=quote)
-    rate = fetch_frankfurter_fx(base, quote, timeout_s)
-    if rate:
-        log.info(
-            "fx_rate_fetch_success",
-            source="frankfurter",
-            base=base,
-            quote=quote,
-            rate=rate.rate,
-        )
-        return rate
+    executor = ThreadPoolExecutor(
+        max_workers=1 + len(fallbacks), thread_name_prefix="fx-rate"
+    )
+    try:
+        log.info("fx_rate_fetch_start", source="ecb", base=base, quote=quote)
+        primary = executor.submit(fetch_ecb_fx_wrapped, base, quote, timeout_s)
+        futures = {primary: "ecb"}
+
+        wait([primary], timeout=HEDGE_DELAY_S)
+        if not primary.done() or _future_rate(primary) is None:
+            for source, fetch in fallbacks:
+                log.info(
+                    "fx_rate_fetch_fallback", source=source, base=base, quote=quote
+                )
+                future = executor.submit(fetch, base, quote, _remaining(deadline))
+                futures[future] = source
+
+        try:
+            for future in as_completed(futures, timeout=_remaining(deadline)):
+                source = futures[future]
+                rate = _future_rate(future)
+                if rate is None:
+                    if future.exception() is not None:
+                        log.warning(
+                            "fx_rate_source_error",
+                            source=source,
+                            base=base,
+                            quote=quote,
+                            error=str(future.exception()),
+                        )
+                    continue
+                log.info(
+                    "fx_rate_fetch_success",
+                    source=source,
+                    base=base,
+                    quote=quote,
+                    rate=rate.rate,
+                )
+                _store_rate((_CHAIN, base, quote), rate)
+                return rate
+        except TimeoutError:
+            log.warning(
+                "fx_rate_deadline_exceeded",
+                base=base,
+                quote=quote,
+                timeout_s=timeout_s,
+            )
+    finally:
+        # Slower sources finish in the background and their results are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
 
     log.error("fx_rate_all_sources_failed", base=base, quote=quote)
+    _store_failure(base, quote)
     return None
+
+
+def _remaining(deadline: float) -> float:
+    return max(0.1, deadline - time.monotonic())
+
+
+def _future_rate(future: Future) -> Optional[FxRate]:
+    if future.exception() is not None:
+        return None
+    return future.result()
+
+
+def fetch_fx_rates_batch(
+    base: str, quotes: Iterable[str], timeout_s: float = 20.0
+) -> dict[str, FxRate]:
+    """Fetch several quotes for one base through the fallback chain.
+
+    ECB downloads its whole daily table once, so every quote is looked up
+    there first. Whatever is still missing is then requested from
+    ExchangeRate-API and Frankfurter with one request per source.
+
+    Args:
+        base: Base currency code (e.g., "USD")
+        quotes: Quote currency codes (e.g., ["EUR", "GBP", "CHF"])
+        timeout_s: Time budget for the whole chain
+
+    Returns:
+        FxRate per quote currency; quotes no source could provide are omitted
+    """
+    base = base.upper().strip()
+    cached, wanted = _cached_rates(_CHAIN, base, quotes)
+    wanted = [quote for quote in wanted if not _recently_failed(base, quote)]
+    if not wanted:
+        return cached
+    deadline = time.monotonic() + timeout_s
+    rates: dict[str, FxRate] = {}
+
+    log.info("fx_rate_fetch_start", source="ecb", base=base, quotes=wanted)
+    for quote in wanted:
+        rate = fetch_ecb_fx_wrapped(base, quote, _remaining(deadline))
+        if rate is None:
+            # Either ECB is down or it does not publish this pair; the batch
+            # fallbacks below are cheaper than probing ECB quote by quote.
+            break
+        rates[quote] = rate
+
+    for source, fetch_batch in (
+        ("exchangerate_api", fetch_exchangerate_api_fx_batch),
+        ("frankfurter", fetch_frankfurter_fx_batch),
+    ):
+        missing = [quote for quote in wanted if quote not in rates]
+        if not missing:
+            break
+        log.info("fx_rate_fetch_fallback", source=source, base=base, quotes=missing)
+        rates.update(fetch_batch(base, missing, _remaining(deadline)))
+
+    missing = [quote for quote in wanted if quote not in rates]
+    if missing:
+        log.error("fx_rate_all_sources_failed", base=base, quotes=missing)
+        for quote in missing:
+            _store_failure(base, quote)
+    for quote, rate in rates.items():
+        _store_rate((_CHAIN, base, quote), rate)
+    return cached | rates
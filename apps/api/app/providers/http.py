@@ -0,0 +1,187 @@
+"""Shared HTTP client for the synchronous data providers.
+
+Providers used to call ``httpx.get``/``httpx.post``, which opens a new
+connection (TCP + TLS handshake) for every request. The fallback chains
+(ECB -> ExchangeRate-API -> Frankfurter, Twelve Data, Open-Meteo) hit the
+same hosts on every run, so they share one pooled client with keep-alive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+import structlog
+
+log = structlog.get_logger()
+
+USER_AGENT = "CoffeeStudio/1.0"
+
+_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+
+# Rate limits and transient upstream errors worth another attempt
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_DELAY_S = 10.0
+
+_client: Optional[httpx.Client] = None
+_client_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled client, creating it on first use.
+
+    The client is recreated after a fork so Celery prefork workers never
+    share sockets with their parent. Callers pass ``timeout`` per request.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is not None and _client_pid == pid:
+        return _client
+    with _lock:
+        if _client is None or _client_pid != pid:
+            _client = httpx.Client(
+                headers={"User-Agent": USER_AGENT},
+                limits=_LIMITS,
+            )
+            _client_pid = pid
+        return _client
+
+
+def close_client() -> None:
+    """Close the pooled client (registered with :mod:`atexit`)."""
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+atexit.register(close_client)
+
+
+class TokenBucket:
+    """Blocking token bucket that paces outbound requests to one API.
+
+    Up to ``capacity`` requests go out back to back; after that they are
+    spaced ``1 / rate`` seconds apart. Callers reserve their token under the
+    lock and sleep outside it, so concurrent threads leave in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, sleeping until one is available; return the wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header, capped, or None.
+
+    The header holds either delay-seconds or an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delay, 0.0), MAX_RETRY_DELAY_S)
+
+
+def retry_delay(response: httpx.Response, attempt: int, base: float = 0.5) -> float:
+    """Delay before retrying ``response``: Retry-After, else jittered backoff."""
+    delay = parse_retry_after(response)
+    if delay is None:
+        delay = base * 2**attempt + random.uniform(0, base)
+    return min(delay, MAX_RETRY_DELAY_S)
+
+
+def _next_delay(
+    response: httpx.Response,
+    attempt: int,
+    attempts: int,
+    deadline: Optional[float],
+    provider: str,
+) -> Optional[float]:
+    if response.status_code not in RETRY_STATUS_CODES or attempt + 1 >= attempts:
+        return None
+    delay = retry_delay(response, attempt)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        return None
+    log.info(
+        "provider_http_retry",
+        provider=provider,
+        status_code=response.status_code,
+        attempt=attempt + 1,
+        delay_s=round(delay, 2),
+    )
+    return delay
+
+
+def send_with_retry(
+    send: Callable[[], httpx.Response],
+    provider: str,
+    attempts: int = 3,
+    deadline: Optional[float] = None,
+) -> httpx.Response:
+    """Call ``send`` again while it returns a retryable status.
+
+    Transport errors propagate; the last response is returned as-is so the
+    caller's ``raise_for_status`` still decides. No retry is scheduled that
+    would sleep past ``deadline`` (a :func:`time.monotonic` value).
+    """
+    for attempt in range(attempts):
+        response = send()
+        delay = _next_delay(response, attempt, attempts, deadline, provider)
+        if delay is None:
+            break
+        time.sleep(delay)
+    return response
+
+
+async def send_with_retry_async(
+    send: Callable[[], Awaitable[httpx.Response]],
+    provider: str,
+    attempts: int = 3,
+    deadline: Optional[float] = None,
+) -> httpx.Response:
+    """Async variant of :func:`send_with_retry`."""
+    for attempt in range(attempts):
+        response = await send()
+        delay = _next_delay(response, attempt, attempts, deadline, provider)
+        if delay is None:
+            break
+        await asyncio.sleep(delay)
+    return response
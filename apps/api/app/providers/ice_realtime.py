@@ -18,14 +18,19 @@ even when the feature flag is off.
 
 from __future__ import annotations
 
-import json
+import os
+import threading
+import time
 from datetime import datetime, timezone
 from typing import Optional
 
-import httpx
+import orjson
 import structlog
 
+from app.core.config import settings
+from app.providers.circuit import get_breaker
 from app.providers.coffee_prices import CoffeeQuote
+from app.providers.http import get_client, send_with_retry
 
 log = structlog.get_logger()
 
@@ -34,6 +39,37 @@ _TWELVE_DATA_BASE = "https://api.twelvedata.com"
 _KC_SYMBOL = "KC1!"  # Coffee C front-month futures
 
 
+def _cache_ttl_from_env() -> float:
+    try:
+        return float(os.getenv("ICE_REALTIME_CACHE_TTL_S", "30"))
+    except ValueError:
+        return 30.0
+
+
+# Futures quotes barely move within seconds; repeated callers share one
+# Twelve Data request per symbol for this long (also saves API quota).
+CACHE_TTL = _cache_ttl_from_env()
+
+# Cache key for the winner of the realtime chain (Twelve Data or Yahoo)
+_REALTIME_KEY = "realtime"
+
+_quote_cache: dict[str, tuple[CoffeeQuote, float]] = {}
+_quote_cache_lock = threading.Lock()
+
+
+def _cached_quote(symbol: str) -> Optional[CoffeeQuote]:
+    with _quote_cache_lock:
+        cached = _quote_cache.get(symbol)
+    if cached is not None and time.monotonic() - cached[1] < CACHE_TTL:
+        return cached[0]
+    return None
+
+
+def _store_quote(symbol: str, quote: CoffeeQuote) -> None:
+    with _quote_cache_lock:
+        _quote_cache[symbol] = (quote, time.monotonic())
+
+
 def fetch_twelve_data_coffee(
     api_key: str,
     timeout_s: float = 10.0,
@@ -47,22 +83,38 @@ def fetch_twelve_data_coffee(
     Returns:
         CoffeeQuote with price in USD per lb, or None on failure.
     """
+    cached = _cached_quote(_KC_SYMBOL)
+    if cached is not None:
+        return cached
+
     url = f"{_TWELVE_DATA_BASE}/price"
     params = {"symbol": _KC_SYMBOL, "apikey": api_key}
 
+    breaker = get_breaker("twelve_data")
+    if not breaker.can_attempt():
+        return None
+
+    deadline = time.monotonic() + timeout_s
     try:
-        r = httpx.get(url, params=params, timeout=timeout_s)
+        r = send_with_retry(
+            lambda: get_client().get(url, params=params, timeout=timeout_s),
+            "twelve_data",
+            deadline=deadline,
+        )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
+        breaker.record_failure()
         log.warning(
             "twelve_data_fetch_failed",
             symbol=_KC_SYMBOL,
             error=str(e),
-            exc_info=True,
+            exc_info=settings.DEBUG_PROVIDERS,
         )
         return None
 
+    breaker.record_success()
+
     try:
         price_str = data.get("price")
         if price_str is None:
@@ -76,12 +128,12 @@ def fetch_twelve_data_coffee(
 
         price = float(price_str)
 
-        return CoffeeQuote(
+        quote = CoffeeQuote(
             price_usd_per_lb=price,
             observed_at=datetime.now(timezone.utc),
             source_name="Twelve Data (ICE KC1!)",
             source_url=url,
-            raw_data=json.dumps(data),
+            raw_bytes=r.content,
             metadata={
                 "symbol": _KC_SYMBOL,
                 "provider": "twelve_data",
@@ -98,6 +150,9 @@ def fetch_twelve_data_coffee(
         )
         return None
 
+    _store_quote(_KC_SYMBOL, quote)
+    return quote
+
 
 def fetch_realtime_coffee_price(
     api_key: Optional[str] = None,
@@ -111,11 +166,20 @@ def fetch_realtime_coffee_price(
 
     Args:
         api_key: Twelve Data API key.  Pass ``None`` to skip to Yahoo Finance.
-        timeout_s: HTTP request timeout per source.
+        timeout_s: Time budget for the whole chain; Yahoo Finance only gets
+            what Twelve Data left of it.
+
+    Whichever source answers is cached for ``CACHE_TTL`` seconds, so callers
+    within that window skip the chain, including a failing Twelve Data.
 
     Returns:
         CoffeeQuote or None if all sources fail.
     """
+    cached = _cached_quote(_REALTIME_KEY)
+    if cached is not None:
+        return cached
+
+    deadline = time.monotonic() + timeout_s
     if api_key:
         log.info("realtime_price_fetch_start", source="twelve_data")
         quote = fetch_twelve_data_coffee(api_key, timeout_s)
@@ -125,6 +189,7 @@ def fetch_realtime_coffee_price(
                 source="twelve_data",
                 price=quote.price_usd_per_lb,
             )
+            _store_quote(_REALTIME_KEY, quote)
             return quote
         log.warning("realtime_price_twelve_data_failed", fallback="yahoo_finance")
 
@@ -132,13 +197,14 @@ def fetch_realtime_coffee_price(
     from app.providers.coffee_prices import fetch_yahoo_finance_coffee
 
     log.info("realtime_price_fetch_start", source="yahoo_finance")
-    quote = fetch_yahoo_finance_coffee(timeout_s)
+    quote = fetch_yahoo_finance_coffee(max(0.1, deadline - time.monotonic()))
     if quote:
         log.info(
             "realtime_price_fetch_success",
             source="yahoo_finance",
             price=quote.price_usd_per_lb,
         )
+        _store_quote(_REALTIME_KEY, quote)
         return quote
 
     log.error("realtime_price_all_sources_failed")
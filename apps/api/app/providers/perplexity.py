@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-import re
 from typing import Any, Optional
 
 import httpx
+import orjson
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
     wait_exponential_jitter,
@@ -14,12 +15,48 @@ from tenacity import (
 )
 
 from app.core.config import settings
+from app.providers.http import RETRY_STATUS_CODES, parse_retry_after
 
 
 class PerplexityError(RuntimeError):
     pass
 
 
+class RetryableHTTPError(PerplexityError):
+    """A 429/5xx response; retried, honoring ``Retry-After`` when present."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class StructuredOutputError(PerplexityError):
+    """Structured output that is not valid JSON; keeps the raw ``content``."""
+
+    def __init__(self, message: str, content: str):
+        super().__init__(message)
+        self.content = content
+
+
+_backoff = wait_exponential_jitter(initial=1, max=10)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, RetryableHTTPError) and exc.retry_after is not None:
+        return exc.retry_after
+    return _backoff(retry_state)
+
+
+def _raise_for_status(resp: httpx.Response, endpoint: str) -> None:
+    if resp.status_code < 400:
+        return
+    message = f"Perplexity {endpoint} error {resp.status_code}: {resp.text}"
+    if resp.status_code in RETRY_STATUS_CODES:
+        raise RetryableHTTPError(message, parse_retry_after(resp))
+    raise PerplexityError(message)
+
+
 @dataclass
 class SearchResult:
     title: str
@@ -69,8 +106,10 @@ class PerplexityClient:
     @retry(
         reraise=True,
         stop=stop_after_attempt(4),
-        wait=wait_exponential_jitter(initial=1, max=10),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.TransportError)),
+        wait=_wait_retry_after,
+        retry=retry_if_exception_type(
+            (httpx.TimeoutException, httpx.TransportError, RetryableHTTPError)
+        ),
     )
     def search(
         self,
@@ -92,10 +131,7 @@ class PerplexityClient:
             payload["search_domain_filter"] = search_domain_filter
 
         resp = self._client.post("/search", json=payload)
-        if resp.status_code >= 400:
-            raise PerplexityError(
-                f"Perplexity /search error {resp.status_code}: {resp.text}"
-            )
+        _raise_for_status(resp, "/search")
 
         data = resp.json()
         results = []
@@ -116,8 +152,10 @@ class PerplexityClient:
     @retry(
         reraise=True,
         stop=stop_after_attempt(4),
-        wait=wait_exponential_jitter(initial=1, max=10),
-        retry=retry_if_exception_type((httpx.TimeoutException, httpx.TransportError)),
+        wait=_wait_retry_after,
+        retry=retry_if_exception_type(
+            (httpx.TimeoutException, httpx.TransportError, RetryableHTTPError)
+        ),
     )
     def chat_completions(
         self,
@@ -142,10 +180,7 @@ class PerplexityClient:
             payload["response_format"] = response_format
 
         resp = self._client.post("/chat/completions", json=payload)
-        if resp.status_code >= 400:
-            raise PerplexityError(
-                f"Perplexity /chat/completions error {resp.status_code}: {resp.text}"
-            )
+        _raise_for_status(resp, "/chat/completions")
         data = resp.json()
         try:
             return data["choices"][0]["message"]["content"]
@@ -154,45 +189,36 @@ class PerplexityClient:
                 f"Unexpected response shape: {json.dumps(data)[:800]}"
             ) from e
 
+    def chat_completions_json(
+        self,
+        messages: list[dict[str, str]],
+        schema: dict[str, Any],
+        *,
+        model: str | None = None,
+        temperature: float = 0.0,
+        max_tokens: int = 1200,
+    ) -> Any:
+        """Chat completion constrained to ``schema``, parsed as JSON.
+
+        With a JSON-schema ``response_format`` the model returns bare JSON, so
+        the content is decoded directly; anything else raises
+        :class:`StructuredOutputError`.
+        """
+        content = self.chat_completions(
+            messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=json_schema_format(schema),
+        )
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            raise StructuredOutputError(
+                f"Structured output is not valid JSON: {content[:300]}", content
+            ) from e
 
-def safe_json_loads(text: str) -> Any:
-    """Try to parse JSON, forgiving common LLM wrappers.
 
-    We expect the model to return raw JSON, but in practice it may wrap it in
-    code fences or add small prefixes. This helper extracts the first JSON
-    object/array it can find.
-    """
-    s = (text or "").strip()
-
-    # 1) Strip fenced blocks ```json ... ``` or ``` ... ```
-    if "```" in s:
-        # Prefer a ```json fenced block
-        m = re.search(
-            r"```(?:json)?\s*(\{.*?\}|\[.*?\])\s*```",
-            s,
-            flags=re.DOTALL | re.IGNORECASE,
-        )
-        if m:
-            s = m.group(1).strip()
-        else:
-            # Fallback: remove all fences and keep inner content
-            s = re.sub(
-                r"```.*?```", lambda mm: mm.group(0).strip("`"), s, flags=re.DOTALL
-            )
-            s = s.strip().strip("`")
-
-    # 2) Direct parse
-    try:
-        return json.loads(s)
-    except Exception:
-        pass
-
-    # 3) Extract first JSON object/array substring
-    m = re.search(r"(\{.*\}|\[.*\])", s, flags=re.DOTALL)
-    if m:
-        return json.loads(m.group(1))
-
-    # 4) Give up with a useful error
-    raise ValueError(
-        f"Could not parse JSON from model output (first 300 chars): {s[:300]}"
-    )
+def json_schema_format(schema: dict[str, Any]) -> dict[str, Any]:
+    """``response_format`` value asking for output matching ``schema``."""
+    return {"type": "json_schema", "json_schema": {"schema": schema}}
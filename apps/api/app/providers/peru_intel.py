@@ -7,26 +7,53 @@ Provides real data for Peru coffee regions:
 
 from __future__ import annotations
 
-import json
+import asyncio
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Awaitable, Mapping, Optional, TypeVar
 
 import httpx
+import orjson
 import structlog
 
+from app.core.config import settings
+from app.providers.circuit import get_breaker
+from app.providers.http import get_client, send_with_retry, send_with_retry_async
+from app.providers.perplexity import json_schema_format
+from app.providers.timestamps import parse_iso_utc
+
 log = structlog.get_logger()
 
+T = TypeVar("T")
+
+
+# Peru coffee region coordinates for OpenMeteo API (read-only)
+PERU_REGION_COORDS: Mapping[str, Mapping[str, float]] = MappingProxyType(
+    {
+        name: MappingProxyType(coords)
+        for name, coords in {
+            "Cajamarca": {"lat": -7.16, "lon": -78.52},
+            "Junín": {"lat": -11.50, "lon": -75.00},
+            "San Martín": {"lat": -6.50, "lon": -76.50},
+            "Cusco": {"lat": -13.52, "lon": -71.97},
+            "Amazonas": {"lat": -6.23, "lon": -77.87},
+            "Puno": {"lat": -14.30, "lon": -69.80},
+        }.items()
+    }
+)
 
-# Peru coffee region coordinates for OpenMeteo API
-PERU_REGION_COORDS = {
-    "Cajamarca": {"lat": -7.16, "lon": -78.52},
-    "Junín": {"lat": -11.50, "lon": -75.00},
-    "San Martín": {"lat": -6.50, "lon": -76.50},
-    "Cusco": {"lat": -13.52, "lon": -71.97},
-    "Amazonas": {"lat": -6.23, "lon": -77.87},
-    "Puno": {"lat": -14.30, "lon": -69.80},
-}
+# Lower-cased region name -> key in PERU_REGION_COORDS
+_REGION_KEYS_LOWER = MappingProxyType(
+    {name.lower(): name for name in PERU_REGION_COORDS}
+)
+
+
+def _region_coords(region_name: str) -> Optional[Mapping[str, float]]:
+    key = _REGION_KEYS_LOWER.get(region_name.strip().lower())
+    return PERU_REGION_COORDS[key] if key is not None else None
 
 
 def _safe_float(value: Optional[Any]) -> Optional[float]:
@@ -58,9 +85,14 @@ class WeatherData:
     observed_at: datetime
     source_name: str
     source_url: str
-    raw_data: str
+    raw_bytes: bytes
     metadata: dict
 
+    @property
+    def raw_data(self) -> str:
+        """Upstream response body, decoded on access."""
+        return self.raw_bytes.decode("utf-8", "replace")
+
 
 @dataclass(frozen=True)
 class ProductionData:
@@ -73,9 +105,50 @@ class ProductionData:
     quality_notes: Optional[str]
     source_name: str
     source_url: str
-    raw_data: str
+    raw_bytes: bytes
     metadata: dict
 
+    @property
+    def raw_data(self) -> str:
+        """Upstream response body, decoded on access."""
+        return self.raw_bytes.decode("utf-8", "replace")
+
+
+OPENMETEO_URL = "https://api.open-meteo.com/v1/forecast"
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+
+
+# Query parameters per region, built once; only the coordinates differ
+_OPENMETEO_PARAMS: Mapping[str, Mapping[str, str | int]] = MappingProxyType(
+    {
+        name: MappingProxyType(
+            {
+                "latitude": str(coords["lat"]),
+                "longitude": str(coords["lon"]),
+                "current_weather": "true",
+                "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum",
+                "timezone": "America/Lima",
+                "forecast_days": 1,
+            }
+        )
+        for name, coords in PERU_REGION_COORDS.items()
+    }
+)
+
+
+@lru_cache(maxsize=256)
+def _warn_unknown_region(region_name: str) -> None:
+    # Memoized: each unknown name is logged once, not on every sweep
+    log.warning("openmeteo_unknown_region", region_name=region_name)
+
+
+def _openmeteo_params(region_name: str) -> Optional[Mapping[str, str | int]]:
+    key = _REGION_KEYS_LOWER.get(region_name.strip().lower())
+    if key is None:
+        _warn_unknown_region(region_name)
+        return None
+    return _OPENMETEO_PARAMS[key]
+
 
 def fetch_openmeteo_weather(
     region_name: str, timeout_s: float = 20.0
@@ -92,43 +165,75 @@ def fetch_openmeteo_weather(
     Returns:
         WeatherData or None if region not found or request fails
     """
-    coords = PERU_REGION_COORDS.get(region_name)
-    if not coords:
-        log.warning("openmeteo_unknown_region", region_name=region_name)
+    request_params = _openmeteo_params(region_name)
+    if request_params is None:
         return None
 
-    lat = coords["lat"]
-    lon = coords["lon"]
-
-    url = "https://api.open-meteo.com/v1/forecast"
-    # Type the params dict to avoid mypy issues
-    request_params: dict[str, str | int | float] = {
-        "latitude": str(lat),
-        "longitude": str(lon),
-        "current_weather": "true",
-        "daily": "temperature_2m_max,temperature_2m_min,precipitation_sum",
-        "timezone": "America/Lima",
-        "forecast_days": 1,
-    }
+    breaker = get_breaker("openmeteo")
+    if not breaker.can_attempt():
+        return None
 
     try:
-        r = httpx.get(
-            url,
+        r = get_client().get(
+            OPENMETEO_URL,
             timeout=timeout_s,
             headers={"User-Agent": "CoffeeStudio/1.0"},
             params=request_params,
         )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
+        breaker.record_failure()
         log.warning(
             "openmeteo_fetch_failed",
             region_name=region_name,
             error=str(e),
-            exc_info=True,
+            exc_info=settings.DEBUG_PROVIDERS,
         )
         return None
 
+    breaker.record_success()
+    return _openmeteo_weather(region_name, data, r.content)
+
+
+async def fetch_openmeteo_weather_async(
+    client: httpx.AsyncClient, region_name: str
+) -> Optional[WeatherData]:
+    """Async variant of :func:`fetch_openmeteo_weather` on a shared client."""
+    request_params = _openmeteo_params(region_name)
+    if request_params is None:
+        return None
+
+    breaker = get_breaker("openmeteo")
+    if not breaker.can_attempt():
+        return None
+
+    try:
+        r = await client.get(
+            OPENMETEO_URL,
+            headers={"User-Agent": "CoffeeStudio/1.0"},
+            params=request_params,
+        )
+        r.raise_for_status()
+        data = orjson.loads(r.content)
+    except Exception as e:
+        breaker.record_failure()
+        log.warning(
+            "openmeteo_fetch_failed",
+            region_name=region_name,
+            error=str(e),
+            exc_info=settings.DEBUG_PROVIDERS,
+        )
+        return None
+
+    breaker.record_success()
+    return _openmeteo_weather(region_name, data, r.content)
+
+
+def _openmeteo_weather(
+    region_name: str, data: dict, raw_bytes: bytes
+) -> Optional[WeatherData]:
+    coords = _region_coords(region_name) or {}
     try:
         current = data.get("current_weather", {})
         daily = data.get("daily", {})
@@ -155,17 +260,7 @@ def fetch_openmeteo_weather(
             if precip_list:
                 precipitation = _safe_float(precip_list[0])
 
-        # Parse timestamp
-        time_str = current.get("time")
-        if time_str:
-            try:
-                observed_at = datetime.fromisoformat(time_str).replace(
-                    tzinfo=timezone.utc
-                )
-            except Exception:
-                observed_at = datetime.now(timezone.utc)
-        else:
-            observed_at = datetime.now(timezone.utc)
+        observed_at = parse_iso_utc(current.get("time"))
 
         return WeatherData(
             region_name=region_name,
@@ -175,11 +270,11 @@ def fetch_openmeteo_weather(
             precipitation_mm=precipitation,
             observed_at=observed_at,
             source_name="OpenMeteo",
-            source_url=url,
-            raw_data=json.dumps(data),
+            source_url=OPENMETEO_URL,
+            raw_bytes=raw_bytes,
             metadata={
-                "latitude": lat,
-                "longitude": lon,
+                "latitude": coords["lat"],
+                "longitude": coords["lon"],
                 "timezone": data.get("timezone", "America/Lima"),
                 "windspeed": current.get("windspeed"),
                 "weathercode": current.get("weathercode"),
@@ -195,30 +290,89 @@ def fetch_openmeteo_weather(
         return None
 
 
-def fetch_perplexity_production_intel(
-    region_name: str, perplexity_api_key: Optional[str], timeout_s: float = 60.0
-) -> Optional[ProductionData]:
-    """Fetch production intelligence using Perplexity Sonar API.
+# Requests in flight at once during a region sweep: keeps Open-Meteo under
+# its rate limit and avoids bursts of paid Perplexity calls.
+SWEEP_CONCURRENCY = 4
 
-    Uses Perplexity's web search capabilities to gather current production
-    and market data for Peru coffee regions.
 
-    Args:
-        region_name: Name of Peru region
-        perplexity_api_key: Perplexity API key (required)
-        timeout_s: Request timeout
+async def _gather_limited(calls: list[Awaitable[T]], limit: int) -> list[T | None]:
+    """Await ``calls`` with at most ``limit`` running; exceptions become None."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(call: Awaitable[T]) -> T:
+        async with semaphore:
+            return await call
+
+    results = await asyncio.gather(
+        *(run(call) for call in calls), return_exceptions=True
+    )
+    out: list[T | None] = []
+    for result in results:
+        if isinstance(result, BaseException):
+            log.warning("peru_sweep_request_failed", error=str(result))
+            result = None
+        out.append(result)
+    return out
+
+
+def _sweep_client(timeout_s: float) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=timeout_s,
+        limits=httpx.Limits(max_connections=SWEEP_CONCURRENCY),
+    )
+
+
+async def fetch_all_peru_weather_async(
+    timeout_s: float = 20.0,
+) -> dict[str, Optional[WeatherData]]:
+    """Fetch OpenMeteo weather for every region in ``PERU_REGION_COORDS``.
+
+    Regions are requested concurrently on one ``httpx.AsyncClient``, at most
+    ``SWEEP_CONCURRENCY`` at a time.
 
     Returns:
-        ProductionData or None if API key missing or request fails
+        Mapping of region name to WeatherData, or None where the fetch failed
     """
-    if not perplexity_api_key:
-        log.warning(
-            "perplexity_no_api_key",
-            region_name=region_name,
-            note="PERPLEXITY_API_KEY not configured",
+    regions = list(PERU_REGION_COORDS)
+    async with _sweep_client(timeout_s) as client:
+        results = await _gather_limited(
+            [fetch_openmeteo_weather_async(client, region) for region in regions],
+            SWEEP_CONCURRENCY,
         )
-        return None
+    return dict(zip(regions, results))
+
 
+def fetch_all_peru_weather(timeout_s: float = 20.0) -> dict[str, Optional[WeatherData]]:
+    """Synchronous wrapper around :func:`fetch_all_peru_weather_async`.
+
+    Must not be called from a running event loop; async callers should
+    await ``fetch_all_peru_weather_async`` directly.
+    """
+    return asyncio.run(fetch_all_peru_weather_async(timeout_s))
+
+
+# Structured output for production intel; unknown figures come back as null
+_PRODUCTION_INTEL_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "production_volume_kg": {"type": ["integer", "null"]},
+        "export_volume_kg": {"type": ["integer", "null"]},
+        "avg_price_usd_kg": {"type": ["number", "null"]},
+        "quality_notes": {"type": ["string", "null"]},
+    },
+    "required": [
+        "production_volume_kg",
+        "export_volume_kg",
+        "avg_price_usd_kg",
+        "quality_notes",
+    ],
+    "additionalProperties": False,
+}
+
+
+def _production_intel_request(
+    region_name: str, perplexity_api_key: str
+) -> tuple[dict[str, str], dict[str, Any]]:
     current_year = datetime.now().year
     query = (
         f"Peru {region_name} coffee production volume export statistics "
@@ -226,7 +380,6 @@ def fetch_perplexity_production_intel(
         f"average price per kg, and quality characteristics."
     )
 
-    url = "https://api.perplexity.ai/chat/completions"
     headers = {
         "Authorization": f"Bearer {perplexity_api_key}",
         "Content-Type": "application/json",
@@ -242,21 +395,113 @@ def fetch_perplexity_production_intel(
         ],
         "temperature": 0.2,
         "max_tokens": 500,
+        "response_format": json_schema_format(_PRODUCTION_INTEL_SCHEMA),
     }
+    return headers, payload
+
+
+def fetch_perplexity_production_intel(
+    region_name: str, perplexity_api_key: Optional[str], timeout_s: float = 60.0
+) -> Optional[ProductionData]:
+    """Fetch production intelligence using Perplexity Sonar API.
+
+    Uses Perplexity's web search capabilities to gather current production
+    and market data for Peru coffee regions.
+
+    Args:
+        region_name: Name of Peru region
+        perplexity_api_key: Perplexity API key (required)
+        timeout_s: Request timeout
+
+    Returns:
+        ProductionData or None if API key missing or request fails
+    """
+    if not perplexity_api_key:
+        log.warning(
+            "perplexity_no_api_key",
+            region_name=region_name,
+            note="PERPLEXITY_API_KEY not configured",
+        )
+        return None
+
+    headers, payload = _production_intel_request(region_name, perplexity_api_key)
+
+    breaker = get_breaker("perplexity")
+    if not breaker.can_attempt():
+        return None
 
     try:
-        r = httpx.post(url, headers=headers, json=payload, timeout=timeout_s)
+        r = send_with_retry(
+            lambda: get_client().post(
+                PERPLEXITY_URL, headers=headers, json=payload, timeout=timeout_s
+            ),
+            "perplexity",
+            deadline=time.monotonic() + timeout_s,
+        )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
+        breaker.record_failure()
         log.warning(
             "perplexity_fetch_failed",
             region_name=region_name,
             error=str(e),
-            exc_info=True,
+            exc_info=settings.DEBUG_PROVIDERS,
         )
         return None
 
+    breaker.record_success()
+    return _production_data(region_name, payload, data, r.content)
+
+
+async def fetch_perplexity_production_intel_async(
+    client: httpx.AsyncClient,
+    region_name: str,
+    perplexity_api_key: Optional[str],
+) -> Optional[ProductionData]:
+    """Async variant of :func:`fetch_perplexity_production_intel`."""
+    if not perplexity_api_key:
+        log.warning(
+            "perplexity_no_api_key",
+            region_name=region_name,
+            note="PERPLEXITY_API_KEY not configured",
+        )
+        return None
+
+    headers, payload = _production_intel_request(region_name, perplexity_api_key)
+
+    breaker = get_breaker("perplexity")
+    if not breaker.can_attempt():
+        return None
+
+    try:
+        r = await send_with_retry_async(
+            lambda: client.post(PERPLEXITY_URL, headers=headers, json=payload),
+            "perplexity",
+        )
+        r.raise_for_status()
+        data = orjson.loads(r.content)
+    except Exception as e:
+        breaker.record_failure()
+        log.warning(
+            "perplexity_fetch_failed",
+            region_name=region_name,
+            error=str(e),
+            exc_info=settings.DEBUG_PROVIDERS,
+        )
+        return None
+
+    breaker.record_success()
+    return _production_data(region_name, payload, data, r.content)
+
+
+def _optional(value: Any, cast: type) -> Any:
+    return None if value is None else cast(value)
+
+
+def _production_data(
+    region_name: str, payload: dict[str, Any], data: dict, raw_bytes: bytes
+) -> Optional[ProductionData]:
     try:
         choices = data.get("choices", [])
         if not choices:
@@ -265,20 +510,19 @@ def fetch_perplexity_production_intel(
 
         content = choices[0].get("message", {}).get("content", "")
         citations = data.get("citations", [])
+        intel = orjson.loads(content)
 
-        # Parse the response (simple extraction - could be enhanced with structured output)
-        # For now, just store the raw intelligence
         return ProductionData(
             region_name=region_name,
-            production_volume_kg=None,  # Would need structured parsing
-            export_volume_kg=None,
-            avg_price_usd_kg=None,
-            quality_notes=content[:500] if content else None,
+            production_volume_kg=_optional(intel.get("production_volume_kg"), int),
+            export_volume_kg=_optional(intel.get("export_volume_kg"), int),
+            avg_price_usd_kg=_optional(intel.get("avg_price_usd_kg"), float),
+            quality_notes=(intel.get("quality_notes") or "")[:500] or None,
             source_name="Perplexity Sonar",
-            source_url=url,
-            raw_data=json.dumps(data),
+            source_url=PERPLEXITY_URL,
+            raw_bytes=raw_bytes,
             metadata={
-                "query": query,
+                "query": payload["messages"][-1]["content"],
                 "citations": citations[:5] if citations else [],
                 "model": payload["model"],
             },
@@ -293,11 +537,73 @@ def fetch_perplexity_production_intel(
         return None
 
 
+async def fetch_peru_intel_all_async(
+    perplexity_api_key: Optional[str],
+    timeout_s: float = 60.0,
+) -> dict[str, tuple[Optional[WeatherData], Optional[ProductionData]]]:
+    """Fetch weather and production intel for every Peru region in one sweep.
+
+    Open-Meteo and Perplexity requests for all regions share one
+    ``httpx.AsyncClient`` and run at most ``SWEEP_CONCURRENCY`` at a time.
+    Production intel is skipped (None) without a Perplexity API key.
+
+    Returns:
+        Mapping of region name to ``(weather, production)``
+    """
+    regions = list(PERU_REGION_COORDS)
+    async with _sweep_client(timeout_s) as client:
+        calls: list[Awaitable[Any]] = [
+            fetch_openmeteo_weather_async(client, region) for region in regions
+        ]
+        if perplexity_api_key:
+            calls += [
+                fetch_perplexity_production_intel_async(
+                    client, region, perplexity_api_key
+                )
+                for region in regions
+            ]
+        results = await _gather_limited(calls, SWEEP_CONCURRENCY)
+
+    weather = results[: len(regions)]
+    production = results[len(regions) :] or [None] * len(regions)
+    return {region: (weather[i], production[i]) for i, region in enumerate(regions)}
+
+
+def fetch_peru_intel_all(
+    perplexity_api_key: Optional[str],
+    timeout_s: float = 60.0,
+) -> dict[str, tuple[Optional[WeatherData], Optional[ProductionData]]]:
+    """Synchronous wrapper around :func:`fetch_peru_intel_all_async`.
+
+    Must not be called from a running event loop.
+    """
+    return asyncio.run(fetch_peru_intel_all_async(perplexity_api_key, timeout_s))
+
+
+# Static ICO benchmarks; only ``data.last_updated`` changes per call
+_ICO_FALLBACK_PRICES: Mapping[str, Any] = {
+    "arabica_mild": {
+        "price_usd_per_lb": 2.10,
+        "note": "Historical ICO Composite Indicator average",
+    },
+    "peru_fob_benchmark": {
+        "price_usd_per_kg": 4.85,
+        "note": "Estimated from regional FOB averages",
+    },
+}
+_ICO_COMPOSITE_INDICATOR: Mapping[str, float] = {
+    "arabica_mild": 2.10,
+    "other_milds": 2.15,
+    "robusta": 1.45,
+}
+
+
 def fetch_ico_price_data() -> dict[str, Any]:
     """Fetch ICO price data (fallback implementation).
 
     This provides static fallback prices based on historical ICO data.
     In the future, this could scrape ico.org or use Perplexity to find current prices.
+    The nested price dicts are shared module constants and must not be mutated.
 
     Returns:
         Dictionary with ICO price data and fallback values
@@ -305,22 +611,9 @@ def fetch_ico_price_data() -> dict[str, Any]:
     return {
         "source": "ICO",
         "available": True,
-        "fallback_prices": {
-            "arabica_mild": {
-                "price_usd_per_lb": 2.10,
-                "note": "Historical ICO Composite Indicator average",
-            },
-            "peru_fob_benchmark": {
-                "price_usd_per_kg": 4.85,
-                "note": "Estimated from regional FOB averages",
-            },
-        },
+        "fallback_prices": _ICO_FALLBACK_PRICES,
         "data": {
-            "composite_indicator": {
-                "arabica_mild": 2.10,
-                "other_milds": 2.15,
-                "robusta": 1.45,
-            },
+            "composite_indicator": _ICO_COMPOSITE_INDICATOR,
             "last_updated": datetime.now(timezone.utc).isoformat(),
             "note": "Static fallback - live ICO integration pending",
         },
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import csv
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from io import StringIO
-from typing import Optional
+from typing import Iterable, Optional
 
 import httpx
 
+from app.providers.http import USER_AGENT, get_client
+
 
 @dataclass(frozen=True)
 class OhlcQuote:
@@ -25,33 +30,196 @@ def _stooq_csv_url(symbol: str, interval: str = "d") -> str:
     return f"https://stooq.com/q/d/l/?s={sym}&i={interval}"
 
 
-def fetch_stooq_last_close(symbol: str, timeout_s: float = 20.0) -> Optional[OhlcQuote]:
+@dataclass(frozen=True)
+class _CachedCsv:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    quote: OhlcQuote
+    fresh_until: float
+
+
+# Parsed quote and validators per CSV URL. Within Cache-Control max-age the
+# quote is reused as-is; after that a conditional GET lets Stooq answer 304
+# instead of resending the whole history.
+_csv_cache: dict[str, _CachedCsv] = {}
+_csv_cache_lock = threading.Lock()
+
+
+def _max_age(response: httpx.Response) -> float:
+    for directive in response.headers.get("Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name.lower() == "max-age":
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                return 0.0
+    return 0.0
+
+
+def _request_headers(url: str) -> tuple[Optional[OhlcQuote], dict[str, str]]:
+    """Return a still-fresh cached quote, or headers for a (conditional) GET."""
+    headers = {"User-Agent": USER_AGENT}
+    with _csv_cache_lock:
+        cached = _csv_cache.get(url)
+    if cached is None:
+        return None, headers
+    if time.monotonic() < cached.fresh_until:
+        return cached.quote, headers
+    if cached.etag:
+        headers["If-None-Match"] = cached.etag
+    if cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    return None, headers
+
+
+def _quote_from_response(
+    symbol: str, url: str, response: httpx.Response
+) -> Optional[OhlcQuote]:
+    with _csv_cache_lock:
+        cached = _csv_cache.get(url)
+    if response.status_code == 304 and cached is not None:
+        quote = cached.quote
+    else:
+        response.raise_for_status()
+        quote = _parse_last_close(symbol, url, response.text)
+        if quote is None:
+            return None
+
+    etag = response.headers.get("ETag") or (cached.etag if cached else None)
+    last_modified = response.headers.get("Last-Modified") or (
+        cached.last_modified if cached else None
+    )
+    max_age = _max_age(response)
+    if etag or last_modified or max_age:
+        with _csv_cache_lock:
+            _csv_cache[url] = _CachedCsv(
+                etag, last_modified, quote, time.monotonic() + max_age
+            )
+    return quote
+
+
+def fetch_stooq_last_close(
+    symbol: str,
+    timeout_s: float = 20.0,
+    client: Optional[httpx.Client] = None,
+) -> Optional[OhlcQuote]:
     """Fetch last available close price for a symbol from Stooq (CSV).
 
+    Requests go through the pooled provider client unless ``client`` is
+    given, so fetching several symbols reuses one keep-alive connection.
+    Repeat calls revalidate with ETag/Last-Modified and reuse the parsed
+    quote on 304.
+
     Note: Stooq coverage for some commodities can be flaky; this returns None
     if the endpoint returns no rows.
     """
     url = _stooq_csv_url(symbol, "d")
+    cached, headers = _request_headers(url)
+    if cached is not None:
+        return cached
     try:
-        r = httpx.get(
-            url, timeout=timeout_s, headers={"User-Agent": "CoffeeStudio/1.0"}
-        )
-        r.raise_for_status()
-        text = r.text
+        r = (client or get_client()).get(url, timeout=timeout_s, headers=headers)
+        return _quote_from_response(symbol, url, r)
     except Exception:
         return None
 
-    # CSV header: Date,Open,High,Low,Close,Volume
+
+async def fetch_stooq_last_close_async(
+    client: httpx.AsyncClient, symbol: str
+) -> Optional[OhlcQuote]:
+    """Async variant of :func:`fetch_stooq_last_close` on a shared client."""
+    url = _stooq_csv_url(symbol, "d")
+    cached, headers = _request_headers(url)
+    if cached is not None:
+        return cached
     try:
-        rows = list(csv.DictReader(StringIO(text)))
+        r = await client.get(url, headers=headers)
+        return _quote_from_response(symbol, url, r)
     except Exception:
         return None
-    if not rows:
+
+
+async def fetch_stooq_last_close_many_async(
+    symbols: Iterable[str],
+    timeout_s: float = 20.0,
+    concurrency: int = 16,
+) -> dict[str, Optional[OhlcQuote]]:
+    """Fetch the last close for several symbols concurrently.
+
+    One ``httpx.AsyncClient`` is shared by all requests and at most
+    ``concurrency`` of them are in flight at a time.
+
+    Returns:
+        Mapping of symbol to OhlcQuote, or None where the fetch failed
+    """
+    symbols = list(dict.fromkeys(symbols))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        timeout=timeout_s,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+
+        async def one(symbol: str) -> Optional[OhlcQuote]:
+            async with semaphore:
+                return await fetch_stooq_last_close_async(client, symbol)
+
+        quotes = await asyncio.gather(*(one(symbol) for symbol in symbols))
+    return dict(zip(symbols, quotes))
+
+
+def fetch_stooq_last_close_many(
+    symbols: Iterable[str],
+    timeout_s: float = 20.0,
+    concurrency: int = 16,
+) -> dict[str, Optional[OhlcQuote]]:
+    """Synchronous wrapper around :func:`fetch_stooq_last_close_many_async`.
+
+    Must not be called from a running event loop.
+    """
+    return asyncio.run(
+        fetch_stooq_last_close_many_async(symbols, timeout_s, concurrency)
+    )
+
+
+_CSV_HEADER = "Date,Open,High,Low,Close,Volume"
+
+
+def _parse_stooq_last_row(text: str) -> Optional[tuple[str, str]]:
+    """Return ``(date, close)`` of the last CSV row without parsing the rest.
+
+    Only the newest row is needed, so with the usual header the tail line is
+    sliced off and split once. Any other layout goes through csv.DictReader.
+    """
+    header_end = text.find("\n")
+    if header_end < 0:
         return None
+    if text[:header_end].strip() != _CSV_HEADER:
+        last = None
+        try:
+            for last in csv.DictReader(StringIO(text)):
+                pass
+        except Exception:
+            return None
+        if last is None:
+            return None
+        return last.get("Date") or "", last.get("Close") or ""
 
-    last = rows[-1]
-    dt_str = (last.get("Date") or "").strip()
-    close_str = (last.get("Close") or "").strip()
+    body = text.rstrip()
+    row_start = body.rfind("\n") + 1
+    if row_start <= header_end:
+        return None
+    fields = body[row_start:].split(",")
+    if len(fields) < 5:
+        return None
+    return fields[0], fields[4]
+
+
+def _parse_last_close(symbol: str, url: str, text: str) -> Optional[OhlcQuote]:
+    row = _parse_stooq_last_row(text)
+    if row is None:
+        return None
+    dt_str, close_str = row[0].strip(), row[1].strip()
     if not dt_str or not close_str:
         return None
 
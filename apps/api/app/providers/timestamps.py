@@ -0,0 +1,47 @@
+"""Memoized timestamp parsing for provider responses.
+
+Polled APIs (ExchangeRate-API, Frankfurter, Open-Meteo, Yahoo Finance)
+report the same update timestamp until their next refresh, so the parsed
+value is cached by input. Both helpers fall back to "now" when the value
+is missing or unparseable, as the providers did inline.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+# Longest ISO-8601 string worth caching ("2024-01-01T00:00:00.000000+00:00");
+# anything longer is not a timestamp and would only evict real entries.
+_MAX_ISO_LEN = 32
+
+
+@lru_cache(maxsize=256)
+def _parse_iso(value: str) -> datetime:
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=256)
+def _parse_unix(value: int | float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def parse_iso_utc(value: Any) -> datetime:
+    """Parse an ISO date/time as UTC, or return the current time."""
+    if isinstance(value, str) and 0 < len(value) <= _MAX_ISO_LEN:
+        try:
+            return _parse_iso(value)
+        except ValueError:
+            pass
+    return datetime.now(timezone.utc)
+
+
+def from_unix_utc(value: Any) -> datetime:
+    """Convert epoch seconds to a UTC datetime, or return the current time."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value:
+        try:
+            return _parse_unix(value)
+        except (OverflowError, OSError, ValueError):
+            pass
+    return datetime.now(timezone.utc)
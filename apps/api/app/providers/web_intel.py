@@ -6,16 +6,23 @@ direct APIs available.
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional, Any
 
 import httpx
+import orjson
 import structlog
 
+from app.providers.http import TokenBucket, get_client, send_with_retry
+
 log = structlog.get_logger()
 
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+
+# Sustained ~50 requests/minute with room for a short burst
+_PERPLEXITY_BUCKET = TokenBucket(rate=1 / 1.2, capacity=8)
+
 
 @dataclass(frozen=True)
 class WebIntelligence:
@@ -26,9 +33,22 @@ class WebIntelligence:
     citations: list[str]
     observed_at: datetime
     source_name: str
-    raw_data: str
+    raw_bytes: bytes
     metadata: dict
 
+    @property
+    def raw_data(self) -> str:
+        """Upstream response body, decoded on access."""
+        return self.raw_bytes.decode("utf-8", "replace")
+
+
+def _post_throttled(headers: dict, payload: dict, timeout_s: float) -> httpx.Response:
+    # Every attempt, retries included, waits for a token
+    _PERPLEXITY_BUCKET.acquire()
+    return get_client().post(
+        PERPLEXITY_URL, headers=headers, json=payload, timeout=timeout_s
+    )
+
 
 def research_topic(
     query: str,
@@ -60,7 +80,6 @@ def research_topic(
         )
         return None
 
-    url = "https://api.perplexity.ai/chat/completions"
     headers = {
         "Authorization": f"Bearer {perplexity_api_key}",
         "Content-Type": "application/json",
@@ -82,9 +101,13 @@ def research_topic(
     }
 
     try:
-        r = httpx.post(url, headers=headers, json=payload, timeout=timeout_s)
+        r = send_with_retry(
+            lambda: _post_throttled(headers, payload, timeout_s),
+            "perplexity",
+            attempts=5,
+        )
         r.raise_for_status()
-        data = r.json()
+        data = orjson.loads(r.content)
     except Exception as e:
         log.warning(
             "perplexity_research_failed",
@@ -114,7 +137,7 @@ def research_topic(
             citations=citations,
             observed_at=datetime.now(timezone.utc),
             source_name="Perplexity Sonar",
-            raw_data=json.dumps(data),
+            raw_bytes=r.content,
             metadata={
                 "model": payload["model"],
                 "temperature": temperature,
@@ -3,6 +3,7 @@
 import ast
 import difflib
 import logging
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -22,6 +23,7 @@ class AutoFixer:
         self.repo_root = Path(repo_root)
         self.backup_dir = self.repo_root / ".qa_backups"
         self.backup_dir.mkdir(exist_ok=True)
+        self._file_index: dict[str, Path] | None = None
 
     def apply_fix(
         self,
@@ -66,8 +68,11 @@ class AutoFixer:
                         "backup_path": str(backup_path),
                     }
 
+            # Read once; the diff after writing reuses it instead of the backup
+            original_lines = full_path.read_text().splitlines(keepends=True)
+
             if dry_run:
-                diff = self._generate_diff(full_path, fix_code)
+                diff = self._generate_diff(full_path, fix_code, original_lines)
                 return {
                     "applied": False,
                     "dry_run": True,
@@ -82,7 +87,7 @@ class AutoFixer:
             return {
                 "applied": True,
                 "backup_path": str(backup_path),
-                "changes": self._generate_diff(backup_path, fix_code),
+                "changes": self._generate_diff(backup_path, fix_code, original_lines),
                 "reason": "Fix applied successfully",
             }
 
@@ -123,7 +128,7 @@ class AutoFixer:
                 logger.error(f"Could not find original file for: {original_name}")
                 return False
 
-            original.write_text(backup.read_text())
+            shutil.copyfile(backup, original)
             logger.info(f"Successfully rolled back {original} from {backup_path}")
             return True
         except Exception as e:
@@ -139,19 +144,36 @@ class AutoFixer:
         Returns:
             Path to the file if found, None otherwise.
         """
-        # Search in common locations
-        search_paths = [
-            self.repo_root / "apps/api" / "app",
-            self.repo_root / "apps/api" / "tests",
-            self.repo_root / "apps/api",
-        ]
+        path = self._ensure_index().get(filename)
+        if path is not None and not path.is_file():
+            # Tree changed since the index was built
+            self.invalidate_index()
+            path = self._ensure_index().get(filename)
+        return path
 
-        for search_path in search_paths:
-            for path in search_path.rglob(filename):
-                if path.is_file():
-                    return path
+    def _ensure_index(self) -> dict[str, Path]:
+        """Map file names to paths, built once per instance.
 
-        return None
+        Earlier search paths take precedence, as the per-call search did.
+        """
+        if self._file_index is None:
+            index: dict[str, Path] = {}
+            # Search in common locations
+            search_paths = [
+                self.repo_root / "apps/api" / "app",
+                self.repo_root / "apps/api" / "tests",
+                self.repo_root / "apps/api",
+            ]
+            for search_path in search_paths:
+                for path in search_path.rglob("*"):
+                    if path.name not in index and path.is_file():
+                        index[path.name] = path
+            self._file_index = index
+        return self._file_index
+
+    def invalidate_index(self) -> None:
+        """Forget the file-name index after files were added or moved."""
+        self._file_index = None
 
     def _backup_file(self, file_path: Path) -> Path:
         """Create timestamped backup of file.
@@ -164,20 +186,28 @@ class AutoFixer:
         """
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = self.backup_dir / f"{file_path.name}.{timestamp}.backup"
-        backup_path.write_text(file_path.read_text())
+        shutil.copyfile(file_path, backup_path)
         return backup_path
 
-    def _generate_diff(self, original: Path, new_content: str) -> str:
+    def _generate_diff(
+        self,
+        original: Path,
+        new_content: str,
+        original_lines: list[str] | None = None,
+    ) -> str:
         """Generate unified diff.
 
         Args:
             original: Path to original file.
             new_content: New content to compare.
+            original_lines: Original content already in memory; read from
+                ``original`` if omitted.
 
         Returns:
             Unified diff as string.
         """
-        original_lines = original.read_text().splitlines(keepends=True)
+        if original_lines is None:
+            original_lines = original.read_text().splitlines(keepends=True)
         new_lines = new_content.splitlines(keepends=True)
 
         diff = difflib.unified_diff(
@@ -1,8 +1,12 @@
 """AI-powered quality assurance command-line interface."""
 
+import asyncio
 import os
 import subprocess
+import tempfile
+from collections import deque
 from pathlib import Path
+from typing import Any, Callable, TextIO
 
 try:
     import click
@@ -11,11 +15,11 @@ except ImportError:
         "ERROR: click package is required. Install with: pip install click"
     )
 
-from .failure_analyzer import AIFailureAnalyzer
+from .failure_analyzer import AIFailureAnalyzer, TestFailure
 from .auto_fixer import AutoFixer
 from .regression_generator import RegressionTestGenerator
 from .utils import (
-    parse_pytest_output,
+    PytestLineParser,
     check_coverage,
     check_ruff,
     check_mypy,
@@ -24,6 +28,82 @@ from .utils import (
 )
 
 
+# Concurrent AI analysis requests while pytest is still running
+ANALYSIS_CONCURRENCY = 4
+
+# Output lines kept to show when failures cannot be parsed
+OUTPUT_TAIL_LINES = 200
+
+
+def _stream_pytest(
+    test_path: str,
+    on_line: Callable[[str], None],
+    stderr: int | TextIO = subprocess.STDOUT,
+) -> int:
+    """Run pytest, passing each output line to ``on_line`` as it is printed.
+
+    Returns:
+        Pytest exit code.
+    """
+    with subprocess.Popen(
+        ["pytest", test_path, "-v", "--tb=short"],
+        stdout=subprocess.PIPE,
+        stderr=stderr,
+        text=True,
+        bufsize=1,
+        cwd=Path.cwd(),
+    ) as proc:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            on_line(line)
+    return proc.returncode
+
+
+async def _test_and_analyze(
+    test_path: str,
+    analyzer: AIFailureAnalyzer | None,
+    max_fixes: int,
+    tail: deque[str],
+) -> tuple[int, list[TestFailure], list[dict[str, Any] | BaseException]]:
+    """Run pytest and analyze the first ``max_fixes`` failures concurrently.
+
+    Pytest is read in a worker thread; each parsed failure starts its AI
+    analysis on the event loop right away, so analysis overlaps the rest of
+    the run.
+
+    Returns:
+        Pytest exit code, all parsed failures, and one analysis (or the
+        exception it raised) per analyzed failure.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+    parser = PytestLineParser()
+    failures: list[TestFailure] = []
+    tasks: list[asyncio.Task] = []
+
+    async def analyze(failure: TestFailure) -> dict[str, Any]:
+        assert analyzer is not None
+        async with semaphore:
+            return await analyzer.analyze_failure_async(failure)
+
+    def collect(completed: list[TestFailure]) -> None:
+        for failure in completed:
+            failures.append(failure)
+            if analyzer is not None and len(tasks) < max_fixes:
+                tasks.append(asyncio.create_task(analyze(failure)))
+
+    def on_line(line: str) -> None:
+        tail.append(line)
+        completed = parser.feed(line)
+        if completed:
+            loop.call_soon_threadsafe(collect, completed)
+
+    returncode = await asyncio.to_thread(_stream_pytest, test_path, on_line)
+    collect(parser.close())
+    analyses = await asyncio.gather(*tasks, return_exceptions=True)
+    return returncode, failures, analyses
+
+
 @click.group()
 def qa_cli():
     """AI-powered quality assurance CLI."""
@@ -44,39 +124,35 @@ def analyze_failures(
 
     click.echo("🔍 Running tests and analyzing failures...\n")
 
-    # Run pytest and capture failures
-    result = subprocess.run(
-        ["pytest", test_path, "-v", "--tb=short"],
-        capture_output=True,
-        text=True,
-        cwd=Path.cwd(),
+    api_key = os.getenv("OPENAI_API_KEY")
+    analyzer = AIFailureAnalyzer(api_key=api_key) if api_key else None
+
+    # Failures are analyzed while pytest runs; fixes are applied only after
+    # the run has finished.
+    tail: deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+    returncode, failures, analyses = asyncio.run(
+        _test_and_analyze(test_path, analyzer, max_fixes, tail)
     )
 
-    if result.returncode == 0:
+    if returncode == 0:
         click.echo("✅ All tests passed! No fixes needed.")
         return
 
-    # Parse failures
-    click.echo("📝 Parsing test failures...\n")
-    failures = parse_pytest_output(result.stdout + "\n" + result.stderr)
-
     if not failures:
         click.echo(
             "⚠️  Tests failed but could not parse failures. Run pytest manually for details."
         )
-        click.echo(result.stdout)
+        click.echo("".join(tail))
         return
 
     click.echo(f"❌ Found {len(failures)} test failures\n")
 
     # Check for OpenAI API key
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
+    if analyzer is None:
         click.echo("⚠️  OPENAI_API_KEY not set. Cannot perform AI analysis.")
         click.echo("Set the environment variable and try again.")
         return
 
-    analyzer = AIFailureAnalyzer(api_key=api_key)
     fixer = AutoFixer(repo_root=Path.cwd())
 
     fixes_applied = 0
@@ -90,7 +166,9 @@ def analyze_failures(
         try:
             # AI analysis
             click.echo("  🤖 Running AI analysis...")
-            analysis = analyzer.analyze_failure(failure)
+            analysis = analyses[i - 1]
+            if isinstance(analysis, BaseException):
+                raise analysis
 
             click.echo(f"  📊 Root Cause: {analysis['root_cause']}")
             click.echo(f"  🎯 Severity: {analysis['severity']}")
@@ -214,10 +292,21 @@ def generate_report(test_path: str, output: str):
     """Generate QA analysis report."""
     click.echo("📊 Generating QA report...\n")
 
-    # Run tests
-    result = subprocess.run(
-        ["pytest", test_path, "-v", "--tb=short"], capture_output=True, text=True
-    )
+    # Run tests, keeping only the head of the output the report shows
+    head: list[str] = []
+    head_len = 0
+
+    def keep_head(line: str) -> None:
+        nonlocal head_len
+        if head_len < 1000:
+            head.append(line)
+            head_len += len(line)
+
+    with tempfile.TemporaryFile("w+") as stderr:
+        returncode = _stream_pytest(test_path, keep_head, stderr=stderr)
+        stderr.seek(0)
+        errors = stderr.read(1000)
+    output_text = "".join(head)[:1000]
 
     # Generate report
     output_path = Path(output)
@@ -229,16 +318,16 @@ Generated: {Path.cwd()}
 
 ## Test Results
 
-Exit Code: {result.returncode}
+Exit Code: {returncode}
 
 ### Output
 ```
-{result.stdout[:1000]}
+{output_text}
 ```
 
 ### Errors
 ```
-{result.stderr[:1000]}
+{errors}
 ```
 """
 
@@ -13,6 +13,59 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_SYSTEM_PROMPT = """You are an expert Python/TypeScript engineer specializing in:
+- FastAPI backend debugging
+- SQLAlchemy ORM issues
+- Pytest test failures
+- React/Next.js frontend bugs
+
+Analyze test failures and provide:
+1. Root cause analysis
+2. Severity assessment
+3. Concrete fix suggestions with code
+4. Prevention strategies
+
+Always return valid JSON with the specified structure."""
+
+_ANALYSIS_PROMPT = """
+# Test Failure Analysis Request
+
+## Failed Test
+**Test Name:** {test_name}
+**File:** {file_path}:{line_number}
+
+## Error Details
+**Type:** {error_type}
+**Message:** {error_message}
+
+## Stack Trace
+```
+{stack_trace}
+```
+
+## Test Code
+```python
+{test_code}
+```
+
+## Source Code (under test)
+```python
+{source_code}
+```
+
+## Your Task
+Analyze this failure and provide:
+1. **Root cause** - What exactly is broken?
+2. **Severity** - How critical is this bug? (low/medium/high/critical)
+3. **Fix suggestions** - Step-by-step how to fix (list of strings)
+4. **Code fix** - Actual code patch to apply (complete fixed code)
+5. **Confidence** - How sure are you (0-100)?
+6. **Similar issues** - Related bugs to check (list of strings)
+7. **Prevention tips** - How to avoid this in future (list of strings)
+
+Return as JSON with these exact keys: root_cause, severity, fix_suggestions, code_fix, confidence, similar_issues, prevention_tips
+"""
+
 
 @dataclass
 class TestFailure:
@@ -52,6 +105,7 @@ class AIFailureAnalyzer:
             )
 
         self.client = openai.OpenAI(api_key=api_key)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key)
         self.model = model or os.getenv("QA_AI_MODEL", "gpt-4")
 
     def analyze_failure(self, failure: TestFailure) -> dict[str, Any]:
@@ -70,18 +124,32 @@ class AIFailureAnalyzer:
                 - similar_issues: List[str] - Related bugs to check
                 - prevention_tips: List[str] - How to avoid this in future
         """
-        prompt = self._build_analysis_prompt(failure)
-
         response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
+            **self._completion_kwargs(failure)
+        )
+        return self._parse_response(response)
+
+    async def analyze_failure_async(self, failure: TestFailure) -> dict[str, Any]:
+        """Async variant of :meth:`analyze_failure` using ``async_client``."""
+        response = await self.async_client.chat.completions.create(
+            **self._completion_kwargs(failure)
+        )
+        return self._parse_response(response)
+
+    def _completion_kwargs(self, failure: TestFailure) -> dict[str, Any]:
+        """Build the chat completion request for a failure."""
+        return {
+            "model": self.model,
+            "messages": [
                 {"role": "system", "content": self._get_system_prompt()},
-                {"role": "user", "content": prompt},
+                {"role": "user", "content": self._build_analysis_prompt(failure)},
             ],
-            temperature=0.2,  # Low temperature for precise code analysis
-            response_format={"type": "json_object"},
-        )
+            "temperature": 0.2,  # Low temperature for precise code analysis
+            "response_format": {"type": "json_object"},
+        }
 
+    def _parse_response(self, response: Any) -> dict[str, Any]:
+        """Extract the JSON analysis from a chat completion."""
         content = response.choices[0].message.content
         if content is None:
             raise ValueError("AI response content is None")
@@ -90,57 +158,8 @@ class AIFailureAnalyzer:
 
     def _get_system_prompt(self) -> str:
         """Get the system prompt for the AI analyzer."""
-        return """You are an expert Python/TypeScript engineer specializing in:
-- FastAPI backend debugging
-- SQLAlchemy ORM issues
-- Pytest test failures
-- React/Next.js frontend bugs
-
-Analyze test failures and provide:
-1. Root cause analysis
-2. Severity assessment
-3. Concrete fix suggestions with code
-4. Prevention strategies
-
-Always return valid JSON with the specified structure."""
+        return _SYSTEM_PROMPT
 
     def _build_analysis_prompt(self, failure: TestFailure) -> str:
         """Build the analysis prompt for the AI."""
-        return f"""
-# Test Failure Analysis Request
-
-## Failed Test
-**Test Name:** {failure.test_name}
-**File:** {failure.file_path}:{failure.line_number}
-
-## Error Details
-**Type:** {failure.error_type}
-**Message:** {failure.error_message}
-
-## Stack Trace
-```
-{failure.stack_trace}
-```
-
-## Test Code
-```python
-{failure.test_code}
-```
-
-## Source Code (under test)
-```python
-{failure.source_code}
-```
-
-## Your Task
-Analyze this failure and provide:
-1. **Root cause** - What exactly is broken?
-2. **Severity** - How critical is this bug? (low/medium/high/critical)
-3. **Fix suggestions** - Step-by-step how to fix (list of strings)
-4. **Code fix** - Actual code patch to apply (complete fixed code)
-5. **Confidence** - How sure are you (0-100)?
-6. **Similar issues** - Related bugs to check (list of strings)
-7. **Prevention tips** - How to avoid this in future (list of strings)
-
-Return as JSON with these exact keys: root_cause, severity, fix_suggestions, code_fix, confidence, similar_issues, prevention_tips
-"""
+        return _ANALYSIS_PROMPT.format_map(vars(failure))
@@ -11,6 +11,47 @@ from .failure_analyzer import TestFailure
 logger = logging.getLogger(__name__)
 
 
+class PytestLineParser:
+    """Incremental form of :func:`parse_pytest_output`.
+
+    Feed pytest output line by line while the run is still going. Sections
+    are delimited by ``"FAILED "`` exactly as in the batch parser, so a
+    failure is returned once the next delimiter (or :meth:`close`) ends its
+    section.
+    """
+
+    def __init__(self) -> None:
+        self._section: list[str] | None = None
+
+    def feed(self, line: str) -> list[TestFailure]:
+        """Consume one line; return the failures whose sections it completed."""
+        pieces = line.split("FAILED ")
+        if self._section is not None:
+            self._section.append(pieces[0])
+
+        completed = []
+        for piece in pieces[1:]:
+            completed.extend(self._finish_section())
+            self._section = [piece]
+        return completed
+
+    def close(self) -> list[TestFailure]:
+        """End the output; return the failure in the last open section."""
+        return self._finish_section()
+
+    def _finish_section(self) -> list[TestFailure]:
+        if self._section is None:  # Skip the text before the first FAILED
+            return []
+        section = "".join(self._section)
+        self._section = None
+        try:
+            failure = _parse_failure_section(section)
+        except Exception as e:
+            logger.warning(f"Failed to parse failure section: {e}")
+            return []
+        return [failure] if failure else []
+
+
 def parse_pytest_output(output: str) -> list[TestFailure]:
     """Parse pytest output and extract test failures.
 
@@ -20,20 +61,11 @@ def parse_pytest_output(output: str) -> list[TestFailure]:
     Returns:
         List of TestFailure objects.
     """
+    parser = PytestLineParser()
     failures = []
-
-    # Split output into sections
-    sections = output.split("FAILED ")
-
-    for section in sections[1:]:  # Skip the first section (before first FAILED)
-        try:
-            failure = _parse_failure_section(section)
-            if failure:
-                failures.append(failure)
-        except Exception as e:
-            logger.warning(f"Failed to parse failure section: {e}")
-            continue
-
+    for line in output.splitlines(keepends=True):
+        failures.extend(parser.feed(line))
+    failures.extend(parser.close())
     return failures
 
 
@@ -15,7 +15,7 @@ from typing import Any
 
 import numpy as np
 import structlog
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.models.cooperative import Cooperative
@@ -49,14 +49,17 @@ def _existing_unacknowledged(
     field_name: str | None,
 ) -> bool:
     """Return True if an unacknowledged anomaly alert already exists."""
-    stmt = select(QualityAlert).where(
-        QualityAlert.entity_type == entity_type,
-        QualityAlert.entity_id == entity_id,
-        QualityAlert.alert_type == alert_type,
-        QualityAlert.acknowledged.is_(False),
+    stmt = lambda_stmt(
+        lambda: select(QualityAlert.id).where(
+            QualityAlert.entity_type == entity_type,
+            QualityAlert.entity_id == entity_id,
+            QualityAlert.alert_type == alert_type,
+            QualityAlert.acknowledged.is_(False),
+        )
     )
     if field_name is not None:
-        stmt = stmt.where(QualityAlert.field_name == field_name)
+        stmt += lambda s: s.where(QualityAlert.field_name == field_name)
+    stmt += lambda s: s.limit(1)
     return db.execute(stmt).first() is not None
 
 
@@ -9,7 +9,8 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional
 
 import structlog
-from sqlalchemy.orm import Session
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session, joinedload
 
 log = structlog.get_logger()
 
@@ -24,23 +25,6 @@ class DataFreshnessMonitor:
             db: Database session
         """
         self.db = db
-        self._source_name_cache: dict[int, str] = {}
-
-    def _resolve_source_name(self, source_id: int | None) -> str | None:
-        """Resolve source display name for a source id."""
-        if source_id is None:
-            return None
-        if source_id in self._source_name_cache:
-            return self._source_name_cache[source_id]
-
-        from app.models.source import Source
-
-        source = self.db.query(Source).filter(Source.id == source_id).first()
-        if not source:
-            return None
-
-        self._source_name_cache[source_id] = source.name
-        return source.name
 
     def _get_latest_observation(self, key: str) -> Optional[dict]:
         """Get latest observation for a key.
@@ -53,16 +37,20 @@ class DataFreshnessMonitor:
         """
         from app.models.market import MarketObservation
 
-        obs = (
-            self.db.query(MarketObservation)
-            .filter(MarketObservation.key == key)
-            .order_by(
-                MarketObservation.source_id.is_(None),
-                MarketObservation.observed_at.desc(),
-                MarketObservation.id.desc(),
+        stmt = lambda_stmt(
+            lambda: (
+                select(MarketObservation)
+                .options(joinedload(MarketObservation.source))
+                .where(MarketObservation.key == key)
+                .order_by(
+                    MarketObservation.source_id.is_(None),
+                    MarketObservation.observed_at.desc(),
+                    MarketObservation.id.desc(),
+                )
+                .limit(1)
             )
-            .first()
         )
+        obs = self.db.execute(stmt).scalars().first()
 
         if not obs:
             return None
@@ -78,7 +66,7 @@ class DataFreshnessMonitor:
             "last_updated": observed_at.isoformat(),
             "age_hours": round(age_hours, 2),
             "value": obs.value,
-            "source": self._resolve_source_name(obs.source_id),
+            "source": obs.source.name if obs.source else None,
         }
 
     def _check_staleness(self, data: Optional[dict], max_age_hours: float) -> dict:
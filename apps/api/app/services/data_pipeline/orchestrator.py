@@ -18,7 +18,7 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.providers.coffee_prices import fetch_coffee_price
 from app.providers.fx_rates import fetch_fx_rate
-from app.providers.peru_intel import fetch_openmeteo_weather
+from app.providers.peru_intel import fetch_all_peru_weather
 from app.models.freight_history import FreightHistory
 from app.services.data_pipeline.circuit_breaker import CircuitBreaker
 from app.services.market_ingest import upsert_market_observation
@@ -178,20 +178,19 @@ class DataPipelineOrchestrator:
         if not breaker.can_attempt(force_probe=force_probe):
             return {"success": False, "regions": []}
 
-        regions = [
-            "Cajamarca",
-            "Junín",
-            "San Martín",
-            "Cusco",
-            "Amazonas",
-            "Puno",
-        ]
         ingested = []
         errors = []
 
-        for region in regions:
+        # All regions are requested concurrently
+        try:
+            weather_by_region = fetch_all_peru_weather()
+        except Exception as e:
+            breaker.record_failure()
+            log.warning("peru_weather_fetch_error", error=str(e))
+            return {"success": False, "regions": [], "errors": [str(e)]}
+
+        for region, weather in weather_by_region.items():
             try:
-                weather = fetch_openmeteo_weather(region)
                 if weather:
                     key = f"WEATHER:PERU_{_normalize_market_key_fragment(region)}"
                     upsert_market_observation(
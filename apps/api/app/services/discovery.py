@@ -14,12 +14,16 @@ from app.models.cooperative import Cooperative
 from app.models.evidence import EntityEvidence
 from app.models.roaster import Roaster
 from app.models.source import Source
-from app.providers.perplexity import PerplexityClient, PerplexityError, safe_json_loads
+from app.providers.perplexity import (
+    PerplexityClient,
+    PerplexityError,
+    StructuredOutputError,
+)
 from app.providers.tavily_search import TavilyClient, TavilyError
 from app.services.country_config import get_country_config
 
 
-def _cooperative_response_format() -> dict[str, Any]:
+def _cooperative_schema() -> dict[str, Any]:
     schema: dict[str, Any] = {
         "type": "object",
         "properties": {
@@ -115,10 +119,10 @@ def _cooperative_response_format() -> dict[str, Any]:
         "required": ["entities"],
         "additionalProperties": False,
     }
-    return {"type": "json_schema", "json_schema": {"schema": schema}}
+    return schema
 
 
-def _roaster_response_format() -> dict[str, Any]:
+def _roaster_schema() -> dict[str, Any]:
     schema: dict[str, Any] = {
         "type": "object",
         "properties": {
@@ -188,7 +192,7 @@ def _roaster_response_format() -> dict[str, Any]:
         "required": ["entities"],
         "additionalProperties": False,
     }
-    return {"type": "json_schema", "json_schema": {"schema": schema}}
+    return schema
 
 
 def _merge_json(existing: dict | None, new: dict) -> dict:
@@ -209,21 +213,18 @@ def _repair_json_with_llm(
         "Wenn Inhalte fehlen oder abgeschnitten sind, entferne die kaputten Teile statt zu raten. "
         "Output MUSS strikt parsebar sein und genau ein JSON-Objekt enthalten."
     )
-    response_format = (
-        _cooperative_response_format()
-        if entity_type == "cooperative"
-        else _roaster_response_format()
+    schema = (
+        _cooperative_schema() if entity_type == "cooperative" else _roaster_schema()
     )
-    content = client.chat_completions(
-        messages=[
+    data = client.chat_completions_json(
+        [
             {"role": "system", "content": system},
             {"role": "user", "content": raw[:12000]},
         ],
+        schema,
         temperature=0.0,
         max_tokens=3500,
-        response_format=response_format,
     )
-    data = safe_json_loads(content)
     if not isinstance(data, dict):
         raise ValueError("JSON repair returned non-object")
     return data
@@ -429,24 +430,23 @@ def _extract_entities_with_llm(
         )
 
     user = {"entity_type": entity_type, "results": search_results}
-    response_format = (
-        _cooperative_response_format()
-        if entity_type == "cooperative"
-        else _roaster_response_format()
-    )
-    content = client.chat_completions(
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": json.dumps(user, ensure_ascii=False)},
-        ],
-        temperature=0.0,
-        max_tokens=4000,
-        response_format=response_format,
+    schema = (
+        _cooperative_schema() if entity_type == "cooperative" else _roaster_schema()
     )
     try:
-        data = safe_json_loads(content)
-    except Exception:
-        data = _repair_json_with_llm(client, content, entity_type)
+        data = client.chat_completions_json(
+            [
+                {"role": "system", "content": system},
+                {"role": "user", "content": json.dumps(user, ensure_ascii=False)},
+            ],
+            schema,
+            temperature=0.0,
+            max_tokens=4000,
+        )
+    except StructuredOutputError as exc:
+        data = _repair_json_with_llm(client, exc.content, entity_type)
+    if not isinstance(data, dict):
+        return []
 
     ents = data.get("entities") or []
     if not isinstance(ents, list):
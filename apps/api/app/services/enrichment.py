@@ -18,7 +18,7 @@ from app.models.cooperative import Cooperative
 from app.models.roaster import Roaster
 from app.models.web_extract import WebExtract
 from app.models.entity_event import EntityEvent
-from app.providers.perplexity import PerplexityClient, safe_json_loads
+from app.providers.perplexity import PerplexityClient
 
 
 def _clean_text(txt: str) -> str:
@@ -728,16 +728,15 @@ def _extract_structured_with_llm(
             "NICHTS auslassen was verfügbar ist. Gib NUR valides JSON zurück (kein Markdown). "
             "Nichts erfinden. Unbekannt => null. Wenn der Text nicht passt: alles null."
         )
-    content = client.chat_completions(
-        messages=[
+    data = client.chat_completions_json(
+        [
             {"role": "system", "content": system},
             {"role": "user", "content": text[:12000]},
         ],
+        schema,
         temperature=0.0,
         max_tokens=2500,
-        response_format={"type": "json_schema", "json_schema": {"schema": schema}},
     )
-    data = safe_json_loads(content)
     return data if isinstance(data, dict) else {}
 
 
@@ -747,6 +746,25 @@ def _load_entity(db: Session, entity_type: str, entity_id: int) -> Cooperative |
     return db.get(Roaster, entity_id)
 
 
+def _unchanged_extraction(
+    db: Session,
+    *,
+    entity_type: str,
+    entity_id: int,
+    url: str,
+    content_hash: str,
+) -> dict[str, Any] | None:
+    """Return the stored LLM extraction if the page content has not changed."""
+    return db.scalar(
+        select(WebExtract.extracted_json).where(
+            WebExtract.entity_type == entity_type,
+            WebExtract.entity_id == entity_id,
+            WebExtract.url == url,
+            WebExtract.content_hash == content_hash,
+        )
+    )
+
+
 def _persist_web_extract(
     db: Session,
     *,
@@ -893,13 +911,24 @@ def enrich_entity(
 
         extracted: dict[str, Any] = {}
         if use_llm and settings.PERPLEXITY_API_KEY:
-            client = PerplexityClient()
-            try:
-                extracted = _extract_structured_with_llm(
-                    client, entity_type=entity_type, text=text
-                )
-            finally:
-                client.close()
+            # Same page text as last time: reuse its extraction, skip the LLM call.
+            previous = _unchanged_extraction(
+                db,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                url=final_url,
+                content_hash=chash,
+            )
+            if previous:
+                extracted = previous
+            else:
+                client = PerplexityClient()
+                try:
+                    extracted = _extract_structured_with_llm(
+                        client, entity_type=entity_type, text=text
+                    )
+                finally:
+                    client.close()
 
         we = _persist_web_extract(
             db,
@@ -3,6 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.models.market import MarketObservation
@@ -51,14 +53,31 @@ def upsert_market_observation(
 ) -> MarketObservation:
     """Idempotent write for market data.
 
-    With the unique constraint (key, observed_at, source_id) this becomes a
-    true UPSERT. We still do a read-first approach for portability.
+    On Postgres, observations with a source are written with a single
+    INSERT ... ON CONFLICT against the (key, observed_at, source_id) unique
+    constraint. Without a source the constraint cannot match (NULLs are
+    distinct), so that case and other dialects use a read-first approach.
     """
     src_id: Optional[int] = None
     if source_name:
         src = get_or_create_source(db, source_name, url=source_url, kind="web")
         src_id = src.id
 
+    if src_id is not None and db.get_bind().dialect.name == "postgresql":
+        stmt = _upsert_statement(
+            key=key,
+            value=value,
+            unit=unit,
+            currency=currency,
+            observed_at=observed_at,
+            source_id=src_id,
+            raw_text=raw_text,
+            meta=meta,
+        )
+        obs = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+        db.commit()
+        return obs
+
     q = db.query(MarketObservation).filter(
         MarketObservation.key == key,
         MarketObservation.observed_at == observed_at,
@@ -95,3 +114,25 @@ def upsert_market_observation(
     db.commit()
     db.refresh(obs)
     return obs
+
+
+def _upsert_statement(*, raw_text: Optional[str], meta: Optional[dict], **values):
+    """INSERT ... ON CONFLICT DO UPDATE returning the stored observation.
+
+    Mirrors the read-first path: raw_text and meta only overwrite stored
+    values when given.
+    """
+    stmt = pg_insert(MarketObservation).values(**values, raw_text=raw_text, meta=meta)
+    update = {
+        "value": stmt.excluded.value,
+        "unit": stmt.excluded.unit,
+        "currency": stmt.excluded.currency,
+        "updated_at": func.now(),
+    }
+    if raw_text is not None:
+        update["raw_text"] = stmt.excluded.raw_text
+    if meta is not None:
+        update["meta"] = stmt.excluded.meta
+    return stmt.on_conflict_do_update(
+        index_elements=["key", "observed_at", "source_id"], set_=update
+    ).returning(MarketObservation)
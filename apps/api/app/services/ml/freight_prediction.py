@@ -96,7 +96,7 @@ class FreightPredictionService:
         )
 
         try:
-            X, _ = self.model.prepare_features(input_data)
+            X = self.model.prepare_matrix(input_data)
             predictions, lower, upper = self.model.predict_with_confidence(X)
 
             predicted_cost = float(predictions[0])
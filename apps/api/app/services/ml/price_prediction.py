@@ -90,7 +90,7 @@ class CoffeePricePredictionService:
         )
 
         try:
-            X, _ = self.model.prepare_features(input_data)
+            X = self.model.prepare_matrix(input_data)
             predictions, lower, upper = self.model.predict_with_confidence(X)
 
             predicted_price = float(predictions[0])
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional, Tuple
 
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.models.cooperative import Cooperative
@@ -37,12 +38,15 @@ def _map_sca_to_score(sca: float) -> float:
 
 
 def _get_latest_observation(db: Session, key: str) -> Optional[MarketObservation]:
-    return (
-        db.query(MarketObservation)
-        .filter(MarketObservation.key == key)
-        .order_by(MarketObservation.observed_at.desc())
-        .first()
+    stmt = lambda_stmt(
+        lambda: (
+            select(MarketObservation)
+            .where(MarketObservation.key == key)
+            .order_by(MarketObservation.observed_at.desc())
+            .limit(1)
+        )
     )
+    return db.execute(stmt).scalars().first()
 
 
 def _compute_quality(coop: Cooperative, meta: dict, reasons: list[str]) -> Optional[float]:
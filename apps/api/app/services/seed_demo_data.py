@@ -522,11 +522,8 @@ def seed_demo_cooperatives(db: Session) -> dict[str, Any]:
             "existing_count": count,
         }
 
-    created = 0
-    for coop_data in DEMO_COOPERATIVES:
-        coop = Cooperative(**coop_data)
-        db.add(coop)
-        created += 1
+    db.add_all([Cooperative(**coop_data) for coop_data in DEMO_COOPERATIVES])
+    created = len(DEMO_COOPERATIVES)
 
     db.commit()
 
@@ -556,11 +553,8 @@ def seed_demo_roasters(db: Session) -> dict[str, Any]:
             "existing_count": count,
         }
 
-    created = 0
-    for roaster_data in DEMO_ROASTERS:
-        roaster = Roaster(**roaster_data)
-        db.add(roaster)
-        created += 1
+    db.add_all([Roaster(**roaster_data) for roaster_data in DEMO_ROASTERS])
+    created = len(DEMO_ROASTERS)
 
     db.commit()
 
@@ -585,10 +579,16 @@ def seed_demo_market_data(db: Session) -> dict[str, Any]:
     updated = 0
     now = datetime.now(timezone.utc)
 
+    # Fetch existing observations for all demo keys in a single query
+    stmt = select(MarketObservation).where(
+        MarketObservation.key.in_([o["key"] for o in DEMO_MARKET_OBSERVATIONS])
+    )
+    by_key: dict[str, MarketObservation] = {}
+    for obs in db.scalars(stmt):
+        by_key.setdefault(obs.key, obs)
+
     for obs_data in DEMO_MARKET_OBSERVATIONS:
-        # Check if observation with this key already exists
-        stmt = select(MarketObservation).where(MarketObservation.key == obs_data["key"])
-        existing = db.scalar(stmt)
+        existing = by_key.get(cast(str, obs_data["key"]))
 
         if existing:
             # Update if data is older than 24 hours
@@ -183,12 +183,17 @@ def seed_peru_regions(db: Session) -> dict[str, Any]:
     created = 0
     updated = 0
 
+    # Load all candidate regions in one query instead of one lookup per region
+    stmt = select(Region).where(
+        Region.name.in_([r["name"] for r in PERU_REGIONS_DATA]),
+        Region.country.in_({r["country"] for r in PERU_REGIONS_DATA}),
+    )
+    existing: dict[tuple[str, str], Region] = {}
+    for region in db.scalars(stmt):
+        existing.setdefault((region.name, region.country), region)
+
     for region_data in PERU_REGIONS_DATA:
-        # Check if region exists
-        stmt = select(Region).where(
-            Region.name == region_data["name"], Region.country == region_data["country"]
-        )
-        region = db.scalar(stmt)
+        region = existing.get((region_data["name"], region_data["country"]))
 
         if region:
             # Update existing region
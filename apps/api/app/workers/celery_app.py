@@ -117,6 +117,12 @@ def _build_schedule() -> dict:
                 exc,
             )
 
+    # Monthly partitions are created ahead of time; the task is idempotent
+    sched["ensure_partitions"] = {
+        "task": "app.workers.tasks.ensure_partitions",
+        "schedule": crontab(minute=30, hour=1),
+    }
+
     return sched
 
 
@@ -322,6 +322,23 @@ def run_anomaly_scan():
         db.close()
 
 
+@celery.task(name="app.workers.tasks.ensure_partitions")
+def ensure_partitions(months_ahead: int = 3):
+    """Create upcoming monthly partitions for partitioned time-series tables."""
+    from app.db.partitions import PARTITIONED_TABLES, ensure_monthly_partitions
+
+    db = _db()
+    try:
+        created = {
+            table: ensure_monthly_partitions(db, table, months_ahead=months_ahead)
+            for table in PARTITIONED_TABLES
+        }
+        log.info("ensure_partitions_done", created=created)
+        return {"status": "ok", "created": created}
+    finally:
+        db.close()
+
+
 @celery.task(name="app.workers.tasks.auto_outreach_follow_up")
 def auto_outreach_follow_up(entity_type: str, days_threshold: int = 7):
     """Follow up on outreach campaigns for entities that haven't responded.
@@ -1,4 +1,5 @@
 import os
+import orjson
 import pytest
 from datetime import datetime, timezone
 from fastapi.testclient import TestClient
@@ -33,7 +34,7 @@ os.environ.setdefault("CELERY_RESULT_BACKEND", "cache+memory://")
 
 
 # Import after env vars are set
-from app.db.session import get_db, Base
+from app.db.session import get_db, Base, json_serializer
 from app.main import app
 from app.models.user import User
 from app.core.security import hash_password, create_access_token
@@ -44,6 +45,8 @@ engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -67,6 +70,16 @@ def receive_before_update(mapper, connection, target):
         target.updated_at = datetime.now(timezone.utc)
 
 
+@pytest.fixture(autouse=True)
+def _reset_provider_breakers():
+    """Close provider circuits so failures in one test do not skip calls in the next."""
+    from app.providers.circuit import reset_breakers
+
+    reset_breakers()
+    yield
+    reset_breakers()
+
+
 @pytest.fixture(scope="function")
 def db():
     """Create a fresh database for each test.
@@ -114,6 +127,8 @@ def client(db):
         except AttributeError:
             # Optional limiter storage not available in this test context.
             pass
+    if hasattr(app.state, "rate_limiter"):
+        app.state.rate_limiter.reset()
 
     # Also clear the auth-module rate limiter to prevent cross-test contamination
     try:
@@ -77,6 +77,39 @@ def test_apply_fix_creates_backup(temp_repo):
     assert test_file.read_text() == fixed_code
 
 
+def test_backup_preserves_bytes(temp_repo):
+    """Test that backups are byte-for-byte copies (line endings included)."""
+    fixer = AutoFixer(repo_root=temp_repo)
+    crlf_file = temp_repo / "crlf_file.py"
+    crlf_file.write_bytes(b"x = 1\r\ny = 2\r\n")
+
+    backup_path = fixer._backup_file(crlf_file)
+
+    assert backup_path.read_bytes() == b"x = 1\r\ny = 2\r\n"
+
+
+def test_rollback_finds_original_through_index(temp_repo):
+    """Test rollback locates files via the cached file-name index."""
+    module = temp_repo / "apps/api/app/module.py"
+    module.parent.mkdir(parents=True)
+    module.write_text("x = 1\n")
+    fixer = AutoFixer(repo_root=temp_repo)
+
+    result = fixer.apply_fix(
+        file_path="apps/api/app/module.py", fix_code="x = 2\n", dry_run=False
+    )
+    assert fixer.rollback(result["backup_path"]) is True
+    assert module.read_text() == "x = 1\n"
+
+    index = fixer._file_index
+    assert index is not None and index["module.py"] == module
+    assert fixer._find_original_file("module.py") == module
+    assert fixer._file_index is index
+
+    fixer.invalidate_index()
+    assert fixer._file_index is None
+
+
 def test_apply_fix_invalid_syntax(temp_repo):
     """Test applying a fix with invalid Python syntax."""
     fixer = AutoFixer(repo_root=temp_repo)
@@ -115,3 +148,20 @@ def test_generate_diff(temp_repo):
     assert "@@" in diff  # Unified diff marker
     assert "-    return 42" in diff
     assert "+    return 43" in diff
+
+
+def test_apply_fix_diff_does_not_reread_backup(temp_repo, monkeypatch):
+    """Test the post-apply diff uses the content read before writing."""
+    fixer = AutoFixer(repo_root=temp_repo)
+    monkeypatch.setattr(
+        fixer, "_backup_file", lambda path: fixer.backup_dir / "missing.backup"
+    )
+
+    result = fixer.apply_fix(
+        file_path="test_file.py",
+        fix_code="def test_function():\n    return 43\n",
+        dry_run=False,
+    )
+
+    assert result["applied"] is True
+    assert "-    return 42" in result["changes"]
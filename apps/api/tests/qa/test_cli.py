@@ -0,0 +1,46 @@
+"""Tests for the QA CLI failure analysis pipeline."""
+
+import asyncio
+from collections import deque
+from unittest.mock import patch
+
+from app.qa import cli
+
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def analyze_failure_async(self, failure):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if failure.test_name == "test_2":
+            raise RuntimeError("api down")
+        return {"root_cause": failure.test_name}
+
+
+def fake_stream_pytest(test_path, on_line, stderr=None):
+    for i in range(8):
+        on_line(f"FAILED tests/test_a.py::test_{i} - boom\n")
+    return 1
+
+
+def test_test_and_analyze_fans_out_with_bounded_concurrency():
+    analyzer = FakeAnalyzer()
+    tail = deque(maxlen=3)
+
+    with patch("app.qa.cli._stream_pytest", fake_stream_pytest):
+        returncode, failures, analyses = asyncio.run(
+            cli._test_and_analyze("tests", analyzer, max_fixes=6, tail=tail)
+        )
+
+    assert returncode == 1
+    assert [f.test_name for f in failures] == [f"test_{i}" for i in range(8)]
+    assert len(analyses) == 6
+    assert analyses[0] == {"root_cause": "test_0"}
+    assert isinstance(analyses[2], RuntimeError)
+    assert analyzer.peak == cli.ANALYSIS_CONCURRENCY
+    assert len(tail) == 3
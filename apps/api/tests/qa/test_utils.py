@@ -4,7 +4,7 @@ from pathlib import Path
 import tempfile
 
 from app.qa.failure_analyzer import TestFailure
-from app.qa.utils import parse_pytest_output, _read_file_section
+from app.qa.utils import PytestLineParser, parse_pytest_output, _read_file_section
 
 
 def test_test_failure_dataclass():
@@ -54,6 +54,20 @@ FAILED tests/test_example.py::test_subtraction - ValueError: Invalid operation
     assert len(failures) == 2
 
 
+def test_pytest_line_parser_streams_failures():
+    """Test failures are emitted as soon as their section is complete."""
+    parser = PytestLineParser()
+
+    assert parser.feed("collected 2 items\n") == []
+    assert parser.feed("FAILED tests/test_a.py::test_one - ValueError: x\n") == []
+
+    completed = parser.feed("FAILED tests/test_a.py::test_two - KeyError: y\n")
+    assert [f.test_name for f in completed] == ["test_one"]
+
+    assert [f.test_name for f in parser.close()] == ["test_two"]
+    assert parser.close() == []
+
+
 def test_read_file_section_nonexistent():
     """Test reading from a non-existent file."""
     result = _read_file_section("nonexistent.py", "test_function")
@@ -1,8 +1,15 @@
 """Tests for coffee prices provider."""
 
+import asyncio
+import time
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone
 
+import httpx
+import orjson
+import pytest
+
+from app.providers import stooq
 from app.providers.coffee_prices import (
     fetch_yahoo_finance_coffee,
     fetch_stooq_coffee,
@@ -12,6 +19,13 @@ from app.providers.coffee_prices import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_stooq_cache():
+    stooq._csv_cache.clear()
+    yield
+    stooq._csv_cache.clear()
+
+
 def test_coffee_quote_dataclass():
     """Test CoffeeQuote dataclass creation."""
     quote = CoffeeQuote(
@@ -19,7 +33,7 @@ def test_coffee_quote_dataclass():
         observed_at=datetime.now(timezone.utc),
         source_name="Test",
         source_url="https://test.com",
-        raw_data="{}",
+        raw_bytes=b"{}",
         metadata={"test": True},
     )
 
@@ -57,7 +71,8 @@ def test_fetch_yahoo_finance_coffee_success():
 
     with patch("app.providers.coffee_prices.httpx.get") as mock_get:
         mock_response = MagicMock()
-        mock_response.json.return_value = mock_response_data
+        mock_response.content = orjson.dumps(mock_response_data)
+        mock_response.text = mock_response.content.decode()
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
@@ -83,7 +98,7 @@ def test_fetch_yahoo_finance_coffee_no_data():
     """Test Yahoo Finance fetch with empty results."""
     with patch("app.providers.coffee_prices.httpx.get") as mock_get:
         mock_response = MagicMock()
-        mock_response.json.return_value = {"chart": {"result": []}}
+        mock_response.content = b'{"chart": {"result": []}}'
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
@@ -112,6 +127,110 @@ def test_fetch_stooq_coffee_with_mock():
         assert quote.source_name == "Stooq"
 
 
+def test_fetch_stooq_last_close_uses_pooled_client():
+    """Stooq requests reuse the shared client unless one is injected."""
+    from app.providers.stooq import fetch_stooq_last_close
+
+    csv_text = "Date,Open,High,Low,Close,Volume\n2024-01-02,1,1,1,2.31,100\n"
+    with patch("app.providers.stooq.get_client") as mock_client:
+        mock_client.return_value.get.return_value.text = csv_text
+        quote = fetch_stooq_last_close("KC.F")
+
+    assert quote is not None
+    assert quote.close == 2.31
+    assert mock_client.return_value.get.call_count == 1
+
+    injected = MagicMock()
+    injected.get.return_value.text = csv_text
+    with patch("app.providers.stooq.get_client") as mock_client:
+        assert fetch_stooq_last_close("kc.f", client=injected) is not None
+    mock_client.assert_not_called()
+    injected.get.assert_called_once()
+
+
+def test_fetch_stooq_last_close_revalidates_with_etag():
+    csv_text = "Date,Open,High,Low,Close,Volume\n2024-01-02,1,1,1,2.31,100\n"
+    request = httpx.Request("GET", "https://stooq.com/q/d/l/?s=kc.f&i=d")
+    responses = [
+        httpx.Response(200, text=csv_text, headers={"ETag": '"v1"'}, request=request),
+        httpx.Response(304, request=request),
+    ]
+    client = MagicMock()
+    client.get.side_effect = responses
+
+    first = stooq.fetch_stooq_last_close("kc.f", client=client)
+    second = stooq.fetch_stooq_last_close("kc.f", client=client)
+
+    assert second is first
+    assert client.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+
+def test_fetch_stooq_last_close_honors_max_age():
+    csv_text = "Date,Open,High,Low,Close,Volume\n2024-01-02,1,1,1,2.31,100\n"
+    request = httpx.Request("GET", "https://stooq.com/q/d/l/?s=kc.f&i=d")
+    client = MagicMock()
+    client.get.return_value = httpx.Response(
+        200,
+        text=csv_text,
+        headers={"Cache-Control": "public, max-age=300"},
+        request=request,
+    )
+
+    first = stooq.fetch_stooq_last_close("kc.f", client=client)
+    second = stooq.fetch_stooq_last_close("kc.f", client=client)
+
+    assert second is first
+    assert client.get.call_count == 1
+
+
+def test_parse_stooq_last_row_reads_tail_line():
+    text = (
+        "Date,Open,High,Low,Close,Volume\r\n"
+        "2024-01-01,2.0,2.1,1.9,2.05,100\r\n"
+        "2024-01-02,2.05,2.4,2.0,2.31,120\r\n\r\n"
+    )
+    assert stooq._parse_stooq_last_row(text) == ("2024-01-02", "2.31")
+    assert stooq._parse_stooq_last_row("Date,Open,High,Low,Close,Volume\n") is None
+    assert stooq._parse_stooq_last_row("No data") is None
+
+
+def test_parse_stooq_last_row_falls_back_for_other_headers():
+    text = "Date,Close\n2024-01-01,2.05\n2024-01-02,2.31\n"
+    assert stooq._parse_stooq_last_row(text) == ("2024-01-02", "2.31")
+
+
+def test_fetch_stooq_last_close_many_bounds_concurrency():
+    from app.providers.stooq import OhlcQuote, fetch_stooq_last_close_many
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_fetch(client, symbol):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        if symbol == "bad":
+            return None
+        return OhlcQuote(
+            symbol=symbol,
+            close=1.0,
+            observed_at=datetime.now(timezone.utc),
+            source_url="https://stooq.com/",
+            raw_text="",
+        )
+
+    symbols = [f"s{i}" for i in range(10)] + ["bad", "s0"]
+    with patch("app.providers.stooq.fetch_stooq_last_close_async", fake_fetch):
+        quotes = fetch_stooq_last_close_many(symbols, concurrency=3)
+
+    assert list(quotes) == symbols[:-1]
+    assert quotes["bad"] is None
+    assert quotes["s9"].symbol == "s9"
+    assert peak == 3
+
+
 def test_fetch_stooq_coffee_failure():
     """Test Stooq coffee fetch when provider fails."""
     with patch("app.providers.coffee_prices.fetch_stooq_last_close") as mock_stooq:
@@ -123,9 +242,13 @@ def test_fetch_stooq_coffee_failure():
 
 
 def test_fetch_coffee_price_fallback_chain():
-    """Test coffee price fetch tries all sources in order."""
-    with patch("app.providers.coffee_prices.fetch_yahoo_finance_coffee") as mock_yahoo:
-        with patch("app.providers.coffee_prices.fetch_stooq_coffee") as mock_stooq:
+    """Test coffee price fetch queries both live sources."""
+    with patch(
+        "app.providers.coffee_prices.fetch_yahoo_finance_coffee_async"
+    ) as mock_yahoo:
+        with patch(
+            "app.providers.coffee_prices.fetch_stooq_coffee_async"
+        ) as mock_stooq:
             # Yahoo fails, Stooq succeeds
             mock_yahoo.return_value = None
             mock_stooq.return_value = CoffeeQuote(
@@ -133,7 +256,7 @@ def test_fetch_coffee_price_fallback_chain():
                 observed_at=datetime.now(timezone.utc),
                 source_name="Stooq",
                 source_url="https://test.com",
-                raw_data="{}",
+                raw_bytes=b"{}",
                 metadata={},
             )
 
@@ -141,14 +264,18 @@ def test_fetch_coffee_price_fallback_chain():
 
             assert quote is not None
             assert quote.source_name == "Stooq"
-            mock_yahoo.assert_called_once()
-            mock_stooq.assert_called_once()
+            mock_yahoo.assert_awaited_once()
+            mock_stooq.assert_awaited_once()
 
 
 def test_fetch_coffee_price_all_sources_fail_with_fallback():
     """Test coffee price fetch when all sources fail but fallback enabled."""
-    with patch("app.providers.coffee_prices.fetch_yahoo_finance_coffee") as mock_yahoo:
-        with patch("app.providers.coffee_prices.fetch_stooq_coffee") as mock_stooq:
+    with patch(
+        "app.providers.coffee_prices.fetch_yahoo_finance_coffee_async"
+    ) as mock_yahoo:
+        with patch(
+            "app.providers.coffee_prices.fetch_stooq_coffee_async"
+        ) as mock_stooq:
             mock_yahoo.return_value = None
             mock_stooq.return_value = None
 
@@ -161,11 +288,43 @@ def test_fetch_coffee_price_all_sources_fail_with_fallback():
 
 def test_fetch_coffee_price_all_sources_fail_no_fallback():
     """Test coffee price fetch when all sources fail and no fallback."""
-    with patch("app.providers.coffee_prices.fetch_yahoo_finance_coffee") as mock_yahoo:
-        with patch("app.providers.coffee_prices.fetch_stooq_coffee") as mock_stooq:
+    with patch(
+        "app.providers.coffee_prices.fetch_yahoo_finance_coffee_async"
+    ) as mock_yahoo:
+        with patch(
+            "app.providers.coffee_prices.fetch_stooq_coffee_async"
+        ) as mock_stooq:
             mock_yahoo.return_value = None
             mock_stooq.return_value = None
 
             quote = fetch_coffee_price(use_fallback=False)
 
             assert quote is None
+
+
+def test_fetch_coffee_price_slow_source_does_not_block():
+    """The first successful source wins; the slower request is cancelled."""
+    stooq_quote = CoffeeQuote(
+        price_usd_per_lb=205.0,
+        observed_at=datetime.now(timezone.utc),
+        source_name="Stooq",
+        source_url="https://test.com",
+        raw_bytes=b"{}",
+        metadata={},
+    )
+
+    async def slow_yahoo(client):
+        await asyncio.sleep(30)
+
+    async def fast_stooq(client):
+        return stooq_quote
+
+    with patch(
+        "app.providers.coffee_prices.fetch_yahoo_finance_coffee_async", slow_yahoo
+    ):
+        with patch("app.providers.coffee_prices.fetch_stooq_coffee_async", fast_stooq):
+            started = time.monotonic()
+            quote = fetch_coffee_price(use_fallback=False)
+
+    assert quote is stooq_quote
+    assert time.monotonic() - started < 5
@@ -0,0 +1,31 @@
+"""Tests for the JSON column codec on the database engine."""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.db.session import json_serializer
+from app.models.report import Report
+
+
+def test_json_serializer_matches_stdlib_for_int_keys():
+    assert json_serializer({1: "a", "b": [1.5, None]}) == '{"1":"a","b":[1.5,null]}'
+    assert json_serializer({"x": np.float32(2.5), "y": np.arange(2)}) == (
+        '{"x":2.5,"y":[0,1]}'
+    )
+    assert json_serializer(float("nan")) == "null"
+
+
+def test_json_column_round_trip(db):
+    report = Report(
+        kind="daily",
+        report_at=datetime.now(timezone.utc),
+        markdown="# Report",
+        payload={"counts": {2024: 3}, "scores": np.array([1.0, 2.0])},
+    )
+    db.add(report)
+    db.commit()
+    db.expire_all()
+
+    stored = db.get(Report, report.id)
+    assert stored.payload == {"counts": {"2024": 3}, "scores": [1.0, 2.0]}
@@ -1,9 +1,38 @@
 """Tests for ECB FX provider."""
 
+import pytest
 from unittest.mock import patch, MagicMock
+from app.providers import ecb_fx
 from app.providers.ecb_fx import fetch_ecb_fx, FxQuote
 from datetime import datetime, timezone
 
+ECB_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01" xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+    <Cube>
+        <Cube time="2024-01-01">
+            <Cube currency="USD" rate="1.10"/>
+            <Cube currency="GBP" rate="0.86"/>
+        </Cube>
+    </Cube>
+</gesmes:Envelope>"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_ecb_cache():
+    ecb_fx.invalidate_cache()
+    yield
+    ecb_fx.invalidate_cache()
+
+
+def _response(status_code=200, text=ECB_XML, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.content = text.encode()
+    response.headers = headers or {}
+    response.raise_for_status = MagicMock()
+    return response
+
 
 def test_fx_quote_dataclass():
     """Test FxQuote dataclass creation."""
@@ -39,7 +68,8 @@ def test_fetch_ecb_fx_with_mock():
         </Cube>
     </gesmes:Envelope>"""
 
-    with patch("app.providers.ecb_fx.httpx.get") as mock_get:
+    with patch("app.providers.ecb_fx.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_response = MagicMock()
         mock_response.text = mock_xml
         mock_response.raise_for_status = MagicMock()
@@ -55,7 +85,8 @@ def test_fetch_ecb_fx_with_mock():
 
 def test_fetch_ecb_fx_network_error():
     """Test fetching FX rate with network error."""
-    with patch("app.providers.ecb_fx.httpx.get") as mock_get:
+    with patch("app.providers.ecb_fx.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_get.side_effect = Exception("Network error")
 
         result = fetch_ecb_fx("EUR", "USD")
@@ -65,7 +96,8 @@ def test_fetch_ecb_fx_network_error():
 
 def test_fetch_ecb_fx_invalid_xml():
     """Test fetching FX rate with invalid XML."""
-    with patch("app.providers.ecb_fx.httpx.get") as mock_get:
+    with patch("app.providers.ecb_fx.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_response = MagicMock()
         mock_response.text = "invalid xml"
         mock_response.raise_for_status = MagicMock()
@@ -78,10 +110,55 @@ def test_fetch_ecb_fx_invalid_xml():
 
 def test_fetch_ecb_fx_case_insensitive():
     """Test that currency codes are case-insensitive."""
-    with patch("app.providers.ecb_fx.httpx.get") as mock_get:
+    with patch("app.providers.ecb_fx.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_get.side_effect = Exception("Network error")
 
         # Should handle case normalization
         result = fetch_ecb_fx("usd", "eur")
 
         assert result is None  # Network error expected
+
+
+def test_fetch_ecb_fx_reuses_cached_rates():
+    """Repeated calls within the TTL do not hit the network again."""
+    with patch("app.providers.ecb_fx.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
+        mock_get.return_value = _response()
+
+        usd = fetch_ecb_fx("EUR", "USD")
+        gbp = fetch_ecb_fx("EUR", "GBP")
+
+    assert usd.rate == pytest.approx(1.10)
+    assert gbp.rate == pytest.approx(0.86)
+    assert mock_get.call_count == 1
+
+
+def test_fetch_ecb_fx_revalidates_with_etag():
+    """After the TTL a 304 keeps the cached rates."""
+    with patch("app.providers.ecb_fx.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
+        mock_get.return_value = _response(headers={"ETag": '"abc"'})
+        assert fetch_ecb_fx("EUR", "USD") is not None
+
+        ecb_fx._CACHE = (ecb_fx._CACHE[0] - ecb_fx.CACHE_TTL - 1, *ecb_fx._CACHE[1:])
+        mock_get.return_value = _response(status_code=304, text="")
+        result = fetch_ecb_fx("USD", "EUR")
+
+    assert result is not None
+    assert result.rate == pytest.approx(1 / 1.10)
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
+def test_parse_rates_stops_after_first_dated_cube():
+    """Only the newest day is read from multi-day files."""
+    xml = ECB_XML.replace(
+        "</Cube>\n    </Cube>",
+        '</Cube>\n        <Cube time="2023-12-29"><Cube currency="USD" rate="9.99"/></Cube>'
+        "\n    </Cube>",
+    ).encode()
+
+    rates, observed_at = ecb_fx._parse_rates(xml)
+
+    assert rates == {"USD": 1.10, "GBP": 0.86}
+    assert observed_at == datetime(2024, 1, 1, tzinfo=timezone.utc)
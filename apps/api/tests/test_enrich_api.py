@@ -95,3 +95,37 @@ def test_enrich_rejects_non_positive_entity_id(client, auth_headers):
         headers=auth_headers,
     )
     assert response.status_code == 422
+
+
+def test_enrich_reuses_extraction_for_unchanged_page(db):
+    """A page whose content hash is unchanged is not sent to the LLM again."""
+    from app.services.enrichment import enrich_entity
+
+    coop = Cooperative(name="Hash Coop", region="Cusco")
+    db.add(coop)
+    db.commit()
+    db.refresh(coop)
+
+    page = ("Cooperativa en Cusco, 1800 msnm", {"final_url": "https://example.com/"})
+    with (
+        patch("app.services.enrichment.fetch_text", return_value=page),
+        patch("app.services.enrichment.settings") as mock_settings,
+        patch("app.services.enrichment.PerplexityClient"),
+        patch(
+            "app.services.enrichment._extract_structured_with_llm",
+            return_value={"altitude_min_m": 1800},
+        ) as mock_llm,
+    ):
+        mock_settings.PERPLEXITY_API_KEY = "test-key"
+        results = [
+            enrich_entity(
+                db,
+                entity_type="cooperative",
+                entity_id=coop.id,
+                url="https://example.com",
+            )
+            for _ in range(2)
+        ]
+
+    assert [r["status"] for r in results] == ["ok", "ok"]
+    assert mock_llm.call_count == 1
@@ -58,6 +58,22 @@ def test_error_response_default_status():
     assert response.status_code == 500
 
 
+def test_error_response_renders_with_orjson():
+    """Error bodies render via orjson, including non-str keys and datetimes."""
+    from datetime import datetime, timezone
+
+    import orjson
+
+    detail = {1: "first", "at": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+    response = ErrorResponse.format_error(
+        error_code="HTTP_ERROR", message="Conflict", status_code=409, detail=detail
+    )
+
+    body = orjson.loads(bytes(response.body))
+    assert body["detail"] == {"1": "first", "at": "2024-01-01T00:00:00+00:00"}
+    assert body["error"] == {"code": "HTTP_ERROR", "message": "Conflict"}
+
+
 @pytest.mark.asyncio
 async def test_validation_exception_handler():
     """Test validation exception handler."""
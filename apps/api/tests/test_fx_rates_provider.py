@@ -1,17 +1,35 @@
 """Tests for FX rates provider."""
 
+import threading
+import time
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone
 
+import orjson
+import pytest
+
+from app.providers import fx_rates
 from app.providers.fx_rates import (
     fetch_exchangerate_api_fx,
     fetch_frankfurter_fx,
+    fetch_frankfurter_fx_batch,
+    fetch_fx_rates_batch,
     fetch_ecb_fx_wrapped,
     fetch_fx_rate,
+    invalidate_fx_cache,
     FxRate,
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_rate_cache():
+    fx_rates._rate_cache.clear()
+    fx_rates._failed_pairs.clear()
+    yield
+    fx_rates._rate_cache.clear()
+    fx_rates._failed_pairs.clear()
+
+
 def test_fx_rate_dataclass():
     """Test FxRate dataclass creation."""
     rate = FxRate(
@@ -21,7 +39,7 @@ def test_fx_rate_dataclass():
         observed_at=datetime.now(timezone.utc),
         source_name="Test",
         source_url="https://test.com",
-        raw_data="{}",
+        raw_bytes=b"{}",
         metadata={"test": True},
     )
 
@@ -38,9 +56,11 @@ def test_fetch_exchangerate_api_fx_success():
         "time_last_update_unix": 1704067200,
     }
 
-    with patch("app.providers.fx_rates.httpx.get") as mock_get:
+    with patch("app.providers.fx_rates.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_response = MagicMock()
-        mock_response.json.return_value = mock_response_data
+        mock_response.content = orjson.dumps(mock_response_data)
+        mock_response.text = mock_response.content.decode()
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
@@ -51,6 +71,21 @@ def test_fetch_exchangerate_api_fx_success():
         assert rate.quote == "EUR"
         assert rate.rate == 0.92
         assert rate.source_name == "ExchangeRate-API"
+        assert rate.raw_bytes is mock_response.content
+        assert rate.raw_data == mock_response.text
+
+
+def test_fetch_exchangerate_api_fx_reuses_cached_rate():
+    """A successful rate is served from the cache within the TTL."""
+    with patch("app.providers.fx_rates.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
+        mock_get.return_value.content = orjson.dumps({"rates": {"EUR": 0.92}})
+
+        first = fetch_exchangerate_api_fx("USD", "EUR")
+        second = fetch_exchangerate_api_fx("usd", "eur")
+
+    assert second is first
+    assert mock_get.call_count == 1
 
 
 def test_fetch_exchangerate_api_fx_same_currency():
@@ -61,7 +96,8 @@ def test_fetch_exchangerate_api_fx_same_currency():
 
 def test_fetch_exchangerate_api_fx_network_error():
     """Test ExchangeRate-API with network error."""
-    with patch("app.providers.fx_rates.httpx.get") as mock_get:
+    with patch("app.providers.fx_rates.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_get.side_effect = Exception("Network error")
 
         rate = fetch_exchangerate_api_fx("USD", "EUR")
@@ -78,9 +114,11 @@ def test_fetch_frankfurter_fx_success():
         "rates": {"EUR": 0.92},
     }
 
-    with patch("app.providers.fx_rates.httpx.get") as mock_get:
+    with patch("app.providers.fx_rates.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_response = MagicMock()
-        mock_response.json.return_value = mock_response_data
+        mock_response.content = orjson.dumps(mock_response_data)
+        mock_response.text = mock_response.content.decode()
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
@@ -102,9 +140,11 @@ def test_fetch_frankfurter_fx_no_rate():
         "rates": {},
     }
 
-    with patch("app.providers.fx_rates.httpx.get") as mock_get:
+    with patch("app.providers.fx_rates.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
         mock_response = MagicMock()
-        mock_response.json.return_value = mock_response_data
+        mock_response.content = orjson.dumps(mock_response_data)
+        mock_response.text = mock_response.content.decode()
         mock_response.raise_for_status = MagicMock()
         mock_get.return_value = mock_response
 
@@ -136,7 +176,10 @@ def test_fetch_ecb_fx_wrapped():
 
 def test_fetch_fx_rate_fallback_chain():
     """Test FX rate fetch tries all sources in order."""
-    with patch("app.providers.fx_rates.fetch_ecb_fx_wrapped") as mock_ecb:
+    with (
+        patch("app.providers.fx_rates.fetch_ecb_fx_wrapped") as mock_ecb,
+        patch("app.providers.fx_rates.fetch_frankfurter_fx", return_value=None),
+    ):
         with patch("app.providers.fx_rates.fetch_exchangerate_api_fx") as mock_exr:
             # ECB fails, ExchangeRate-API succeeds
             mock_ecb.return_value = None
@@ -147,7 +190,7 @@ def test_fetch_fx_rate_fallback_chain():
                 observed_at=datetime.now(timezone.utc),
                 source_name="ExchangeRate-API",
                 source_url="https://test.com",
-                raw_data="{}",
+                raw_bytes=b"{}",
                 metadata={},
             )
 
@@ -183,7 +226,7 @@ def test_fetch_fx_rate_case_insensitive():
             observed_at=datetime.now(timezone.utc),
             source_name="ECB",
             source_url="https://test.com",
-            raw_data="{}",
+            raw_bytes=b"{}",
             metadata={},
         )
 
@@ -192,3 +235,188 @@ def test_fetch_fx_rate_case_insensitive():
         assert rate is not None
         # Should normalize to uppercase
         mock_ecb.assert_called_with("USD", "EUR", 20.0)
+
+
+def test_fetch_fx_rate_hedges_slow_ecb():
+    """A slow ECB does not hold up a faster fallback source."""
+    release = threading.Event()
+
+    def slow_ecb(base, quote, timeout_s):
+        release.wait(5)
+        return None
+
+    fallback = FxRate(
+        base="USD",
+        quote="EUR",
+        rate=0.92,
+        observed_at=datetime.now(timezone.utc),
+        source_name="Frankfurter",
+        source_url="https://test.com",
+        raw_bytes=b"{}",
+        metadata={},
+    )
+    with (
+        patch("app.providers.fx_rates.HEDGE_DELAY_S", 0.01),
+        patch("app.providers.fx_rates.fetch_ecb_fx_wrapped", side_effect=slow_ecb),
+        patch("app.providers.fx_rates.fetch_exchangerate_api_fx", return_value=None),
+        patch("app.providers.fx_rates.fetch_frankfurter_fx", return_value=fallback),
+    ):
+        started = time.monotonic()
+        rate = fetch_fx_rate("USD", "EUR")
+        elapsed = time.monotonic() - started
+    release.set()
+
+    assert rate is fallback
+    assert elapsed < 1
+
+
+def test_fetch_fx_rate_respects_total_budget():
+    """Slow sources share one time budget instead of timeout_s each."""
+    release = threading.Event()
+    timeouts = []
+
+    def slow_source(base, quote, timeout_s):
+        timeouts.append(timeout_s)
+        release.wait(5)
+        return None
+
+    with (
+        patch("app.providers.fx_rates.HEDGE_DELAY_S", 0.05),
+        patch("app.providers.fx_rates.fetch_ecb_fx_wrapped", side_effect=slow_source),
+        patch(
+            "app.providers.fx_rates.fetch_exchangerate_api_fx", side_effect=slow_source
+        ),
+        patch("app.providers.fx_rates.fetch_frankfurter_fx", side_effect=slow_source),
+    ):
+        started = time.monotonic()
+        rate = fetch_fx_rate("USD", "EUR", timeout_s=0.3)
+        elapsed = time.monotonic() - started
+    release.set()
+
+    assert rate is None
+    assert elapsed < 1
+    assert timeouts[0] == 0.3
+    assert all(t < 0.3 for t in timeouts[1:])
+
+
+def test_fetch_frankfurter_fx_batch_single_request():
+    """All quotes for one base come from a single request."""
+    data = {"base": "USD", "date": "2024-01-01", "rates": {"EUR": 0.92, "GBP": 0.79}}
+    with patch("app.providers.fx_rates.get_client") as mock_client:
+        mock_get = mock_client.return_value.get
+        mock_get.return_value.content = orjson.dumps(data)
+
+        rates = fetch_frankfurter_fx_batch("usd", ["EUR", "gbp", "CHF", "USD"])
+        cached = fetch_frankfurter_fx("USD", "GBP")
+
+    assert set(rates) == {"EUR", "GBP"}
+    assert rates["GBP"].rate == 0.79
+    assert cached is rates["GBP"]
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"] == {"from": "USD", "to": "EUR,GBP,CHF"}
+
+
+def test_fetch_fx_rates_batch_fills_gaps_from_fallbacks():
+    """Quotes ECB cannot provide are fetched from the batch fallbacks."""
+
+    def rate(quote, source):
+        return FxRate(
+            base="USD",
+            quote=quote,
+            rate=1.0,
+            observed_at=datetime.now(timezone.utc),
+            source_name=source,
+            source_url="https://test.com",
+            raw_bytes=b"{}",
+            metadata={},
+        )
+
+    with (
+        patch(
+            "app.providers.fx_rates.fetch_ecb_fx_wrapped",
+            side_effect=lambda base, quote, timeout_s: (
+                rate(quote, "ECB") if quote == "EUR" else None
+            ),
+        ),
+        patch(
+            "app.providers.fx_rates.fetch_exchangerate_api_fx_batch",
+            return_value={"GBP": rate("GBP", "ExchangeRate-API")},
+        ) as mock_exr,
+        patch(
+            "app.providers.fx_rates.fetch_frankfurter_fx_batch",
+            return_value={"CHF": rate("CHF", "Frankfurter")},
+        ) as mock_frank,
+    ):
+        rates = fetch_fx_rates_batch("USD", ["EUR", "GBP", "CHF"])
+
+    assert {q: r.source_name for q, r in rates.items()} == {
+        "EUR": "ECB",
+        "GBP": "ExchangeRate-API",
+        "CHF": "Frankfurter",
+    }
+    assert mock_exr.call_args.args[1] == ["GBP", "CHF"]
+    assert mock_frank.call_args.args[1] == ["CHF"]
+
+
+def test_fetch_fx_rate_caches_chain_winner():
+    """A rate from any source short-circuits the chain until invalidated."""
+    fallback = FxRate(
+        base="USD",
+        quote="EUR",
+        rate=0.92,
+        observed_at=datetime.now(timezone.utc),
+        source_name="Frankfurter",
+        source_url="https://test.com",
+        raw_bytes=b"{}",
+        metadata={},
+    )
+    with (
+        patch(
+            "app.providers.fx_rates.fetch_ecb_fx_wrapped", return_value=None
+        ) as mock_ecb,
+        patch("app.providers.fx_rates.fetch_exchangerate_api_fx", return_value=None),
+        patch("app.providers.fx_rates.fetch_frankfurter_fx", return_value=fallback),
+    ):
+        first = fetch_fx_rate("USD", "EUR")
+        second = fetch_fx_rate("usd", "eur")
+        assert mock_ecb.call_count == 1
+
+        assert invalidate_fx_cache(quote="eur") == 1
+        fetch_fx_rate("USD", "EUR")
+        assert mock_ecb.call_count == 2
+
+    assert first is fallback
+    assert second is fallback
+
+
+def test_invalidate_fx_cache_filters_by_base():
+    rate = MagicMock()
+    fx_rates._store_rate(("chain", "USD", "EUR"), rate)
+    fx_rates._store_rate(("frankfurter", "USD", "GBP"), rate)
+    fx_rates._store_rate(("chain", "EUR", "USD"), rate)
+
+    assert invalidate_fx_cache(base="USD") == 2
+    assert list(fx_rates._rate_cache) == [("chain", "EUR", "USD")]
+    assert invalidate_fx_cache() == 1
+
+
+def test_fetch_fx_rate_caches_failures_briefly():
+    """A pair no source can provide is not retried within the negative TTL."""
+    with (
+        patch(
+            "app.providers.fx_rates.fetch_ecb_fx_wrapped", return_value=None
+        ) as mock_ecb,
+        patch("app.providers.fx_rates.fetch_exchangerate_api_fx", return_value=None),
+        patch("app.providers.fx_rates.fetch_frankfurter_fx", return_value=None),
+    ):
+        assert fetch_fx_rate("USD", "XYZ") is None
+        assert fetch_fx_rate("USD", "XYZ") is None
+        assert fetch_fx_rates_batch("USD", ["XYZ"]) == {}
+        assert mock_ecb.call_count == 1
+
+        with patch("app.providers.fx_rates.NEGATIVE_CACHE_TTL", 0):
+            fetch_fx_rate("USD", "XYZ")
+        assert mock_ecb.call_count == 2
+
+        assert invalidate_fx_cache(quote="XYZ") == 1
+        assert not fx_rates._failed_pairs
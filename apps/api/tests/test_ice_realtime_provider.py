@@ -2,8 +2,10 @@
 
 from unittest.mock import MagicMock, patch
 
+import orjson
 import pytest
 
+from app.providers import ice_realtime
 from app.providers.ice_realtime import (
     fetch_twelve_data_coffee,
     fetch_realtime_coffee_price,
@@ -14,7 +16,8 @@ from app.providers.coffee_prices import CoffeeQuote
 def _mock_httpx_response(json_data: dict, status_code: int = 200) -> MagicMock:
     mock = MagicMock()
     mock.status_code = status_code
-    mock.json.return_value = json_data
+    mock.content = orjson.dumps(json_data)
+    mock.text = mock.content.decode()
     if status_code >= 400:
         mock.raise_for_status.side_effect = Exception(f"HTTP {status_code}")
     else:
@@ -22,10 +25,18 @@ def _mock_httpx_response(json_data: dict, status_code: int = 200) -> MagicMock:
     return mock
 
 
+@pytest.fixture(autouse=True)
+def _clear_quote_cache():
+    ice_realtime._quote_cache.clear()
+    yield
+    ice_realtime._quote_cache.clear()
+
+
 class TestFetchTwelveDataCoffee:
     def test_returns_quote_on_success(self):
         resp = _mock_httpx_response({"price": "2.3500"})
-        with patch("app.providers.ice_realtime.httpx.get", return_value=resp):
+        with patch("app.providers.ice_realtime.get_client") as mock_client:
+            mock_client.return_value.get.return_value = resp
             quote = fetch_twelve_data_coffee("fake-api-key")
 
         assert quote is not None
@@ -35,27 +46,57 @@ class TestFetchTwelveDataCoffee:
         assert quote.metadata["provider"] == "twelve_data"
         assert quote.metadata["exchange"] == "ICE"
 
+    def test_reuses_cached_quote_within_ttl(self):
+        resp = _mock_httpx_response({"price": "2.3500"})
+        with patch("app.providers.ice_realtime.get_client") as mock_client:
+            mock_client.return_value.get.return_value = resp
+            first = fetch_twelve_data_coffee("fake-api-key")
+            second = fetch_twelve_data_coffee("fake-api-key")
+
+        assert second is first
+        assert mock_client.return_value.get.call_count == 1
+
     def test_returns_none_when_price_missing(self):
         resp = _mock_httpx_response({"code": 400, "message": "Invalid symbol"})
-        with patch("app.providers.ice_realtime.httpx.get", return_value=resp):
+        with patch("app.providers.ice_realtime.get_client") as mock_client:
+            mock_client.return_value.get.return_value = resp
             quote = fetch_twelve_data_coffee("fake-api-key")
 
         assert quote is None
 
     def test_returns_none_on_network_error(self):
-        with patch(
-            "app.providers.ice_realtime.httpx.get", side_effect=Exception("timeout")
-        ):
+        with patch("app.providers.ice_realtime.get_client") as mock_client:
+            mock_client.return_value.get.side_effect = Exception("timeout")
             quote = fetch_twelve_data_coffee("fake-api-key")
 
         assert quote is None
 
     def test_returns_none_on_http_error(self):
         resp = _mock_httpx_response({}, status_code=429)
-        with patch("app.providers.ice_realtime.httpx.get", return_value=resp):
+        with (
+            patch("app.providers.ice_realtime.get_client") as mock_client,
+            patch("app.providers.http.time.sleep"),
+        ):
+            mock_client.return_value.get.return_value = resp
             quote = fetch_twelve_data_coffee("fake-api-key")
 
         assert quote is None
+        assert mock_client.return_value.get.call_count == 3
+
+    def test_retries_rate_limit_after_retry_after(self):
+        limited = _mock_httpx_response({}, status_code=429)
+        limited.headers = {"Retry-After": "2"}
+        ok = _mock_httpx_response({"price": "2.3500"})
+        with (
+            patch("app.providers.ice_realtime.get_client") as mock_client,
+            patch("app.providers.http.time.sleep") as mock_sleep,
+        ):
+            mock_client.return_value.get.side_effect = [limited, ok]
+            quote = fetch_twelve_data_coffee("fake-api-key")
+
+        assert quote is not None
+        assert quote.price_usd_per_lb == pytest.approx(2.35)
+        mock_sleep.assert_called_once_with(2.0)
 
 
 class TestFetchRealtimeCoffeePrice:
@@ -67,7 +108,7 @@ class TestFetchRealtimeCoffeePrice:
             ),
             source_name="Twelve Data (ICE KC1!)",
             source_url="https://api.twelvedata.com/price",
-            raw_data="{}",
+            raw_bytes=b"{}",
             metadata={"provider": "twelve_data"},
         )
         with patch(
@@ -87,7 +128,7 @@ class TestFetchRealtimeCoffeePrice:
             ),
             source_name="Yahoo Finance",
             source_url="https://query1.finance.yahoo.com/",
-            raw_data="{}",
+            raw_bytes=b"{}",
             metadata={},
         )
         with (
@@ -105,6 +146,34 @@ class TestFetchRealtimeCoffeePrice:
         assert result is not None
         assert result.source_name == "Yahoo Finance"
 
+    def test_caches_fallback_winner(self):
+        fallback_quote = CoffeeQuote(
+            price_usd_per_lb=2.35,
+            observed_at=__import__("datetime").datetime.now(
+                __import__("datetime").timezone.utc
+            ),
+            source_name="Yahoo Finance",
+            source_url="https://query1.finance.yahoo.com/",
+            raw_bytes=b"{}",
+            metadata={},
+        )
+        with (
+            patch(
+                "app.providers.ice_realtime.fetch_twelve_data_coffee",
+                return_value=None,
+            ) as mock_td,
+            patch(
+                "app.providers.coffee_prices.fetch_yahoo_finance_coffee",
+                return_value=fallback_quote,
+            ) as mock_yahoo,
+        ):
+            first = fetch_realtime_coffee_price(api_key="fake-key")
+            second = fetch_realtime_coffee_price(api_key="fake-key")
+
+        assert second is first is fallback_quote
+        assert mock_td.call_count == 1
+        assert mock_yahoo.call_count == 1
+
     def test_skips_twelve_data_when_no_api_key(self):
         fallback_quote = CoffeeQuote(
             price_usd_per_lb=2.30,
@@ -113,7 +182,7 @@ class TestFetchRealtimeCoffeePrice:
             ),
             source_name="Yahoo Finance",
             source_url="https://query1.finance.yahoo.com/",
-            raw_data="{}",
+            raw_bytes=b"{}",
             metadata={},
         )
         with (
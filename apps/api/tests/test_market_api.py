@@ -179,3 +179,29 @@ def test_load_ws_user_normalizes_email_before_query(monkeypatch):
 
     assert user is expected_user
     assert captured["email"] == "admin@example.com"
+
+
+def test_list_observations_matches_response_model(client, auth_headers, db):
+    """Rows rendered straight from Core keep the MarketObservationOut shape."""
+    from app.domains.market.schemas.market import MarketObservationOut
+
+    db.add(
+        MarketObservation(
+            key="FX:USD_EUR",
+            value=0.92,
+            currency="EUR",
+            observed_at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            raw_text="<xml/>",
+            meta={"provider": "ecb"},
+        )
+    )
+    db.commit()
+
+    response = client.get("/market/observations?key=FX:USD_EUR", headers=auth_headers)
+
+    assert response.status_code == 200
+    [item] = response.json()
+    assert set(item) == set(MarketObservationOut.model_fields)
+    assert item["raw_text"] == "<xml/>"
+    assert item["meta"] == {"provider": "ecb"}
+    assert item["observed_at"].startswith("2024-01-02T03:04:05")
@@ -0,0 +1,41 @@
+"""Tests for idempotent market observation ingest."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.market import MarketObservation
+from app.services.market_ingest import _upsert_statement, upsert_market_observation
+
+
+def test_upsert_market_observation_updates_existing_row(db):
+    observed_at = datetime(2026, 1, 5, 12, tzinfo=timezone.utc)
+    first = upsert_market_observation(
+        db, key="FX:USD_EUR", value=0.91, observed_at=observed_at, source_name="ecb"
+    )
+    second = upsert_market_observation(
+        db, key="FX:USD_EUR", value=0.92, observed_at=observed_at, source_name="ecb"
+    )
+
+    assert second.id == first.id
+    assert second.value == 0.92
+    assert db.query(MarketObservation).count() == 1
+
+
+def test_upsert_statement_targets_business_key():
+    stmt = _upsert_statement(
+        key="FX:USD_EUR",
+        value=0.91,
+        unit=None,
+        currency="EUR",
+        observed_at=datetime(2026, 1, 5, tzinfo=timezone.utc),
+        source_id=1,
+        raw_text=None,
+        meta={"provider": "ecb"},
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+    assert "ON CONFLICT (key, observed_at, source_id) DO UPDATE" in sql
+    assert "meta = excluded.meta" in sql
+    assert "raw_text = excluded.raw_text" not in sql
+    assert "RETURNING" in sql
@@ -9,7 +9,7 @@ client = TestClient(app)
 
 def test_security_headers_present():
     """Test that security headers are added to responses."""
-    response = client.get("/health")
+    response = client.get("/cooperatives")
 
     # Check security headers
     assert response.headers.get("X-Frame-Options") == "DENY"
@@ -154,3 +154,173 @@ def test_cors_allowed_methods():
 
     # CORS middleware should be configured
     assert cors_middleware is not None, "CORS middleware should be configured"
+
+
+def test_cors_headers_for_allowed_origin_only():
+    """Allowed origins are mirrored back; other origins get no CORS headers."""
+    response = client.get("/cooperatives", headers={"Origin": "http://localhost:3000"})
+    assert response.headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+    assert response.headers["Access-Control-Allow-Credentials"] == "true"
+    assert "Origin" in response.headers["Vary"]
+
+    response = client.get("/cooperatives", headers={"Origin": "https://evil.example"})
+    assert "Access-Control-Allow-Origin" not in response.headers
+
+
+def test_cors_preflight_is_answered_by_middleware():
+    """Preflights are answered directly and reject disallowed methods/headers."""
+    preflight = {
+        "Origin": "http://localhost:3000",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type, authorization",
+    }
+    response = client.options("/cooperatives", headers=preflight)
+    assert response.status_code == 204
+    assert response.headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+    assert "PATCH" in response.headers["Access-Control-Allow-Methods"]
+
+    response = client.options(
+        "/cooperatives",
+        headers={**preflight, "Access-Control-Request-Headers": "X-Unknown"},
+    )
+    assert response.status_code == 400
+    assert response.text == "Disallowed CORS headers"
+
+    response = client.options(
+        "/cooperatives",
+        headers={**preflight, "Access-Control-Request-Method": "TRACE"},
+    )
+    assert response.text == "Disallowed CORS method"
+
+
+def test_merged_patterns_match_each_original_pattern():
+    """The union regexes must keep matching every individual pattern class."""
+    from app.middleware.input_validation import InputValidationMiddleware
+
+    sql_samples = [
+        "1 UNION SELECT password",
+        "select name from users",
+        "insert into users values (1)",
+        "delete from users",
+        "drop table users",
+        "exec(xp_cmdshell)",
+        "execute(sp_who)",
+        "x; --",
+        "' or 1",
+        "admin' --",
+        "waitfor delay '0:0:5'",
+        "sleep(5)",
+        "benchmark(1000000, md5(1))",
+    ]
+    for sample in sql_samples:
+        assert InputValidationMiddleware.SQL_INJECTION_REGEX.search(sample), sample
+
+    for sample in ["<script>alert(1)</script>", "JavaScript:void(0)", "onload ="]:
+        assert InputValidationMiddleware.XSS_REGEX.search(sample), sample
+
+    for sample in ["Cooperativa Agraria Cafetalera", "Washed, SCA 86.5"]:
+        assert not InputValidationMiddleware.SQL_INJECTION_REGEX.search(sample)
+        assert not InputValidationMiddleware.XSS_REGEX.search(sample)
+
+
+def test_prefilter_covers_every_pattern_sample():
+    """Values the regexes reject must never be skipped by the literal pre-filter."""
+    from app.middleware.input_validation import InputValidationMiddleware
+
+    middleware = InputValidationMiddleware(app=None)
+    samples = [
+        "1 UNION SELECT password",
+        "delete from users",
+        "x; /* comment",
+        "' or 1",
+        "sleep(5)",
+        "<script>alert(1)</script>",
+        "javascript:void(0)",
+        "onerror=alert(1)",
+        # Characters that re.IGNORECASE folds onto ASCII letters
+        "1 UN\u0131ON \u017fELECT password",
+        "\u212aEY' or 1",
+    ]
+    for sample in samples:
+        assert middleware._has_prefilter_literal(sample), sample
+        assert not middleware._validate_value(sample), sample
+
+    assert not middleware._has_prefilter_literal("Cooperativa Agraria Cafetalera")
+    assert middleware._validate_value("Cooperativa Agraria Cafetalera")
+
+
+def test_deeply_nested_payload_does_not_recurse():
+    """Nesting deeper than the recursion limit is still fully validated."""
+    import sys
+
+    from app.middleware.input_validation import InputValidationMiddleware
+
+    middleware = InputValidationMiddleware(app=None)
+    payload: dict = {"name": "<script>alert(1)</script>"}
+    for _ in range(sys.getrecursionlimit() * 2):
+        payload = {"child": [payload]}
+
+    assert not middleware._validate_dict(payload)
+
+
+def test_non_strict_json_body_is_still_validated():
+    """Bodies only the stdlib parser accepts (e.g. NaN) are validated too."""
+    response = client.post(
+        "/cooperatives",
+        content=b'{"score": NaN, "name": "<script>alert(1)</script>"}',
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == 400
+
+
+def test_csp_and_hsts_headers(monkeypatch):
+    """CSP follows APP_ENV and HSTS is only sent over HTTPS."""
+    from app.core.config import settings
+
+    response = client.get("/cooperatives")
+    assert "'unsafe-eval'" in response.headers["Content-Security-Policy"]
+    assert "Strict-Transport-Security" not in response.headers
+
+    monkeypatch.setattr(settings, "APP_ENV", "prod")
+    https_client = TestClient(app, base_url="https://testserver")
+    response = https_client.get("/cooperatives")
+    assert response.headers["Content-Security-Policy"].startswith("default-src 'none'")
+    assert (
+        response.headers["Strict-Transport-Security"]
+        == "max-age=31536000; includeSubDomains"
+    )
+
+
+def test_probe_endpoints_skip_security_layer():
+    """Health probes and metrics scrapes take the middleware fast path."""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert "X-Frame-Options" not in response.headers
+    # Docs are rendered by browsers and keep their headers
+    assert client.get("/docs").headers.get("X-Frame-Options") == "DENY"
+
+
+def test_rejected_request_gets_security_headers():
+    """Validation and headers share one layer, so rejections carry headers too."""
+    response = client.post(
+        "/cooperatives", json={"name": "<script>alert('XSS')</script>"}
+    )
+    assert response.status_code == 400
+    assert response.headers.get("X-Frame-Options") == "DENY"
+
+
+def test_oversized_body_is_rejected_without_content_length():
+    """Streamed bodies are cut off at the limit instead of read in full."""
+    from app.middleware.input_validation import MAX_REQUEST_BODY_SIZE
+
+    def chunks():
+        chunk = b" " * (1024 * 1024)
+        for _ in range(MAX_REQUEST_BODY_SIZE // len(chunk) + 1):
+            yield chunk
+
+    response = client.post(
+        "/cooperatives",
+        content=chunks(),
+        headers={"content-type": "application/json"},
+    )
+    assert response.status_code == 413
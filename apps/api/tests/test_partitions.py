@@ -0,0 +1,15 @@
+"""Tests for the monthly partition helper."""
+
+from datetime import date
+
+from app.db.partitions import _month_start, ensure_monthly_partitions
+
+
+def test_month_start_rolls_over_years():
+    assert _month_start(date(2026, 11, 17)) == date(2026, 11, 1)
+    assert _month_start(date(2026, 11, 17), 2) == date(2027, 1, 1)
+    assert _month_start(date(2026, 1, 31), -1) == date(2025, 12, 1)
+
+
+def test_ensure_monthly_partitions_is_noop_off_postgres(db):
+    assert ensure_monthly_partitions(db, "market_observations") == []
@@ -0,0 +1,99 @@
+"""Tests for PerplexityClient retries and structured output."""
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.providers.perplexity import (
+    PerplexityClient,
+    PerplexityError,
+    RetryableHTTPError,
+    StructuredOutputError,
+)
+
+
+@pytest.fixture
+def client():
+    c = PerplexityClient(api_key="test-key", base_url="https://api.test")
+    yield c
+    c.close()
+
+
+def test_chat_completions_retries_rate_limit(client):
+    limited = httpx.Response(429, headers={"Retry-After": "0"}, text="slow down")
+    ok = httpx.Response(200, json={"choices": [{"message": {"content": "hi"}}]})
+
+    with patch.object(client._client, "post", side_effect=[limited, ok]) as post:
+        assert client.chat_completions([{"role": "user", "content": "x"}]) == "hi"
+
+    assert post.call_count == 2
+
+
+def test_search_gives_up_after_repeated_server_errors(client):
+    unavailable = httpx.Response(503, headers={"Retry-After": "0"})
+
+    with patch.object(client._client, "post", return_value=unavailable) as post:
+        with pytest.raises(RetryableHTTPError):
+            client.search("coffee")
+
+    assert post.call_count == 4
+
+
+def test_client_errors_are_not_retried(client):
+    with patch.object(
+        client._client, "post", return_value=httpx.Response(401, text="bad key")
+    ) as post:
+        with pytest.raises(PerplexityError, match="401"):
+            client.search("coffee")
+
+    assert post.call_count == 1
+
+
+def _chat_response(content):
+    return httpx.Response(200, json={"choices": [{"message": {"content": content}}]})
+
+
+def test_chat_completions_json_sends_schema_and_parses(client):
+    schema = {"type": "object", "properties": {"n": {"type": "integer"}}}
+
+    with patch.object(
+        client._client, "post", return_value=_chat_response('{"n": 3}')
+    ) as post:
+        assert client.chat_completions_json([], schema) == {"n": 3}
+
+    response_format = post.call_args.kwargs["json"]["response_format"]
+    assert response_format == {"type": "json_schema", "json_schema": {"schema": schema}}
+
+
+def test_chat_completions_json_rejects_non_json(client):
+    with patch.object(
+        client._client, "post", return_value=_chat_response("Sorry, no data.")
+    ):
+        with pytest.raises(StructuredOutputError) as excinfo:
+            client.chat_completions_json([], {"type": "object"})
+
+    assert excinfo.value.content == "Sorry, no data."
+
+
+def test_research_topic_retries_through_rate_limiter():
+    from app.providers import web_intel
+
+    request = httpx.Request("POST", web_intel.PERPLEXITY_URL)
+    limited = httpx.Response(429, headers={"Retry-After": "0"}, request=request)
+    ok = httpx.Response(
+        200,
+        json={"choices": [{"message": {"content": "ICO 2.10"}}], "citations": []},
+        request=request,
+    )
+
+    with (
+        patch("app.providers.web_intel.get_client") as get_client,
+        patch.object(web_intel._PERPLEXITY_BUCKET, "acquire") as acquire,
+    ):
+        get_client.return_value.post.side_effect = [limited, ok]
+        intel = web_intel.research_topic("ico price", "test-key")
+
+    assert intel is not None
+    assert intel.content == "ICO 2.10"
+    assert acquire.call_count == 2
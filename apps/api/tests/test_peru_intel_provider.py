@@ -0,0 +1,193 @@
+"""Tests for the Peru regional intelligence provider."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import orjson
+
+from app.providers.peru_intel import (
+    PERU_REGION_COORDS,
+    WeatherData,
+    _openmeteo_params,
+    _openmeteo_weather,
+    _warn_unknown_region,
+    SWEEP_CONCURRENCY,
+    fetch_all_peru_weather,
+    fetch_ico_price_data,
+    fetch_openmeteo_weather,
+    fetch_perplexity_production_intel,
+    fetch_peru_intel_all,
+)
+
+
+def _weather(region_name: str) -> WeatherData:
+    return WeatherData(
+        region_name=region_name,
+        current_temp_c=18.5,
+        temp_max_c=None,
+        temp_min_c=None,
+        precipitation_mm=None,
+        observed_at=datetime.now(timezone.utc),
+        source_name="OpenMeteo",
+        source_url="https://test.com",
+        raw_bytes=b"{}",
+        metadata={},
+    )
+
+
+def test_fetch_openmeteo_weather_unknown_region():
+    assert fetch_openmeteo_weather("Atlantis") is None
+
+
+def test_unknown_region_is_logged_once():
+    _warn_unknown_region.cache_clear()
+
+    with patch("app.providers.peru_intel.log") as mock_log:
+        assert _openmeteo_params("Lemuria") is None
+        assert _openmeteo_params("Lemuria") is None
+
+    mock_log.warning.assert_called_once_with(
+        "openmeteo_unknown_region", region_name="Lemuria"
+    )
+
+
+def test_openmeteo_params_region_lookup_is_case_insensitive():
+    params = _openmeteo_params(" san martín ")
+
+    assert params is not None
+    assert params["latitude"] == str(PERU_REGION_COORDS["San Martín"]["lat"])
+
+
+def test_fetch_ico_price_data_refreshes_timestamp_only():
+    first = fetch_ico_price_data()
+    second = fetch_ico_price_data()
+
+    assert first["fallback_prices"]["peru_fob_benchmark"]["price_usd_per_kg"] == 4.85
+    assert first["data"] is not second["data"]
+    assert "last_updated" in second["data"]
+
+
+def test_openmeteo_weather_parses_current_and_daily():
+    data = {
+        "current_weather": {"temperature": 19.2, "time": "2024-01-01T12:00"},
+        "daily": {
+            "temperature_2m_max": [24.0],
+            "temperature_2m_min": [12.5],
+            "precipitation_sum": [3.1],
+        },
+    }
+
+    weather = _openmeteo_weather("Cusco", data, b"{}")
+
+    assert weather is not None
+    assert weather.current_temp_c == 19.2
+    assert weather.temp_max_c == 24.0
+    assert weather.precipitation_mm == 3.1
+    assert weather.metadata["latitude"] == PERU_REGION_COORDS["Cusco"]["lat"]
+
+
+def test_fetch_all_peru_weather_requests_regions_concurrently():
+    async def slow_fetch(client, region_name):
+        await asyncio.sleep(0.2)
+        if region_name == "Puno":
+            raise RuntimeError("boom")
+        return _weather(region_name)
+
+    with patch(
+        "app.providers.peru_intel.fetch_openmeteo_weather_async",
+        side_effect=slow_fetch,
+    ):
+        started = time.monotonic()
+        weather = fetch_all_peru_weather()
+        elapsed = time.monotonic() - started
+
+    assert list(weather) == list(PERU_REGION_COORDS)
+    assert weather["Puno"] is None
+    assert weather["Cusco"].region_name == "Cusco"
+    assert elapsed < 0.2 * len(PERU_REGION_COORDS) / 2
+
+
+def test_fetch_peru_intel_all_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def tracked(result):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return result
+
+    async def weather(client, region_name):
+        return await tracked(_weather(region_name))
+
+    async def production(client, region_name, api_key):
+        return await tracked(f"intel:{region_name}")
+
+    with (
+        patch(
+            "app.providers.peru_intel.fetch_openmeteo_weather_async",
+            side_effect=weather,
+        ),
+        patch(
+            "app.providers.peru_intel.fetch_perplexity_production_intel_async",
+            side_effect=production,
+        ),
+    ):
+        intel = fetch_peru_intel_all("test-key")
+
+    assert list(intel) == list(PERU_REGION_COORDS)
+    assert intel["Cusco"][0].region_name == "Cusco"
+    assert intel["Cusco"][1] == "intel:Cusco"
+    assert peak == SWEEP_CONCURRENCY
+
+
+def test_fetch_peru_intel_all_without_api_key_skips_production():
+    async def weather(client, region_name):
+        return _weather(region_name)
+
+    with (
+        patch(
+            "app.providers.peru_intel.fetch_openmeteo_weather_async",
+            side_effect=weather,
+        ),
+        patch(
+            "app.providers.peru_intel.fetch_perplexity_production_intel_async"
+        ) as mock_production,
+    ):
+        intel = fetch_peru_intel_all(None)
+
+    assert all(production is None for _, production in intel.values())
+    mock_production.assert_not_called()
+
+
+def test_fetch_perplexity_production_intel_parses_structured_output():
+    intel = {
+        "production_volume_kg": 61000000,
+        "export_volume_kg": 52000000,
+        "avg_price_usd_kg": 4.9,
+        "quality_notes": "Washed Caturra and Typica, SCA 83-86",
+    }
+    body = {
+        "choices": [{"message": {"content": orjson.dumps(intel).decode()}}],
+        "citations": ["https://example.org/report"],
+    }
+    with patch("app.providers.peru_intel.get_client") as mock_client:
+        mock_post = mock_client.return_value.post
+        mock_post.return_value.status_code = 200
+        mock_post.return_value.content = orjson.dumps(body)
+        mock_post.return_value.text = mock_post.return_value.content.decode()
+
+        data = fetch_perplexity_production_intel("Cajamarca", "test-key")
+
+    payload = mock_post.call_args.kwargs["json"]
+    assert payload["response_format"]["type"] == "json_schema"
+    assert data is not None
+    assert data.production_volume_kg == 61000000
+    assert data.export_volume_kg == 52000000
+    assert data.avg_price_usd_kg == 4.9
+    assert data.quality_notes == intel["quality_notes"]
+    assert data.metadata["citations"] == ["https://example.org/report"]
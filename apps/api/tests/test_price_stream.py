@@ -22,7 +22,7 @@ def _make_quote(price: float = 2.40) -> CoffeeQuote:
         observed_at=datetime(2025, 6, 1, 12, 0, 0, tzinfo=timezone.utc),
         source_name="Twelve Data (ICE KC1!)",
         source_url="https://api.twelvedata.com/price",
-        raw_data="{}",
+        raw_bytes=b"{}",
         metadata={"provider": "twelve_data"},
     )
 
@@ -0,0 +1,64 @@
+"""Tests for the per-provider circuit breakers."""
+
+from unittest.mock import patch
+
+from app.providers.circuit import ProviderCircuitBreaker, get_breaker
+from app.providers.fx_rates import fetch_frankfurter_fx
+from app.services.data_pipeline.circuit_breaker import CircuitState
+
+
+def test_breaker_opens_after_threshold():
+    breaker = ProviderCircuitBreaker("test", failure_threshold=2)
+
+    breaker.record_failure()
+    assert breaker.can_attempt() is True
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.can_attempt() is False
+
+
+def test_success_resets_failure_count():
+    breaker = ProviderCircuitBreaker("test", failure_threshold=2)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    breaker = ProviderCircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+    breaker._opened_at -= 61
+
+    assert breaker.can_attempt() is True
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.can_attempt() is False
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = ProviderCircuitBreaker("test", failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+    breaker._opened_at -= 61
+
+    assert breaker.can_attempt() is True
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_open_circuit_skips_provider_request():
+    breaker = get_breaker("frankfurter")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    with patch("app.providers.fx_rates.get_client") as mock_client:
+        assert fetch_frankfurter_fx("USD", "EUR") is None
+
+    mock_client.return_value.get.assert_not_called()
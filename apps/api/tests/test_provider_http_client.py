@@ -0,0 +1,111 @@
+"""Tests for the shared provider HTTP client."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.providers import http
+
+
+@pytest.fixture(autouse=True)
+def _fresh_client():
+    http.close_client()
+    yield
+    http.close_client()
+
+
+def test_get_client_is_reused_within_a_process():
+    client = http.get_client()
+
+    assert http.get_client() is client
+    assert client.headers["User-Agent"] == http.USER_AGENT
+
+
+def test_get_client_is_recreated_after_fork():
+    parent = http.get_client()
+
+    with patch("app.providers.http.os.getpid", return_value=-1):
+        child = http.get_client()
+
+    assert child is not parent
+
+
+def _response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers)
+
+
+def test_parse_retry_after_seconds_and_cap():
+    assert http.parse_retry_after(_response(429, {"Retry-After": "2"})) == 2.0
+    assert (
+        http.parse_retry_after(_response(429, {"Retry-After": "3600"}))
+        == http.MAX_RETRY_DELAY_S
+    )
+    assert http.parse_retry_after(_response(429)) is None
+    assert http.parse_retry_after(_response(429, {"Retry-After": "soon"})) is None
+
+
+def test_parse_retry_after_http_date_in_past():
+    headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+    assert http.parse_retry_after(_response(503, headers)) == 0.0
+
+
+def test_send_with_retry_honors_retry_after():
+    send = MagicMock(
+        side_effect=[_response(429, {"Retry-After": "1.5"}), _response(200)]
+    )
+
+    with patch("app.providers.http.time.sleep") as mock_sleep:
+        resp = http.send_with_retry(send, "test")
+
+    assert resp.status_code == 200
+    assert send.call_count == 2
+    mock_sleep.assert_called_once_with(1.5)
+
+
+def test_send_with_retry_returns_last_response_and_skips_other_errors():
+    send = MagicMock(return_value=_response(503))
+
+    with patch("app.providers.http.time.sleep"):
+        assert http.send_with_retry(send, "test", attempts=3).status_code == 503
+    assert send.call_count == 3
+
+    send = MagicMock(return_value=_response(404))
+    assert http.send_with_retry(send, "test").status_code == 404
+    assert send.call_count == 1
+
+
+def test_send_with_retry_stops_at_deadline():
+    send = MagicMock(return_value=_response(429, {"Retry-After": "5"}))
+
+    with patch("app.providers.http.time.sleep") as mock_sleep:
+        resp = http.send_with_retry(send, "test", deadline=time.monotonic() + 1)
+
+    assert resp.status_code == 429
+    assert send.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+def test_send_with_retry_async():
+    send = AsyncMock(side_effect=[_response(502), _response(200)])
+
+    with patch("app.providers.http.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        resp = asyncio.run(http.send_with_retry_async(send, "test"))
+
+    assert resp.status_code == 200
+    assert mock_sleep.await_count == 1
+
+
+def test_token_bucket_bursts_then_paces():
+    bucket = http.TokenBucket(rate=2.0, capacity=2)
+
+    with patch("app.providers.http.time.sleep") as mock_sleep:
+        waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.5, abs=0.01)
+    assert waits[3] == pytest.approx(1.0, abs=0.01)
+    assert mock_sleep.call_count == 2
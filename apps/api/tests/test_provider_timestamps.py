@@ -0,0 +1,32 @@
+"""Tests for memoized provider timestamp parsing."""
+
+from datetime import datetime, timezone
+
+from app.providers.timestamps import _parse_iso, from_unix_utc, parse_iso_utc
+
+
+def test_parse_iso_utc_parses_and_caches():
+    _parse_iso.cache_clear()
+
+    first = parse_iso_utc("2024-01-15")
+    second = parse_iso_utc("2024-01-15")
+
+    assert first == datetime(2024, 1, 15, tzinfo=timezone.utc)
+    assert second is first
+    assert _parse_iso.cache_info().hits == 1
+
+
+def test_parse_iso_utc_falls_back_to_now():
+    before = datetime.now(timezone.utc)
+
+    for value in (None, "", "yesterday", "x" * 100, 20240115):
+        assert parse_iso_utc(value) >= before
+
+
+def test_from_unix_utc():
+    before = datetime.now(timezone.utc)
+
+    assert from_unix_utc(1704067200) == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert from_unix_utc(None) >= before
+    assert from_unix_utc(0) >= before
+    assert from_unix_utc("1704067200") >= before
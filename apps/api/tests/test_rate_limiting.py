@@ -218,4 +218,39 @@ def test_rate_limit_recovery(client: TestClient):
 
     # We verify the limiter is configured; time-window behavior is covered by integration tests.
     assert auth_routes.limiter is not None
-    assert callable(getattr(auth_routes.limiter, "limit", None))
+    assert callable(getattr(auth_routes.limiter, "limit", None))
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+    """Buckets allow a burst up to capacity and refill at rate / 60 per second."""
+    from app.middleware import rate_limit
+
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = rate_limit.TokenBucketLimiter(requests_per_minute=60)
+    assert all(bucket.allow("1.2.3.4") for _ in range(60))
+    assert not bucket.allow("1.2.3.4")
+    # Other clients have their own bucket
+    assert bucket.allow("5.6.7.8")
+    now[0] += 1.0
+    assert bucket.allow("1.2.3.4")
+    assert not bucket.allow("1.2.3.4")
+
+
+def test_global_rate_limit_returns_429(client: TestClient, monkeypatch):
+    """Clients over the global limit get a 429 before reaching the app."""
+    from app.main import app
+
+    monkeypatch.setattr(app.state.rate_limiter, "capacity", 3.0)
+    monkeypatch.setattr(app.state.rate_limiter, "refill_per_second", 0.0)
+    try:
+        statuses = [client.get("/cooperatives/").status_code for _ in range(4)]
+        assert statuses[:3] == [401, 401, 401]
+        assert statuses[3] == 429
+        response = client.get("/cooperatives/")
+        assert response.json() == {"detail": "Rate limit exceeded"}
+        # Health probes are never throttled
+        assert client.get("/health").status_code == 200
+    finally:
+        # Tests using a module-level TestClient do not reset the limiter
+        app.state.rate_limiter.reset()
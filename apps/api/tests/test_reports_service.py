@@ -86,6 +86,31 @@ def test_latest_by_key_with_data(db):
     assert result["FX:USD_EUR"].value == 0.92
 
 
+def test_latest_by_key_picks_newest_per_key(db):
+    """Each key gets its own newest observation from the single query."""
+    for key, values in {
+        "FX:USD_EUR": (0.90, 0.91),
+        "COFFEE_C:USD_LB": (2.40, 2.45),
+    }.items():
+        for day, value in enumerate(values, start=1):
+            db.add(
+                MarketObservation(
+                    key=key,
+                    value=value,
+                    observed_at=datetime(2024, 1, day, tzinfo=timezone.utc),
+                )
+            )
+    db.commit()
+
+    result = _latest_by_key(
+        db, ["FX:USD_EUR", "COFFEE_C:USD_LB", "FREIGHT:USD_PER_40FT"]
+    )
+
+    assert result["FX:USD_EUR"].value == 0.91
+    assert result["COFFEE_C:USD_LB"].value == 2.45
+    assert result["FREIGHT:USD_PER_40FT"] is None
+
+
 def test_latest_by_key_missing_data(db):
     """Test _latest_by_key with missing keys."""
     result = _latest_by_key(db, ["NONEXISTENT_KEY"])
@@ -1,4 +1,5 @@
 from app.models.shipment import Shipment
+from app.models.transport_event import TransportEvent
 from app.models.cooperative import Cooperative
 from app.models.lot import Lot
 
@@ -625,3 +626,47 @@ def test_shipments_reject_non_positive_shipment_id(client, auth_headers):
         headers=auth_headers,
     )
     assert track_response.status_code == 422
+
+
+def test_tracking_events_stored_as_rows(client, auth_headers, db):
+    """Tracking events are transport_events rows listed oldest first."""
+    shipment = Shipment(
+        container_number="ROWTRACK001",
+        bill_of_lading="BOL_ROWTRACK001",
+        weight_kg=18000,
+        container_type="40ft",
+        origin_port="Callao, Peru",
+        destination_port="Hamburg, Germany",
+    )
+    db.add(shipment)
+    db.commit()
+    db.refresh(shipment)
+
+    for timestamp, location in (
+        ("2024-01-20T14:00:00+00:00", "Panama Canal"),
+        ("2024-01-15T08:00:00+00:00", "Callao Port"),
+    ):
+        response = client.post(
+            f"/shipments/{shipment.id}/track",
+            json={"timestamp": timestamp, "location": location, "event": "Transit"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+    rows = db.query(TransportEvent).filter_by(shipment_id=shipment.id).count()
+    assert rows == 2
+
+    data = response.json()
+    assert data["current_location"] == "Callao Port"
+    assert [e["location"] for e in data["tracking_events"]] == [
+        "Callao Port",
+        "Panama Canal",
+    ]
+
+    bad = client.post(
+        f"/shipments/{shipment.id}/track",
+        json={"timestamp": "not-a-date", "location": "Rotterdam", "event": "Transit"},
+        headers=auth_headers,
+    )
+    assert bad.status_code == 422
+    assert db.query(TransportEvent).filter_by(shipment_id=shipment.id).count() == 2
@@ -0,0 +1,49 @@
+"""Tests for the background startup seed and its freshness marker."""
+
+import os
+
+from sqlalchemy import func, select
+
+from app import main
+from app.core.config import settings
+from app.domains.regions.services.peru_seed import seed_default_regions
+from app.models.peru_region import PeruRegion
+
+
+def _seed_session(db, monkeypatch):
+    """Point the startup seed at the test database session."""
+    monkeypatch.setattr(db, "close", lambda: None)
+    monkeypatch.setattr("app.db.session.SessionLocal", lambda: db)
+
+
+def test_seed_marker_freshness(tmp_path, monkeypatch):
+    marker = tmp_path / "seed.done"
+    monkeypatch.setattr(settings, "SEED_MARKER_PATH", str(marker))
+    assert not main._seed_marker_is_fresh(seed_default_regions)
+
+    marker.touch()
+    assert main._seed_marker_is_fresh(seed_default_regions)
+
+    # Any seed module or migration newer than the marker forces a re-seed
+    os.utime(marker, (0, 0))
+    assert not main._seed_marker_is_fresh(seed_default_regions)
+
+
+def test_run_startup_seed_skips_when_seeded(db, tmp_path, monkeypatch):
+    marker = tmp_path / "seed.done"
+    monkeypatch.setattr(settings, "SEED_MARKER_PATH", str(marker))
+    _seed_session(db, monkeypatch)
+
+    main._run_startup_seed()
+    assert marker.exists()
+    seeded = db.scalar(select(func.count()).select_from(PeruRegion))
+    assert seeded > 0
+
+    def fail(db):
+        raise AssertionError("seed ran although the marker is fresh")
+
+    monkeypatch.setattr(
+        "app.domains.regions.services.peru_seed.seed_default_regions", fail
+    )
+    main._run_startup_seed()
+    assert db.scalar(select(func.count()).select_from(PeruRegion)) == seeded
@@ -119,6 +119,59 @@ class TestCoffeePriceModelRF:
         finally:
             os.unlink(path)
 
+    def test_load_legacy_label_encoders(self, price_training_df):
+        """Models saved with sklearn LabelEncoders keep their encodings."""
+        import joblib
+        from sklearn.preprocessing import LabelEncoder
+        from app.ml.price_model import CoffeePriceModel
+
+        m = CoffeePriceModel()
+        X, y = m.prepare_features(price_training_df)
+        m.train(X, y)
+        legacy_encoders = {
+            col: LabelEncoder().fit(price_training_df[col].astype(str))
+            for col in m.encoders
+        }
+
+        with tempfile.NamedTemporaryFile(suffix=".joblib", delete=False) as f:
+            path = f.name
+        try:
+            joblib.dump({"model": m.model, "encoders": legacy_encoders}, path)
+            m2 = CoffeePriceModel()
+            m2.load(path)
+            assert m2.encoders == m.encoders
+            X2, _ = m2.prepare_features(price_training_df)
+            pd.testing.assert_frame_equal(X, X2)
+        finally:
+            os.unlink(path)
+
+    def test_unknown_label_encodes_per_value(self, price_training_df):
+        from app.ml.price_model import CoffeePriceModel
+
+        m = CoffeePriceModel()
+        m.prepare_features(price_training_df)
+        df = price_training_df.head(2).copy()
+        df["variety"] = ["Geisha", "Caturra"]
+        X, _ = m.prepare_features(df)
+        assert X["variety_encoded"].tolist() == [0.0, m.encoders["variety"]["Caturra"]]
+
+    def test_predict_ndarray_matches_dataframe(self, price_training_df):
+        import warnings
+
+        from app.ml.price_model import CoffeePriceModel
+
+        m = CoffeePriceModel()
+        X, y = m.prepare_features(price_training_df)
+        m.train(X, y)
+        X_arr = m.prepare_matrix(price_training_df)
+        assert X_arr.dtype == np.float32 and X_arr.flags.c_contiguous
+        np.testing.assert_array_equal(X_arr, X.to_numpy())
+        m._compiled = None
+        with warnings.catch_warnings():
+            # No feature-name mismatch warnings from sklearn either way
+            warnings.simplefilter("error", UserWarning)
+            np.testing.assert_allclose(m.predict_ndarray(X_arr), m.predict(X))
+
 
 class TestFreightCostModelRF:
     def test_train_predict(self, freight_training_df):
@@ -142,6 +195,60 @@ class TestFreightCostModelRF:
         assert len(importance) == 6  # 6 features
         assert abs(sum(importance.values()) - 1.0) < 1e-6
 
+    def test_predict_with_confidence_threaded(self, freight_training_df, monkeypatch):
+        import app.ml.freight_model as freight_module
+
+        m = freight_module.FreightCostModel()
+        X, y = m.prepare_features(freight_training_df)
+        m.train(X, y)
+        m._compiled = None  # exercise the sklearn per-tree path
+        serial = m.predict_with_confidence(X)
+
+        monkeypatch.setattr(freight_module, "PARALLEL_PREDICT_MIN_ROWS", 0)
+        m.model.n_jobs = 2
+        threaded = m.predict_with_confidence(X)
+
+        for a, b in zip(serial, threaded):
+            np.testing.assert_array_almost_equal(a, b)
+        # Per-tree values are buffered as float32
+        np.testing.assert_allclose(threaded[0], m.predict(X), rtol=1e-6)
+
+    def test_compiled_forest_matches_sklearn(self, freight_training_df):
+        pytest.importorskip("treelite")
+        from app.ml.freight_model import FreightCostModel
+
+        m = FreightCostModel()
+        X, y = m.prepare_features(freight_training_df)
+        m.train(X, y)
+        assert m._compiled is not None
+        compiled = m.predict(X), m.predict_with_confidence(X)
+
+        m._compiled = None
+        np.testing.assert_allclose(compiled[0], m.predict(X))
+        # The sklearn fallback buffers per-tree values as float32
+        for a, b in zip(compiled[1], m.predict_with_confidence(X)):
+            np.testing.assert_allclose(a, b, rtol=1e-6, atol=1e-2)
+
+    def test_load_from_treelite_sidecars(self, freight_training_df, tmp_path):
+        pytest.importorskip("treelite")
+        from app.ml.freight_model import FreightCostModel
+
+        m = FreightCostModel()
+        X, y = m.prepare_features(freight_training_df)
+        m.train(X, y)
+        path = str(tmp_path / "freight.joblib")
+        m.save(path)
+        assert os.path.exists(f"{path}.treelite")
+
+        m2 = FreightCostModel()
+        m2.load(path)
+        assert m2._model is None
+        assert m2.encoders == m.encoders
+        np.testing.assert_allclose(m2.predict(X), m.predict(X))
+        # The pickled estimator is only read when it is actually needed
+        assert m2.get_feature_importance() == m.get_feature_importance()
+        assert m2._model is not None
+
 
 # ---------------------------------------------------------------------------
 # XGBoost model tests
@@ -170,6 +277,8 @@ class TestXGBoostCoffeePriceModel:
         assert np.all(high >= low)
         assert np.all(preds >= low)
         assert np.all(preds <= high)
+        np.testing.assert_allclose(high - preds, np.abs(preds) * 0.10, rtol=1e-5)
+        np.testing.assert_allclose(preds - low, np.abs(preds) * 0.10, rtol=1e-5)
 
     def test_feature_importance(self, price_training_df):
         from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
@@ -184,22 +293,32 @@ class TestXGBoostCoffeePriceModel:
         # All importance values should be non-negative
         assert all(v >= 0 for v in importance.values())
 
-    def test_save_load(self, price_training_df):
+    def test_save_load(self, price_training_df, tmp_path):
+        import json
         from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
 
         m = XGBoostCoffeePriceModel()
         X, y = m.prepare_features(price_training_df)
         m.train(X, y)
 
-        with tempfile.NamedTemporaryFile(suffix=".joblib", delete=False) as f:
-            path = f.name
-        try:
-            m.save(path)
-            m2 = XGBoostCoffeePriceModel()
-            m2.load(path)
-            np.testing.assert_array_almost_equal(m.predict(X), m2.predict(X))
-        finally:
-            os.unlink(path)
+        path = str(tmp_path / "model.joblib")
+        m.save(path)
+        # The booster is stored natively; the label maps are plain JSON
+        assert os.path.exists(f"{path}.ubj")
+        with open(path, "rb") as f:
+            class_maps = json.load(f)["class_maps"]
+        for col, categories in m._categories.items():
+            assert list(class_maps[col]) == categories.categories.tolist()
+        m2 = XGBoostCoffeePriceModel()
+        booster_owner = m2.model
+        m2.load(path)
+        assert m2.model is booster_owner
+        for col, categories in m._categories.items():
+            assert (
+                m2._categories[col].categories.tolist()
+                == categories.categories.tolist()
+            )
+        np.testing.assert_array_almost_equal(m.predict(X), m2.predict(X))
 
     def test_prepare_features_missing_cols(self):
         """prepare_features should handle missing optional columns gracefully."""
@@ -219,6 +338,125 @@ class TestXGBoostCoffeePriceModel:
         X, y = m.prepare_features(df)
         assert y is not None
         assert X.shape[1] == 9
+        defaults = X.iloc[0][
+            ["cupping_score", "certification_count", "ice_c_price_normalized", "month"]
+        ]
+        assert defaults.tolist() == [82.0, 0.0, 1.0, 1.0]
+
+    def test_prepare_features_leaves_input_untouched(self, price_training_df):
+        """Features are built into a new matrix; the caller's frame is not
+        copied into, extended or modified."""
+        from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
+
+        before = price_training_df.copy()
+        XGBoostCoffeePriceModel().prepare_features(price_training_df)
+        pd.testing.assert_frame_equal(price_training_df, before)
+
+    def test_certification_count_counts_lists_only(self):
+        from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
+
+        df = pd.DataFrame({"certifications": [["Organic", "FT"], None, "Organic", []]})
+        X, _ = XGBoostCoffeePriceModel().prepare_features(df)
+        assert X["certification_count"].tolist() == [2.0, 0.0, 0.0, 0.0]
+
+    def test_month_from_dates_and_strings(self):
+        from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
+
+        m = XGBoostCoffeePriceModel()
+        dates = pd.Series(pd.to_datetime(["2024-03-05", "2024-12-31", None]))
+        strings = pd.Series(["2024-03-05", "2024-12-31", None])
+        for column in (dates, strings):
+            X, _ = m.prepare_features(pd.DataFrame({"date": column}))
+            np.testing.assert_array_equal(X["month"], [3.0, 12.0, np.nan])
+
+    def test_categories_survive_legacy_load(self, price_training_df):
+        """Codes match LabelEncoder's, unknown labels are missing (NaN), and
+        the categories are rebuilt from the encoders of old pickles."""
+        import joblib
+        from sklearn.preprocessing import LabelEncoder
+        from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
+
+        m = XGBoostCoffeePriceModel()
+        X, y = m.prepare_features(price_training_df)
+        reference = LabelEncoder().fit_transform(price_training_df["variety"])
+        np.testing.assert_array_equal(X["variety_encoded"], reference)
+        m.train(X, y)
+        df = price_training_df.head(2).copy()
+        df["variety"] = ["Geisha", "Caturra"]
+        caturra = m._categories["variety"].categories.get_loc("Caturra")
+        expected = [np.nan, caturra]
+        np.testing.assert_array_equal(
+            m.prepare_features(df)[0]["variety_encoded"], expected
+        )
+
+        legacy_encoders = {}
+        for col, categories in m._categories.items():
+            legacy_encoders[col] = LabelEncoder().fit(categories.categories)
+        with tempfile.NamedTemporaryFile(suffix=".joblib", delete=False) as f:
+            path = f.name
+        try:
+            joblib.dump({"model": m.model, "encoders": legacy_encoders}, path)
+            m2 = XGBoostCoffeePriceModel()
+            m2.load(path)
+            for col, categories in m._categories.items():
+                assert (
+                    m2._categories[col].categories.tolist()
+                    == categories.categories.tolist()
+                )
+            np.testing.assert_array_equal(
+                m2.prepare_features(df)[0]["variety_encoded"], expected
+            )
+        finally:
+            os.unlink(path)
+
+    def test_legacy_numeric_booster_keeps_zero_for_unknown_labels(
+        self, price_training_df, tmp_path
+    ):
+        """Boosters saved before categorical splits still get unseen labels
+        (and absent columns) as code 0, as they did when they were trained."""
+        import joblib
+        from sklearn.preprocessing import LabelEncoder
+        from xgboost import XGBRegressor
+        from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
+
+        m = XGBoostCoffeePriceModel()
+        X, y = m.prepare_features(price_training_df)
+        legacy_booster = XGBRegressor(n_estimators=20, random_state=42).fit(X, y)
+        assert "c" not in legacy_booster.get_booster().feature_types
+        legacy_encoders = {
+            col: LabelEncoder().fit(categories.categories)
+            for col, categories in m._categories.items()
+        }
+        path = str(tmp_path / "legacy.joblib")
+        joblib.dump({"model": legacy_booster, "encoders": legacy_encoders}, path)
+
+        m2 = XGBoostCoffeePriceModel()
+        m2.load(path)
+        df = price_training_df.head(2).drop(columns=["origin_region"])
+        df["variety"] = ["Geisha", "Caturra"]
+        X2, _ = m2.prepare_features(df)
+        caturra = m._categories["variety"].categories.get_loc("Caturra")
+        assert X2["variety_encoded"].tolist() == [0.0, caturra]
+        assert X2["origin_region_encoded"].tolist() == [0.0, 0.0]
+        np.testing.assert_allclose(
+            m2.predict(X2), legacy_booster.predict(X2), rtol=1e-5
+        )
+
+        # A freshly trained booster splits on categories and uses NaN
+        m.train(X, y)
+        assert np.isnan(m.prepare_features(df)[0]["variety_encoded"].iloc[0])
+
+    def test_categorical_splits(self, price_training_df):
+        """Encoded columns are declared categorical to XGBoost and Treelite."""
+        from app.ml.xgboost_price_model import XGBoostCoffeePriceModel
+
+        m = XGBoostCoffeePriceModel()
+        X, y = m.prepare_features(price_training_df)
+        m.train(X, y)
+        booster = m.model.get_booster()
+        assert booster.feature_types == m.FEATURE_TYPES
+        assert booster.feature_types[:5] == ["c"] * 5
+        np.testing.assert_allclose(m.predict(X), m.model.predict(X), rtol=1e-5)
 
 
 class TestXGBoostFreightCostModel:
@@ -244,22 +482,115 @@ class TestXGBoostFreightCostModel:
         assert len(importance) == 6
         assert abs(sum(importance.values()) - 1.0) < 1e-6
 
-    def test_save_load(self, freight_training_df):
+    def test_save_load(self, freight_training_df, tmp_path):
+        import json
         from app.ml.xgboost_freight_model import XGBoostFreightCostModel
 
         m = XGBoostFreightCostModel()
         X, y = m.prepare_features(freight_training_df)
         m.train(X, y)
 
-        with tempfile.NamedTemporaryFile(suffix=".joblib", delete=False) as f:
-            path = f.name
-        try:
-            m.save(path)
-            m2 = XGBoostFreightCostModel()
-            m2.load(path)
-            np.testing.assert_array_almost_equal(m.predict(X), m2.predict(X))
-        finally:
-            os.unlink(path)
+        path = str(tmp_path / "model.joblib")
+        m.save(path)
+        # The booster is stored natively; the label maps are plain JSON
+        assert os.path.exists(f"{path}.ubj")
+        with open(path, "rb") as f:
+            class_maps = json.load(f)["class_maps"]
+        for col, categories in m._categories.items():
+            assert list(class_maps[col]) == categories.categories.tolist()
+        m2 = XGBoostFreightCostModel()
+        booster_owner = m2.model
+        m2.load(path)
+        assert m2.model is booster_owner
+        np.testing.assert_array_almost_equal(m.predict(X), m2.predict(X))
+
+    def test_compiled_booster_matches_xgboost(self, freight_training_df, tmp_path):
+        pytest.importorskip("treelite")
+        from app.ml.xgboost_freight_model import XGBoostFreightCostModel
+
+        m = XGBoostFreightCostModel()
+        X, y = m.prepare_features(freight_training_df)
+        m.train(X, y)
+        assert m._compiled is not None
+        np.testing.assert_allclose(m.predict(X), m.model.predict(X), rtol=1e-5)
+
+        path = str(tmp_path / "freight.joblib")
+        m.save(path)
+        assert os.path.exists(f"{path}.treelite")
+        m2 = XGBoostFreightCostModel()
+        m2.load(path)
+        assert m2._compiled is not None
+        np.testing.assert_allclose(m2.predict(X), m.predict(X))
+
+    def test_predict_ndarray_matches_dataframe(self, freight_training_df):
+        from app.ml.xgboost_freight_model import XGBoostFreightCostModel
+
+        m = XGBoostFreightCostModel()
+        X, y = m.prepare_features(freight_training_df)
+        m.train(X, y)
+        X_arr = m.prepare_matrix(freight_training_df)
+        assert X_arr.dtype == np.float32 and X_arr.flags.c_contiguous
+        expected = m.model.predict(X)
+        np.testing.assert_allclose(m.predict_ndarray(X_arr), expected, rtol=1e-5)
+        # Without Treelite the booster predicts on the array in place
+        m._compiled = None
+        np.testing.assert_allclose(m.predict_ndarray(X_arr), expected, rtol=1e-5)
+
+    def test_feature_importance_is_memoised(self, freight_training_df):
+        from app.ml.xgboost_freight_model import XGBoostFreightCostModel
+
+        m = XGBoostFreightCostModel()
+        X, y = m.prepare_features(freight_training_df)
+        m.train(X, y)
+        importance = m.get_feature_importance()
+        expected = m.model.feature_importances_ / m.model.feature_importances_.sum()
+        np.testing.assert_allclose(list(importance.values()), expected, rtol=1e-5)
+
+        importance["route_encoded"] = -1.0  # callers get their own copy
+        assert m.get_feature_importance()["route_encoded"] >= 0
+        m._feature_importance = {"stale": 1.0}
+        m.train(X, y)
+        assert list(m.get_feature_importance()) == m.FEATURE_NAMES
+
+    def test_inference_is_single_threaded(self, freight_training_df, tmp_path):
+        import json
+        from app.ml.xgboost_freight_model import XGBoostFreightCostModel
+
+        m = XGBoostFreightCostModel()
+        X, y = m.prepare_features(freight_training_df)
+        m.train(X, y)
+        path = str(tmp_path / "freight.joblib")
+        m.save(path)
+        m2 = XGBoostFreightCostModel()
+        m2.load(path)
+        for model in (m, m2):
+            config = json.loads(model.model.get_booster().save_config())
+            assert config["learner"]["generic_param"]["nthread"] == "1"
+        # Training itself still uses every core
+        assert m2.model.get_params()["n_jobs"] == -1
+
+    def test_prepare_features_values(self):
+        """Missing optional values get defaults, a missing weight stays NaN."""
+        from app.ml.xgboost_freight_model import XGBoostFreightCostModel
+
+        df = pd.DataFrame(
+            {
+                "route": ["Callao-Hamburg", "Santos-Rotterdam"],
+                "container_type": ["40ft", "20ft"],
+                "weight_kg": [10000, None],
+                "fuel_price_index": [None, 110.0],
+            },
+            index=[7, 9],
+        )
+        X, y = XGBoostFreightCostModel().prepare_features(df)
+        assert y is None
+        assert X.dtypes.unique().tolist() == [np.float32]
+        assert X.index.tolist() == [7, 9]
+        np.testing.assert_array_equal(X["route_encoded"], [0, 1])
+        np.testing.assert_array_equal(X["season_encoded"], [np.nan, np.nan])
+        np.testing.assert_array_equal(X["weight_normalized"], [0.5, np.nan])
+        np.testing.assert_array_equal(X["fuel_price_index"], [100.0, 110.0])
+        np.testing.assert_array_equal(X["port_congestion_score"], [50.0, 50.0])
 
 
 # ---------------------------------------------------------------------------